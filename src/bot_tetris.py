@@ -0,0 +1,141 @@
+# bot_tetris.py
+# =============================================================================
+#                       JUGADOR AUTOMÁTICO (BOT)
+# =============================================================================
+# Bot de una pieza de anticipación: prueba todas las rotaciones y columnas de
+# la pieza actual, deja caer cada una sobre una copia del tablero y se queda
+# con la que mejor puntúa la heurística. Todas las colocaciones se evalúan en
+# un solo lote con caracteristicas_tablero. No depende de pygame.
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from core_tetris import TETROMINOS
+from caracteristicas_tablero import caracteristicas, tablero_a_array
+
+# Pesos de la heurística (altura agregada, líneas, huecos, irregularidad)
+PESO_ALTURA = -0.51
+PESO_LINEAS = 0.76
+PESO_HUECOS = -0.36
+PESO_IRREGULARIDAD = -0.18
+
+
+def _celdas(tipo, rot, x, y):
+    mat = TETROMINOS[tipo]["rot"][rot]
+    return [(x + i, y + j) for j in range(4) for i in range(4) if mat[j][i]]
+
+
+def _colisiona(tablero, celdas, columnas, filas):
+    for (x, y) in celdas:
+        if x < 0 or x >= columnas or y >= filas:
+            return True
+        if y >= 0 and tablero[y][x] is not None:
+            return True
+    return False
+
+
+def _puntuar(carac, lineas):
+    return (PESO_ALTURA * carac['altura_agregada'] + PESO_LINEAS * lineas
+            + PESO_HUECOS * carac['huecos'] + PESO_IRREGULARIDAD * carac['irregularidad'])
+
+
+def evaluar_tablero(tablero, lineas):
+    """Puntúa un tablero tras colocar una pieza (mayor es mejor)."""
+    return float(_puntuar(caracteristicas(tablero_a_array(tablero)), lineas))
+
+
+def mejor_jugada(tablero, tipo):
+    """Retorna (rot, x) de la mejor colocación para la pieza, o None si no hay."""
+    filas = len(tablero)
+    columnas = len(tablero[0])
+    rotaciones = TETROMINOS[tipo]["rot"]
+    # Las rotaciones repetidas (p. ej. la O) no se evalúan dos veces
+    distintas = []
+    for rot, mat in enumerate(rotaciones):
+        if mat not in [rotaciones[r] for r in distintas]:
+            distintas.append(rot)
+
+    # Se arma un lote con el tablero resultante de cada colocación y se
+    # evalúa de una sola vez
+    jugadas, celdas_jugadas = [], []
+    for rot in distintas:
+        for x in range(-2, columnas):
+            y = -2
+            if _colisiona(tablero, _celdas(tipo, rot, x, y), columnas, filas):
+                continue
+            while not _colisiona(tablero, _celdas(tipo, rot, x, y + 1), columnas, filas):
+                y += 1
+
+            celdas = _celdas(tipo, rot, x, y)
+            if any(cy < 0 for _, cy in celdas):
+                continue
+            jugadas.append((rot, x))
+            celdas_jugadas.extend(celdas)
+
+    if not jugadas:
+        return None
+    lote = np.repeat(tablero_a_array(tablero)[None], len(jugadas), axis=0)
+    xs, ys = np.array(celdas_jugadas).T
+    lote[np.repeat(np.arange(len(jugadas)), 4), ys, xs] = 1
+
+    completas = lote.all(axis=2)
+    lineas = completas.sum(axis=1)
+    for i in np.flatnonzero(lineas):
+        # Pocas jugadas limpian líneas: solo esas se reacomodan
+        restantes = lote[i][~completas[i]]
+        lote[i] = 0
+        lote[i, lineas[i]:] = restantes
+
+    puntajes = _puntuar(caracteristicas(lote), lineas)
+    return jugadas[int(np.argmax(puntajes))]
+
+
+class BotTetris:
+    """Planifica en un hilo aparte y entrega una acción a la vez.
+
+    El bucle del juego nunca espera al bot: si el plan de la pieza actual aún
+    no está listo, simplemente no hay acción en ese frame.
+    """
+
+    def __init__(self):
+        self._ejecutor = ThreadPoolExecutor(max_workers=1)
+        self._futuro = None
+        self._pieza_planificada = None
+        self._objetivo = None
+        self._intentos = 0
+
+    def siguiente_accion(self, motor):
+        """Retorna ('rotar', 1), ('mover', ±1), ('caida_dura', 0) o None."""
+        pieza = motor.pieza_actual
+        if pieza is None or motor.game_over:
+            return None
+
+        if pieza is not self._pieza_planificada:
+            self._pieza_planificada = pieza
+            self._objetivo = None
+            self._intentos = 0
+            tablero = [fila[:] for fila in motor.tablero]
+            self._futuro = self._ejecutor.submit(mejor_jugada, tablero, pieza.tipo)
+            return None
+
+        if self._objetivo is None:
+            if self._futuro is None or not self._futuro.done():
+                return None
+            self._objetivo = self._futuro.result() or (pieza.rot, pieza.x)
+
+        # Control en lazo cerrado: los kicks pueden desplazar la pieza
+        self._intentos += 1
+        rot, x = self._objetivo
+        if self._intentos > 20:
+            return ('caida_dura', 0)
+        if pieza.rot != rot:
+            return ('rotar', 1)
+        if pieza.x < x:
+            return ('mover', 1)
+        if pieza.x > x:
+            return ('mover', -1)
+        return ('caida_dura', 0)
+
+    def detener(self):
+        self._ejecutor.shutdown(wait=False)
@@ -0,0 +1,173 @@
+# calibracion.py
+# =============================================================================
+#                   CALIBRACIÓN DE GESTOS POR JUGADOR
+# =============================================================================
+# Los umbrales por defecto de InterpreteGestos (largo mínimo de un dedo
+# extendido, recorrido vertical del pulgar) están pensados para una mano
+# "promedio" a una distancia "promedio" de la cámara. La calibración graba
+# unos segundos de cada pose, pone cada umbral entre las distribuciones
+# medidas y, si las poses quedaron bien separadas, acorta los tiempos de
+# anti-rebote. El perfil se guarda en un JSON por nombre de jugador.
+#
+# Las muestras son manos de 21 puntos (x, y) normalizados, como las entrega
+# ultimos_landmarks en modo de previsualización 'landmarks'.
+
+import json
+import math
+import os
+import time
+
+# (clave, instrucción en pantalla), en el orden en que se graban
+POSES = (
+    ('abierta', "Mano abierta, dedos extendidos"),
+    ('puno', "Puño cerrado"),
+    ('pulgar_arriba', "Pulgar hacia arriba"),
+    ('pulgar_abajo', "Pulgar hacia abajo"),
+)
+PREPARACION_S = 1.5        # Tiempo para cambiar de pose antes de grabar
+SEGUNDOS_POR_POSE = 3.0
+MIN_MUESTRAS = 15          # Por pose; con menos el perfil no se ajusta
+
+# Umbral del pulgar: fracción del recorrido típico medido
+FRACCION_PULGAR = 0.6
+# Con este margen relativo entre dedo extendido y doblado se acortan los tiempos
+MARGEN_TIEMPOS_CORTOS = 0.25
+TIEMPOS_CORTOS = {
+    'rotar_debounce_s': 0.15,
+    'caida_dura_debounce_s': 0.35,
+    'movimiento_debounce_s': 0.18,
+}
+
+# (punta, nudillo MCP) de índice, medio, anular y meñique
+_DEDOS = ((8, 5), (12, 9), (16, 13), (20, 17))
+
+
+def distancias_dedos(mano):
+    """Distancia punta-nudillo de los cuatro dedos (sin el pulgar)."""
+    return [math.hypot(mano[p][0] - mano[m][0], mano[p][1] - mano[m][1]) for p, m in _DEDOS]
+
+
+def recorrido_pulgar(mano):
+    """Desplazamiento vertical punta-MCP del pulgar; positivo hacia abajo."""
+    return mano[4][1] - mano[2][1]
+
+
+def _percentil(valores, q):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(q * len(ordenados)))]
+
+
+def ajustar_umbrales(muestras):
+    """Perfil a partir de {pose: [mano, ...]}, o None si faltan muestras o las poses se confunden."""
+    if any(len(muestras.get(pose, ())) < MIN_MUESTRAS for pose, _ in POSES):
+        return None
+    extendidos = [d for mano in muestras['abierta'] for d in distancias_dedos(mano)]
+    doblados = [d for mano in muestras['puno'] for d in distancias_dedos(mano)]
+    bajo_extendido = _percentil(extendidos, 0.10)
+    alto_doblado = _percentil(doblados, 0.90)
+    if bajo_extendido <= alto_doblado:
+        return None
+
+    pulgar = ([-recorrido_pulgar(mano) for mano in muestras['pulgar_arriba']]
+              + [recorrido_pulgar(mano) for mano in muestras['pulgar_abajo']])
+    bajo_pulgar = _percentil(pulgar, 0.10)
+    if bajo_pulgar <= 0:
+        return None
+
+    margen = (bajo_extendido - alto_doblado) / bajo_extendido
+    perfil = {
+        'dist_min_dedo': round((bajo_extendido + alto_doblado) / 2, 4),
+        'umbral_dir_pulgar': round(bajo_pulgar * FRACCION_PULGAR, 4),
+        'margen': round(margen, 3),
+    }
+    if margen >= MARGEN_TIEMPOS_CORTOS:
+        perfil.update(TIEMPOS_CORTOS)
+    return perfil
+
+
+class SesionCalibracion:
+    """Recorre POSES: una pausa para acomodar la mano y unos segundos grabando cada una.
+
+    El bucle de la pantalla llama a agregar() con los landmarks más recientes;
+    los repetidos (la cámara va más lenta que el juego) se ignoran.
+    """
+
+    def __init__(self, preparacion_s=PREPARACION_S, segundos_por_pose=SEGUNDOS_POR_POSE,
+                 reloj=time.monotonic):
+        self.preparacion_s = preparacion_s
+        self.segundos_por_pose = segundos_por_pose
+        self.muestras = {pose: [] for pose, _ in POSES}
+        self._reloj = reloj
+        self._inicio = reloj()
+        self._previos = None
+
+    def _posicion(self):
+        """(índice de pose, segundos dentro de esa pose)."""
+        transcurrido = self._reloj() - self._inicio
+        por_pose = self.preparacion_s + self.segundos_por_pose
+        return int(transcurrido // por_pose), transcurrido % por_pose
+
+    @property
+    def terminada(self):
+        return self._posicion()[0] >= len(POSES)
+
+    @property
+    def instruccion(self):
+        indice, _ = self._posicion()
+        return POSES[min(indice, len(POSES) - 1)][1]
+
+    @property
+    def grabando(self):
+        indice, t = self._posicion()
+        return indice < len(POSES) and t >= self.preparacion_s
+
+    @property
+    def progreso(self):
+        """Avance total de 0 a 1."""
+        transcurrido = self._reloj() - self._inicio
+        return min(1.0, transcurrido / (len(POSES) * (self.preparacion_s + self.segundos_por_pose)))
+
+    def agregar(self, landmarks):
+        if not landmarks or landmarks == self._previos:
+            return
+        self._previos = landmarks
+        indice, t = self._posicion()
+        if indice < len(POSES) and t >= self.preparacion_s:
+            self.muestras[POSES[indice][0]].extend(landmarks)
+
+    def resultado(self):
+        return ajustar_umbrales(self.muestras)
+
+
+# ----- Perfiles en disco -----
+def _leer_perfiles(ruta):
+    try:
+        with open(ruta, encoding='utf-8') as f:
+            perfiles = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"[AVISO] No se pudieron leer los perfiles de gestos: {e}")
+        return {}
+    return perfiles if isinstance(perfiles, dict) else {}
+
+
+def cargar_perfil(ruta, nombre):
+    """Perfil guardado para el jugador, o None."""
+    perfil = _leer_perfiles(ruta).get(nombre)
+    return perfil if isinstance(perfil, dict) else None
+
+
+def guardar_perfil(ruta, nombre, perfil):
+    """Guarda (o reemplaza) el perfil del jugador. Retorna True si se escribió."""
+    perfiles = _leer_perfiles(ruta)
+    perfiles[nombre] = perfil
+    temporal = ruta + ".tmp"
+    try:
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(perfiles, f, ensure_ascii=False, indent=1)
+        os.replace(temporal, ruta)
+    except OSError as e:
+        print(f"[ERROR] No se pudo guardar el perfil de gestos: {e}")
+        return False
+    return True
@@ -0,0 +1,90 @@
+# caracteristicas_tablero.py
+# =============================================================================
+#                 CARACTERÍSTICAS DEL TABLERO (VECTORIZADAS)
+# =============================================================================
+# Alturas, huecos, pozos, irregularidad y transiciones calculadas con NumPy
+# sobre tableros de ceros y unos. Aceptan un tablero (filas, columnas) o un
+# lote (N, filas, columnas): el bot evalúa así todas sus colocaciones de una
+# vez, y los análisis de muchas partidas no recorren celdas en Python.
+
+import numpy as np
+
+
+def tablero_a_array(tablero):
+    """Tablero de Motor (listas con tipo o None) -> array uint8 de ocupación."""
+    return np.not_equal(np.array(tablero, dtype=object), None).astype(np.uint8)
+
+
+def desde_bitboard(filas_bits, columnas):
+    """Filas codificadas como enteros (bit i = columna i) -> array uint8 (..., filas, columnas)."""
+    bits = np.asarray(filas_bits, dtype=np.uint64)
+    return ((bits[..., None] >> np.arange(columnas, dtype=np.uint64)) & 1).astype(np.uint8)
+
+
+def alturas_columnas(tableros):
+    """Altura de cada columna (filas desde el fondo hasta el bloque más alto)."""
+    ocupada = np.asarray(tableros) != 0
+    filas = ocupada.shape[-2]
+    primera = ocupada.argmax(axis=-2)
+    return np.where(ocupada.any(axis=-2), filas - primera, 0)
+
+
+def huecos(tableros, alturas=None):
+    """Celdas vacías por debajo del bloque más alto de su columna."""
+    tableros = np.asarray(tableros)
+    if alturas is None:
+        alturas = alturas_columnas(tableros)
+    return (alturas - (tableros != 0).sum(axis=-2)).sum(axis=-1)
+
+
+def pozos(alturas):
+    """Suma de profundidades de pozo: cuánto más bajas que sus dos vecinas están las columnas.
+
+    Las paredes cuentan como columnas infinitamente altas.
+    """
+    alturas = np.asarray(alturas)
+    pared = np.full(alturas.shape[:-1] + (1,), np.iinfo(np.int64).max)
+    con_paredes = np.concatenate([pared, alturas.astype(np.int64), pared], axis=-1)
+    vecinas = np.minimum(con_paredes[..., :-2], con_paredes[..., 2:])
+    return np.clip(vecinas - alturas, 0, None).sum(axis=-1)
+
+
+def irregularidad(alturas):
+    """Suma de diferencias de altura entre columnas vecinas (bumpiness)."""
+    return np.abs(np.diff(np.asarray(alturas), axis=-1)).sum(axis=-1)
+
+
+def transiciones_filas(tableros):
+    """Cambios lleno/vacío recorriendo cada fila; las paredes cuentan como llenas."""
+    ocupada = np.asarray(tableros) != 0
+    pared = np.ones(ocupada.shape[:-1] + (1,), dtype=bool)
+    con_paredes = np.concatenate([pared, ocupada, pared], axis=-1)
+    return (con_paredes[..., 1:] != con_paredes[..., :-1]).sum(axis=(-2, -1))
+
+
+def transiciones_columnas(tableros):
+    """Cambios lleno/vacío recorriendo cada columna; el piso cuenta como lleno."""
+    ocupada = np.asarray(tableros) != 0
+    piso = np.ones(ocupada.shape[:-2] + (1, ocupada.shape[-1]), dtype=bool)
+    con_piso = np.concatenate([ocupada, piso], axis=-2)
+    return (con_piso[..., 1:, :] != con_piso[..., :-1, :]).sum(axis=(-2, -1))
+
+
+def caracteristicas(tableros):
+    """Todas las características de un tablero o de un lote.
+
+    Con un tablero (filas, columnas) cada valor es un escalar (las alturas,
+    un vector por columna); con un lote (N, filas, columnas), un array de N.
+    """
+    tableros = np.asarray(tableros)
+    alturas = alturas_columnas(tableros)
+    return {
+        'alturas': alturas,
+        'altura_agregada': alturas.sum(axis=-1),
+        'altura_max': alturas.max(axis=-1),
+        'huecos': huecos(tableros, alturas),
+        'pozos': pozos(alturas),
+        'irregularidad': irregularidad(alturas),
+        'transiciones_filas': transiciones_filas(tableros),
+        'transiciones_columnas': transiciones_columnas(tableros),
+    }
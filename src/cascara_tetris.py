@@ -1,11 +1,17 @@
+import time
+_T_ARRANQUE = time.perf_counter()  # Antes de importar pygame: mide el arranque en frío
+
 import pygame
 import sys
-import time
 import os
-import urllib.request
-import numpy as np
+import threading
+import random
 from core_tetris import Motor, TETROMINOS
-from controlador_manos import crear_controlador_manos_o_nada
+from controlador_manos import CargaManosAsincrona, CONEXIONES_MANO
+from repeticion import RegistroPartida
+from puntuaciones import TablaPuntuaciones
+from telemetria import Telemetria, MuestreoFrames
+from calibracion import SesionCalibracion, cargar_perfil, guardar_perfil
 
 # ============================================================
 #                       CONFIGURACIÓN VISUAL
@@ -14,7 +20,14 @@ COLUMNAS, FILAS = 10, 20
 CELDA = 35  
 ANCHO_LATERAL = 8 * CELDA 
 ANCHO, ALTO = COLUMNAS * CELDA + ANCHO_LATERAL, FILAS * CELDA + 40  
-FPS = 30
+CELDA_MIN = 2  # Tableros enormes (p. ej. 40x80) se dibujan con celdas más chicas
+FPS = 60  # Tope de render; 0 = sin límite
+ESPERA_MENU_MS = 250  # Los menús duermen en pygame.event.wait hasta este tiempo
+
+# Simulación de paso fijo: la lógica avanza siempre en ticks de 1/60 s,
+# independiente de la tasa de render.
+TICKS_POR_SEGUNDO = 60
+MAX_TICKS_POR_FRAME = 8  # Tope de ticks recuperados tras un atasco
 
 CAMARA_ANCHO = 280  
 CAMARA_ALTO = 210   
@@ -35,6 +48,7 @@ COLORES_PIEZAS = {
     "Z": (255, 60, 100),
     "J": (70, 130, 255),
     "L": (255, 140, 40),
+    "G": GRIS,  # Basura (modo versus)
 }
 
 COLOR_FONDO_MENU = (20, 25, 40)
@@ -44,63 +58,342 @@ COLOR_TEXTO_SECUNDARIO = (180, 190, 210)
 COLOR_ACENTO = (100, 200, 255)
 
 DIRECTORIO_SONIDOS = "Sound_Effects"
+DIRECTORIO_BASE = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# Cada partida se graba (semilla + entradas por tick) para poder reproducirla
+GUARDAR_REPETICIONES = True
+DIRECTORIO_REPETICIONES = os.path.join(DIRECTORIO_BASE, "Repeticiones")
+
+# Tabla de puntuaciones local (SQLite); None la desactiva
+ARCHIVO_PUNTUACIONES = os.path.join(DIRECTORIO_BASE, "puntuaciones.db")
+TOP_GAME_OVER = 5
+ESPERA_PUNTUACION_S = 0.5  # Tope de espera a que se guarde la partida antes del menú
+
+# Eventos de cada partida en JSONL rotativo (ver telemetria.py); None la desactiva
+DIRECTORIO_TELEMETRIA = os.path.join(DIRECTORIO_BASE, "Telemetria")
+
+# Umbrales de gestos calibrados por jugador (ver calibracion.py); None los desactiva
+ARCHIVO_PERFILES_GESTOS = os.path.join(DIRECTORIO_BASE, "perfiles_gestos.json")
+
+# MediaPipe en un proceso hijo: la inferencia no compite por el GIL con el render.
+# Opcional: el hijo tarda más en arrancar (hasta proceso_manos.TIMEOUT_ARRANQUE_S)
+MANOS_EN_PROCESO = False
+# El controlador publica el cuadro sin anotar y los landmarks; el juego dibuja
+# las conexiones como líneas (ver controlador_manos.MODOS_PREVISUALIZACION)
+PREVISUALIZACION_CAMARA = 'landmarks'
 
 GRAVEDAD_BASE_S = 0.8
-INTERVALO_CAIDA_SUAVE_S = 0.2
+DURACION_BARRIDO_S = 2.4
+
+# ============================================================
+#                  SIMULACIÓN DE PASO FIJO
+# ============================================================
+class AcumuladorTicks:
+    """Convierte tiempo monotónico transcurrido en ticks lógicos de duración fija."""
+
+    def __init__(self, ticks_por_segundo=TICKS_POR_SEGUNDO,
+                 max_ticks=MAX_TICKS_POR_FRAME, reloj=time.perf_counter):
+        self.dt = 1.0 / ticks_por_segundo
+        self.max_ticks = max_ticks
+        self._reloj = reloj
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descarta el tiempo acumulado (p. ej. al salir de un menú)."""
+        self._ultimo = self._reloj()
+        self._acumulado = 0.0
+
+    def ticks_pendientes(self):
+        """Retorna cuántos ticks lógicos hay que ejecutar en este frame."""
+        ahora = self._reloj()
+        self._acumulado += ahora - self._ultimo
+        self._ultimo = ahora
+
+        ticks = int(self._acumulado / self.dt + 1e-9)  # tolerancia de redondeo
+        if ticks > self.max_ticks:
+            # Tras un atasco (cámara, ventana arrastrada) se descarta el
+            # sobrante en vez de ejecutar una ráfaga de gravedad.
+            self._acumulado = 0.0
+            return self.max_ticks
+        self._acumulado = max(0.0, self._acumulado - ticks * self.dt)
+        return ticks
+
+
+class SimulacionTetris:
+    """Lleva las entradas del jugador al Motor, las graba y avanza de a un tick.
+
+    El Motor decide DAS/ARR, gravedad, lock delay y el buffer de rotaciones;
+    aquí solo se combinan las fuentes (teclado y mano) y se suenan efectos
+    según las notificaciones del Motor.
+    """
+
+    def __init__(self, motor, audio=None, registro=None):
+        self.motor = motor
+        self.audio = audio
+        self.registro = registro  # RegistroPartida opcional
+        self.al_fijar = None  # Callback(lineas_limpiadas) tras cada pieza fijada
+
+        # Entradas mantenidas
+        self.mover_izq = False
+        self.mover_der = False
+        self.caida_suave_teclado = False
+        self.caida_suave_mano = False
+
+        self._ultimo_lado = 0
+        self._horizontal = 0
+        self._caida_suave = False
+        motor.suscribir(self._al_evento_motor)
+
+    @property
+    def tick(self):
+        return self.motor.ticks
+
+    # ----- Entradas -----
+    def encolar(self, accion, valor=0):
+        """Encola 'mover' (dx), 'rotar' (dirección) o 'caida_dura' para el próximo tick."""
+        self._entrada(accion, valor)
+
+    def pulsar_horizontal(self, dx):
+        """Tecla de movimiento presionada: el Motor da un paso y luego aplica DAS/ARR."""
+        if dx < 0:
+            self.mover_izq = True
+        else:
+            self.mover_der = True
+        self._ultimo_lado = dx
+        self._sincronizar_horizontal()
+
+    def soltar_horizontal(self, dx):
+        if dx < 0:
+            self.mover_izq = False
+        else:
+            self.mover_der = False
+        self._sincronizar_horizontal()
+
+    def soltar_todo(self):
+        """Suelta las entradas mantenidas (sus KEYUP pudieron perderse durante una pausa)."""
+        self.mover_izq = self.mover_der = False
+        self.caida_suave_teclado = self.caida_suave_mano = False
+        self._sincronizar_horizontal()
+
+    @property
+    def caida_suave_activa(self):
+        return self.caida_suave_teclado or self.caida_suave_mano
+
+    def _sincronizar_horizontal(self):
+        # Con ambos lados presionados manda el último
+        if self.mover_izq and self.mover_der:
+            lado = self._ultimo_lado
+        else:
+            lado = -1 if self.mover_izq else (1 if self.mover_der else 0)
+        if lado != self._horizontal:
+            self._horizontal = lado
+            self._entrada('horizontal', lado)
+
+    def _entrada(self, accion, valor=0):
+        """Único punto donde la simulación entrega entradas al Motor (y se graban)."""
+        motor = self.motor
+        if self.registro is not None:
+            self.registro.registrar(motor.ticks, accion, valor)
+        if accion == 'horizontal':
+            motor.establecer_horizontal(valor)
+        elif accion == 'caida_suave':
+            motor.establecer_caida_suave(valor)
+        else:
+            motor.encolar(accion, valor)
+
+    # ----- Tick -----
+    def paso(self):
+        """Ejecuta exactamente un tick lógico."""
+        if self.motor.game_over:
+            return
+        if self.caida_suave_activa != self._caida_suave:
+            self._caida_suave = self.caida_suave_activa
+            self._entrada('caida_suave', int(self._caida_suave))
+
+        eventos = self.motor.tick()
+        if 'mover' in eventos:
+            self._sonar('move.wav')
+        if 'rotar' in eventos or 'hold' in eventos:
+            self._sonar('rotate.wav')
+        if 'fijar' in eventos and self.al_fijar is not None:
+            self.al_fijar(self.motor.ultimas_lineas)
+
+    def _al_evento_motor(self, evento, datos):
+        if evento == 'pieza_fijada':
+            self._sonar('piece_landed.wav')
+        elif evento == 'lineas_limpiadas':
+            self._sonar('4_lines.wav' if len(datos) >= 4 else 'line.wav')
+        elif evento == 'subida_nivel':
+            self._sonar('level_up.wav')
+
+    def _sonar(self, nombre):
+        if self.audio is not None:
+            self.audio.reproducir(nombre)
+
+class AnimacionBarrido:
+    """Barrido de game over por filas (de abajo hacia arriba), avanzado por frames.
+
+    No bloquea: el bucle principal llama a avanzar() cada frame y sigue
+    atendiendo eventos mientras tanto.
+    """
+
+    def __init__(self, filas=FILAS, duracion_s=DURACION_BARRIDO_S, reloj=time.perf_counter):
+        self.filas = filas
+        self.duracion_s = duracion_s
+        self._reloj = reloj
+        self._inicio = reloj()
+        self.filas_cubiertas = 0
+
+    @property
+    def terminado(self):
+        return self.filas_cubiertas >= self.filas
+
+    def saltar(self):
+        """Termina el barrido en el próximo avanzar()."""
+        self.duracion_s = 0.0
+
+    def avanzar(self):
+        """Retorna los índices de fila que se cubren en este frame."""
+        if self.duracion_s <= 0:
+            objetivo = self.filas
+        else:
+            fraccion = (self._reloj() - self._inicio) / self.duracion_s
+            objetivo = min(self.filas, int(fraccion * self.filas))
+        nuevas = [self.filas - 1 - i for i in range(self.filas_cubiertas, objetivo)]
+        self.filas_cubiertas = max(self.filas_cubiertas, objetivo)
+        return nuevas
 
 # ============================================================
 #                      RENDERIZADO
 # ============================================================
+def tamano_celda(columnas, filas):
+    """Lado de celda para que el tablero entre en el área del tablero clásico."""
+    return max(CELDA_MIN, min(CELDA, COLUMNAS * CELDA // columnas, FILAS * CELDA // filas))
+
+
 class RenderizadorTetris:
     """Maneja todo el renderizado visual del juego."""
     
-    def __init__(self, pantalla):
+    def __init__(self, pantalla, columnas=COLUMNAS, filas=FILAS):
         self.pantalla = pantalla
+        self.columnas = columnas
+        self.filas = filas
+        self.celda = tamano_celda(columnas, filas)
+        # Tableros más chicos que el área quedan centrados en ella
+        self.desplazamiento_x = max(0, (COLUMNAS * CELDA - columnas * self.celda) // 2)
+        self._fondo = None  # Cuadrícula vacía, dibujada una sola vez
+        self._hud = None  # (clave, [(superficie, posición)]) del último HUD compuesto
         self.fuente = pygame.font.SysFont("Consolas", 16)
         self.fuente_grande = pygame.font.SysFont("Consolas", 36, bold=True)
         self.fuente_media = pygame.font.SysFont("Consolas", 22)
         self.fuente_pequena = pygame.font.SysFont("Consolas", 12)
+        self._sprites = {}  # (tipo, celda, apagado) -> Surface de la pieza
+        self._celdas = {}  # tipo -> Surface de una celda fija del tablero
     
-    def dibujar_tablero(self, tablero):
-        self.pantalla.fill(NEGRO)
-        margen_y = 20
-        for y in range(FILAS):
-            for x in range(COLUMNAS):
-                rect = pygame.Rect(x * CELDA, y * CELDA + margen_y, CELDA, CELDA)
-                if tablero[y][x] is not None:
-                    color = COLORES_PIEZAS.get(tablero[y][x], BLANCO)
-                    pygame.draw.rect(self.pantalla, color, rect)
-                    color_oscuro = tuple(max(0, c - 40) for c in color)
-                    pygame.draw.rect(self.pantalla, color_oscuro, rect, 2)
-                else:
-                    pygame.draw.rect(self.pantalla, CUADRICULA, rect, 1)
+    def dibujar_tablero(self, tablero, origen=(0, 0), limpiar=True, filas_ocupadas=None):
+        """Dibuja el tablero con su esquina en origen. limpiar=False permite varios tableros por frame.
+        
+        filas_ocupadas (ver Motor.filas_ocupadas) evita buscar las filas con
+        bloques; sin ella se revisa cada fila.
+        """
+        if limpiar:
+            self.pantalla.fill(NEGRO)
+        ox, oy = origen
+        ox += self.desplazamiento_x
+        margen_y = 20 + oy
+        celda = self.celda
+        self.pantalla.blit(self._fondo_tablero(), (ox, margen_y))
+        
+        if filas_ocupadas is None:
+            columnas = len(tablero[0]) if tablero else 0
+            filas_ocupadas = [y for y, fila in enumerate(tablero) if fila.count(None) != columnas]
+        # Una celda prerenderizada por color, todas en un solo blits
+        sprite = self._sprite_celda
+        celdas = []
+        for y in filas_ocupadas:
+            py = y * celda + margen_y
+            celdas.extend((sprite(tipo), (ox + x * celda, py))
+                          for x, tipo in enumerate(tablero[y]) if tipo is not None)
+        if celdas:
+            self.pantalla.blits(celdas, False)
+    
+    def _sprite_celda(self, tipo):
+        sprite = self._celdas.get(tipo)
+        if sprite is None:
+            celda = self.celda
+            color = COLORES_PIEZAS.get(tipo, BLANCO)
+            sprite = pygame.Surface((celda, celda))
+            sprite.fill(color)
+            if celda >= 8:
+                color_oscuro = tuple(max(0, c - 40) for c in color)
+                pygame.draw.rect(sprite, color_oscuro, (0, 0, celda, celda), 2)
+            self._celdas[tipo] = sprite
+        return sprite
     
-    def dibujar_pieza(self, pieza):
+    def _fondo_tablero(self):
+        if self._fondo is None:
+            celda = self.celda
+            self._fondo = pygame.Surface((self.columnas * celda, self.filas * celda))
+            self._fondo.fill(NEGRO)
+            for y in range(self.filas):
+                for x in range(self.columnas):
+                    pygame.draw.rect(self._fondo, CUADRICULA, (x * celda, y * celda, celda, celda), 1)
+        return self._fondo
+    
+    def dibujar_pieza(self, pieza, origen=(0, 0)):
         if pieza is None:
             return
-        margen_y = 20
+        ox, oy = origen
+        ox += self.desplazamiento_x
+        margen_y = 20 + oy
+        celda = self.celda
         color = COLORES_PIEZAS.get(pieza.tipo, BLANCO)
+        color_claro = tuple(min(255, c + 30) for c in color)
         for (x, y) in pieza.celdas():
             if y >= 0:
-                rect = pygame.Rect(x * CELDA, y * CELDA + margen_y, CELDA, CELDA)
+                rect = pygame.Rect(ox + x * celda, y * celda + margen_y, celda, celda)
                 pygame.draw.rect(self.pantalla, color, rect)
-                color_claro = tuple(min(255, c + 30) for c in color)
-                pygame.draw.rect(self.pantalla, color_claro, rect, 3)
+                if celda >= 8:
+                    pygame.draw.rect(self.pantalla, color_claro, rect, 3 if celda >= 16 else 1)
+    
+    def dibujar_fantasma(self, pieza, fila, origen=(0, 0)):
+        """Contorno de la pieza en su fila de aterrizaje."""
+        if pieza is None or fila is None or fila == pieza.y:
+            return
+        ox, oy = origen
+        ox += self.desplazamiento_x
+        margen_y = 20 + oy
+        celda = self.celda
+        color = tuple(c // 2 for c in COLORES_PIEZAS.get(pieza.tipo, BLANCO))
+        dy = fila - pieza.y
+        for (x, y) in pieza.celdas():
+            if y + dy >= 0:
+                rect = pygame.Rect(ox + x * celda, (y + dy) * celda + margen_y, celda, celda)
+                pygame.draw.rect(self.pantalla, color, rect, 2 if celda >= 8 else 1)
     
-    def dibujar_camara(self, frame_bgr):
-        if frame_bgr is None:
+    def dibujar_camara(self, frame_bgr, landmarks=None):
+        if frame_bgr is None and landmarks is None:
             return
         
         try:
-            frame_rgb = frame_bgr[:, :, ::-1]
-            h, w = frame_rgb.shape[:2]
-            if w != CAMARA_ANCHO or h != CAMARA_ALTO:
-                import cv2
-                frame_rgb = cv2.resize(frame_rgb, (CAMARA_ANCHO, CAMARA_ALTO))
+            if frame_bgr is not None:
+                frame_rgb = frame_bgr[:, :, ::-1]
+                h, w = frame_rgb.shape[:2]
+                if w != CAMARA_ANCHO or h != CAMARA_ALTO:
+                    import cv2
+                    frame_rgb = cv2.resize(frame_rgb, (CAMARA_ANCHO, CAMARA_ALTO))
+                import numpy as np  # Solo se necesita cuando hay cámara
+                
+                frame_surface = pygame.surfarray.make_surface(
+                    np.transpose(frame_rgb, (1, 0, 2))
+                )
+                self.pantalla.blit(frame_surface, (CAMARA_POS_X, CAMARA_POS_Y))
+            else:
+                pygame.draw.rect(self.pantalla, (40, 40, 60),
+                                 (CAMARA_POS_X, CAMARA_POS_Y, CAMARA_ANCHO, CAMARA_ALTO))
             
-            frame_surface = pygame.surfarray.make_surface(
-                np.transpose(frame_rgb, (1, 0, 2))
-            )
+            if landmarks:
+                self._dibujar_landmarks(landmarks)
             
             borde_rect = pygame.Rect(
                 CAMARA_POS_X - 2, 
@@ -110,8 +403,6 @@ class RenderizadorTetris:
             )
             pygame.draw.rect(self.pantalla, COLOR_ACENTO, borde_rect, 2)
             
-            self.pantalla.blit(frame_surface, (CAMARA_POS_X, CAMARA_POS_Y))
-            
             etiqueta = self.fuente_pequena.render("CÁMARA", True, COLOR_ACENTO)
             etiqueta_rect = etiqueta.get_rect()
             etiqueta_rect.centerx = CAMARA_POS_X + CAMARA_ANCHO // 2
@@ -126,9 +417,32 @@ class RenderizadorTetris:
             texto_rect = texto.get_rect(center=rect.center)
             self.pantalla.blit(texto, texto_rect)
     
+    def _dibujar_landmarks(self, landmarks):
+        """Conexiones de cada mano como líneas, a partir de coordenadas normalizadas."""
+        area = pygame.Rect(CAMARA_POS_X, CAMARA_POS_Y, CAMARA_ANCHO, CAMARA_ALTO)
+        clip_previo = self.pantalla.get_clip()
+        self.pantalla.set_clip(area)
+        for mano in landmarks:
+            puntos = [(CAMARA_POS_X + int(x * CAMARA_ANCHO), CAMARA_POS_Y + int(y * CAMARA_ALTO))
+                      for x, y in mano]
+            for a, b in CONEXIONES_MANO:
+                pygame.draw.line(self.pantalla, COLOR_ACENTO, puntos[a], puntos[b], 2)
+            for punto in puntos:
+                pygame.draw.circle(self.pantalla, BLANCO, punto, 3)
+        self.pantalla.set_clip(clip_previo)
+    
     def dibujar_hud(self, estado, mano_activa):
+        # Los textos solo se vuelven a renderizar si cambiaron las estadísticas
+        clave = (estado.get('version_estadisticas'), mano_activa)
+        if self._hud is None or self._hud[0] != clave or clave[0] is None:
+            self._hud = (clave, self._componer_hud(estado, mano_activa))
+        for superficie, posicion in self._hud[1]:
+            self.pantalla.blit(superficie, posicion)
+    
+    def _componer_hud(self, estado, mano_activa):
         x_base = COLUMNAS * CELDA + 15  
         y = CAMARA_POS_Y + CAMARA_ALTO + 30
+        textos = []
         
         titulo_lineas = [
             ("Puntaje: ", COLOR_TEXTO_SECUNDARIO, f"{estado['puntaje']}", COLOR_ACENTO),
@@ -139,8 +453,8 @@ class RenderizadorTetris:
         for label, color_label, valor, color_valor in titulo_lineas:
             txt_label = self.fuente.render(label, True, color_label)
             txt_valor = self.fuente.render(valor, True, color_valor)
-            self.pantalla.blit(txt_label, (x_base, y))
-            self.pantalla.blit(txt_valor, (x_base + txt_label.get_width(), y))
+            textos.append((txt_label, (x_base, y)))
+            textos.append((txt_valor, (x_base + txt_label.get_width(), y)))
             y += self.fuente.get_linesize() + 4  
         
         y += 12  
@@ -148,7 +462,7 @@ class RenderizadorTetris:
         estado_mano = "Manos: ON" if mano_activa else "Manos: OFF"
         color_mano = (50, 255, 100) if mano_activa else (255, 100, 100)
         txt = self.fuente.render(estado_mano, True, color_mano)
-        self.pantalla.blit(txt, (x_base, y))
+        textos.append((txt, (x_base, y)))
         y += self.fuente.get_linesize() + 12
         
         lineas_info = [
@@ -157,6 +471,8 @@ class RenderizadorTetris:
             ("↑ X : Rotar", COLOR_TEXTO_PRINCIPAL),
             ("↓ : Caída Suave", COLOR_TEXTO_PRINCIPAL),
             ("SPACE : Caída Dura", COLOR_TEXTO_PRINCIPAL),
+            ("C / Shift : Guardar", COLOR_TEXTO_PRINCIPAL),
+            ("P / Esc : Pausa", COLOR_TEXTO_PRINCIPAL),
             ("", COLOR_TEXTO_PRINCIPAL),
             ("GESTOS:", COLOR_ACENTO),
             ("Pulgar↑ L/R : Mover", COLOR_TEXTO_SECUNDARIO),
@@ -167,73 +483,161 @@ class RenderizadorTetris:
         
         for linea, color in lineas_info:
             txt = self.fuente.render(linea, True, color)
-            self.pantalla.blit(txt, (x_base, y))
+            textos.append((txt, (x_base, y)))
             y += self.fuente.get_linesize() + 3
+        return textos
 
-    def barrido_game_over(self, tablero):
-        self.dibujar_tablero(tablero)
-        pygame.display.flip()
+    def _sprite_pieza(self, tipo, celda, apagado=False):
+        """Superficie de la pieza en su rotación inicial, recortada a sus celdas (se crea una vez)."""
+        clave = (tipo, celda, apagado)
+        sprite = self._sprites.get(clave)
+        if sprite is None:
+            mat = TETROMINOS[tipo]["rot"][0]
+            celdas = [(i, j) for j in range(4) for i in range(4) if mat[j][i]]
+            min_x = min(i for i, _ in celdas)
+            min_y = min(j for _, j in celdas)
+            ancho = (max(i for i, _ in celdas) - min_x + 1) * celda
+            alto = (max(j for _, j in celdas) - min_y + 1) * celda
+            sprite = pygame.Surface((ancho, alto), pygame.SRCALPHA)
+            color = GRIS if apagado else COLORES_PIEZAS.get(tipo, BLANCO)
+            borde = tuple(max(0, c - 40) for c in color)
+            for i, j in celdas:
+                rect = pygame.Rect((i - min_x) * celda, (j - min_y) * celda, celda, celda)
+                pygame.draw.rect(sprite, color, rect)
+                pygame.draw.rect(sprite, borde, rect, 1)
+            self._sprites[clave] = sprite
+        return sprite
+    
+    def _dibujar_ranura(self, tipo, rect, celda, apagado=False):
+        pygame.draw.rect(self.pantalla, CUADRICULA, rect, 1)
+        if tipo is not None:
+            sprite = self._sprite_pieza(tipo, celda, apagado)
+            self.pantalla.blit(sprite, sprite.get_rect(center=rect.center))
+    
+    def dibujar_paneles(self, vista_previa, pieza_guardada, hold_usado=False):
+        """Hold junto a las estadísticas y la cola de próximas piezas al pie del panel lateral."""
+        x_base = COLUMNAS * CELDA + 15
+        y_hold = CAMARA_POS_Y + CAMARA_ALTO + 30
+        ranura_hold = pygame.Rect(x_base + ANCHO_LATERAL - 110, y_hold + 16, 90, 56)
+        etiqueta = self.fuente_pequena.render("GUARDADA", True, COLOR_TEXTO_SECUNDARIO)
+        self.pantalla.blit(etiqueta, (ranura_hold.x, y_hold))
+        self._dibujar_ranura(pieza_guardada, ranura_hold, 18, apagado=hold_usado)
         
+        if not vista_previa:
+            return
+        lado = (ANCHO_LATERAL - 30) // len(vista_previa)
+        y_cola = ALTO - lado - 14
+        etiqueta = self.fuente_pequena.render("SIGUIENTES", True, COLOR_TEXTO_SECUNDARIO)
+        self.pantalla.blit(etiqueta, (x_base, y_cola - 16))
+        for i, tipo in enumerate(vista_previa):
+            ranura = pygame.Rect(x_base + i * lado, y_cola, lado - 4, lado - 4)
+            # La primera pieza de la cola se ve más grande
+            self._dibujar_ranura(tipo, ranura, lado // 4 if i == 0 else lado // 5)
+    
+    def dibujar_marcador(self, estado, origen, titulo, basura_pendiente=0):
+        """HUD compacto bajo un tablero (modo versus)."""
+        ox, oy = origen
+        alto_tablero = self.filas * self.celda
+        y = oy + 20 + alto_tablero + 6
+        texto = f"{titulo}  Pts: {estado['puntaje']}  Lín: {estado['lineas']}"
+        self.pantalla.blit(self.fuente.render(texto, True, COLOR_TEXTO_PRINCIPAL), (ox, y))
+        if basura_pendiente > 0:
+            # Barra roja a la izquierda del tablero: basura que está por llegar
+            alto = min(self.filas, basura_pendiente) * self.celda
+            barra = pygame.Rect(ox - 8, oy + 20 + alto_tablero - alto, 6, alto)
+            pygame.draw.rect(self.pantalla, (255, 60, 60), barra)
+    
+    def dibujar_barrido(self, filas):
+        """Cubre las filas indicadas del tablero. Retorna el Rect a actualizar o None."""
+        if not filas:
+            return None
         margen_y = 20
-        retraso_ms = 12
-        for y in range(FILAS - 1, -1, -1):
-            for x in range(COLUMNAS):
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        sys.exit()
-                
-                rect = pygame.Rect(x * CELDA, y * CELDA + margen_y, CELDA, CELDA)
-                pygame.draw.rect(self.pantalla, (40, 40, 60), rect)
+        celda = self.celda
+        ox = self.desplazamiento_x
+        zona = None
+        for y in filas:
+            fila_rect = pygame.Rect(ox, y * celda + margen_y, self.columnas * celda, celda)
+            pygame.draw.rect(self.pantalla, (40, 40, 60), fila_rect)
+            for x in range(self.columnas):
+                rect = pygame.Rect(ox + x * celda, y * celda + margen_y, celda, celda)
                 pygame.draw.rect(self.pantalla, CUADRICULA, rect, 1)
-                pygame.display.update(rect)
-                pygame.time.wait(retraso_ms)
+            zona = fila_rect if zona is None else zona.union(fila_rect)
+        return zona
     
     def input_nombre(self):
         """Pantalla para ingresar el nombre del jugador."""
         nombre = ""
         activo = True
+        redibujar = True
         
         while activo:
-            cx, cy = self.pantalla.get_rect().center
-            self.pantalla.fill(COLOR_FONDO_MENU)
-            
-            titulo = self.fuente_grande.render("NUEVO JUEGO", True, COLOR_ACENTO)
-            instruccion = self.fuente.render("Ingresa tu nombre:", True, COLOR_TEXTO_SECUNDARIO)
-            
-            input_box = pygame.Rect(cx - 100, cy, 200, 32)
-            pygame.draw.rect(self.pantalla, (30, 35, 50), input_box)
-            pygame.draw.rect(self.pantalla, COLOR_ACENTO, input_box, 2)
-            
-            texto_surf = self.fuente_media.render(nombre, True, BLANCO)
-            self.pantalla.blit(texto_surf, (input_box.x + 5, input_box.y + 5))
-            
-            ayuda = self.fuente_pequena.render("Presiona ENTER para confirmar", True, (100, 255, 150))
-            
-            self.pantalla.blit(titulo, titulo.get_rect(center=(cx, cy - 60)))
-            self.pantalla.blit(instruccion, instruccion.get_rect(center=(cx, cy - 25)))
-            self.pantalla.blit(ayuda, ayuda.get_rect(center=(cx, cy + 50)))
-            
-            pygame.display.flip()
+            if redibujar:
+                self._dibujar_input_nombre(nombre)
+                redibujar = False
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN:
-                        if not nombre.strip():
-                            nombre = "Jugador"
-                        activo = False
-                    elif event.key == pygame.K_BACKSPACE:
-                        nombre = nombre[:-1]
-                    else:
-                        if len(nombre) < 12: 
-                            nombre += event.unicode
+            # Bloquea hasta que llegue un evento: sin consumo de CPU en reposo
+            event = pygame.event.wait(ESPERA_MENU_MS)
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            if event.type == pygame.VIDEOEXPOSE:
+                redibujar = True
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_RETURN:
+                    if not nombre.strip():
+                        nombre = "Jugador"
+                    activo = False
+                elif event.key == pygame.K_BACKSPACE:
+                    nombre = nombre[:-1]
+                    redibujar = True
+                else:
+                    if len(nombre) < 12 and event.unicode:
+                        nombre += event.unicode
+                        redibujar = True
         return nombre
 
-    def menu_game_over(self, puntaje, lineas, nivel, nombre_jugador):
-        superposicion = pygame.Surface((ANCHO, ALTO), pygame.SRCALPHA)
+    def _dibujar_input_nombre(self, nombre):
+        cx, cy = self.pantalla.get_rect().center
+        self.pantalla.fill(COLOR_FONDO_MENU)
+        
+        titulo = self.fuente_grande.render("NUEVO JUEGO", True, COLOR_ACENTO)
+        instruccion = self.fuente.render("Ingresa tu nombre:", True, COLOR_TEXTO_SECUNDARIO)
+        
+        input_box = pygame.Rect(cx - 100, cy, 200, 32)
+        pygame.draw.rect(self.pantalla, (30, 35, 50), input_box)
+        pygame.draw.rect(self.pantalla, COLOR_ACENTO, input_box, 2)
+        
+        texto_surf = self.fuente_media.render(nombre, True, BLANCO)
+        self.pantalla.blit(texto_surf, (input_box.x + 5, input_box.y + 5))
+        
+        ayuda = self.fuente_pequena.render("Presiona ENTER para confirmar", True, (100, 255, 150))
+        
+        self.pantalla.blit(titulo, titulo.get_rect(center=(cx, cy - 60)))
+        self.pantalla.blit(instruccion, instruccion.get_rect(center=(cx, cy - 25)))
+        self.pantalla.blit(ayuda, ayuda.get_rect(center=(cx, cy + 50)))
+        
+        pygame.display.flip()
+
+    def dibujar_pausa(self, fondo):
+        """Cartel de pausa sobre una copia del último frame (se redibuja igual tras un expose)."""
+        self.pantalla.blit(fondo, (0, 0))
+        ancho, alto = self.pantalla.get_size()
+        superposicion = pygame.Surface((ancho, alto), pygame.SRCALPHA)
+        superposicion.fill(COLOR_OVERLAY)
+        self.pantalla.blit(superposicion, (0, 0))
+        titulo = self.fuente_grande.render("PAUSA", True, COLOR_ACENTO)
+        ayuda = self.fuente.render("Presiona P o Esc para continuar", True, (100, 255, 150))
+        salir = self.fuente_pequena.render("Q para salir", True, COLOR_TEXTO_SECUNDARIO)
+        cx, cy = ancho // 2, alto // 2
+        self.pantalla.blit(titulo, titulo.get_rect(center=(cx, cy - 30)))
+        self.pantalla.blit(ayuda, ayuda.get_rect(center=(cx, cy + 15)))
+        self.pantalla.blit(salir, salir.get_rect(center=(cx, cy + 45)))
+        pygame.display.flip()
+
+    def menu_game_over(self, puntaje, lineas, nivel, nombre_jugador, ranking=None, mejor_personal=None):
+        """Resultado de la partida; con ranking, además el top y el mejor puntaje del jugador."""
+        ancho, alto = self.pantalla.get_size()
+        superposicion = pygame.Surface((ancho, alto), pygame.SRCALPHA)
         superposicion.fill(COLOR_OVERLAY)
         self.pantalla.blit(superposicion, (0, 0))
         
@@ -248,27 +652,48 @@ class RenderizadorTetris:
         ayuda1 = self.fuente.render("Presiona R para Reiniciar", True, (100, 255, 150))
         ayuda2 = self.fuente.render("Presiona Q o Esc para Salir", True, COLOR_TEXTO_SECUNDARIO)
         
-        cx, cy = ANCHO // 2, ALTO // 2
+        cx, cy = ancho // 2, alto // 2
+        if ranking is not None:
+            cy -= 100  # Lugar para la tabla
         
         self.pantalla.blit(titulo, titulo.get_rect(center=(cx, cy - 80)))
         self.pantalla.blit(nombre_txt, nombre_txt.get_rect(center=(cx, cy - 30)))
         self.pantalla.blit(stats, stats.get_rect(center=(cx, cy + 10)))
+        
+        if ranking is not None:
+            y = cy + 45
+            if mejor_personal is not None:
+                texto = "¡NUEVO RÉCORD PERSONAL!" if puntaje >= mejor_personal else f"Tu mejor: {mejor_personal}"
+                mejor_txt = self.fuente.render(texto, True, COLOR_TEXTO_SECUNDARIO)
+                self.pantalla.blit(mejor_txt, mejor_txt.get_rect(center=(cx, y)))
+            y += 35
+            encabezado = self.fuente.render("MEJORES PUNTAJES", True, COLOR_ACENTO)
+            self.pantalla.blit(encabezado, encabezado.get_rect(center=(cx, y)))
+            for i, (nombre, pts, _, _) in enumerate(ranking, 1):
+                y += 24
+                fila = self.fuente.render(f"{i}. {nombre[:12]:<12} {pts:>8}", True, COLOR_TEXTO_PRINCIPAL)
+                self.pantalla.blit(fila, fila.get_rect(center=(cx, y)))
+            cy = y + 10
+        
         self.pantalla.blit(ayuda1, ayuda1.get_rect(center=(cx, cy + 60)))
         self.pantalla.blit(ayuda2, ayuda2.get_rect(center=(cx, cy + 90)))
         
         pygame.display.flip()
         
         while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+            event = pygame.event.wait(ESPERA_MENU_MS)
+            if event.type == pygame.QUIT:
+                return False
+            elif event.type == pygame.VIDEOEXPOSE:
+                pygame.display.flip()
+            elif event.type == pygame.KEYDOWN:
+                if event.key in (pygame.K_q, pygame.K_ESCAPE):
                     return False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key in (pygame.K_q, pygame.K_ESCAPE):
-                        return False
-                    if event.key == pygame.K_r:
-                        return True
+                if event.key == pygame.K_r:
+                    return True
     
-    def pantalla_carga(self, mensaje, tiene_mano):
+    def pantalla_carga(self, mensaje, tiene_mano, progreso=None):
+        """Pantalla de inicio. Con progreso (0..1) muestra la barra de carga de la cámara."""
         cx, cy = self.pantalla.get_rect().center
         self.pantalla.fill(COLOR_FONDO_MENU)
         titulo = self.fuente_grande.render("TETRIS", True, COLOR_ACENTO)
@@ -277,25 +702,88 @@ class RenderizadorTetris:
         self.pantalla.blit(titulo, titulo.get_rect(center=(cx, cy - 60)))
         self.pantalla.blit(estado, estado.get_rect(center=(cx, cy - 10)))
         self.pantalla.blit(ayuda, ayuda.get_rect(center=(cx, cy + 30)))
+        if tiene_mano and ARCHIVO_PERFILES_GESTOS:
+            calibrar = self.fuente_pequena.render("K: calibrar gestos", True, COLOR_TEXTO_SECUNDARIO)
+            self.pantalla.blit(calibrar, calibrar.get_rect(center=(cx, cy + 90)))
+        
+        if progreso is not None:
+            self._barra_progreso(cx, cy + 60, progreso)
         pygame.display.flip()
 
-class GestorAudio:
-    """Carga audios locales desde la carpeta Sound_Effects (hermana de src)."""
+    def _barra_progreso(self, cx, y, progreso):
+        barra = pygame.Rect(cx - 100, y, 200, 8)
+        pygame.draw.rect(self.pantalla, (30, 35, 50), barra)
+        lleno = barra.copy()
+        lleno.width = int(barra.width * max(0.0, min(1.0, progreso)))
+        pygame.draw.rect(self.pantalla, COLOR_ACENTO, lleno)
+
+    def pantalla_calibracion(self, instruccion, grabando, progreso, frame=None, landmarks=None):
+        """Un paso de la calibración de gestos, con la cámara para que el jugador se vea."""
+        cx, cy = self.pantalla.get_rect().center
+        self.pantalla.fill(COLOR_FONDO_MENU)
+        titulo = self.fuente_grande.render("CALIBRACIÓN", True, COLOR_ACENTO)
+        pose = self.fuente.render(instruccion, True, COLOR_TEXTO_PRINCIPAL)
+        estado = self.fuente_pequena.render("Grabando..." if grabando else "Prepárate...", True,
+                                            (100, 255, 150) if grabando else COLOR_TEXTO_SECUNDARIO)
+        ayuda = self.fuente_pequena.render("ESC para cancelar", True, COLOR_TEXTO_SECUNDARIO)
+        self.pantalla.blit(titulo, titulo.get_rect(center=(cx, cy - 60)))
+        self.pantalla.blit(pose, pose.get_rect(center=(cx, cy - 10)))
+        self.pantalla.blit(estado, estado.get_rect(center=(cx, cy + 25)))
+        self._barra_progreso(cx, cy + 50, progreso)
+        self.pantalla.blit(ayuda, ayuda.get_rect(center=(cx, cy + 90)))
+        self.dibujar_camara(frame, landmarks)
+        pygame.display.flip()
+
+# ============================================================
+#                          AUDIO
+# ============================================================
+ARCHIVOS_SONIDO = [
+    "4_lines.wav", "background.wav", "game_over.wav",
+    "level_up.wav", "line.wav", "move.wav",
+    "piece_landed.wav", "rotate.wav"
+]
+
+# Cada clase de efecto tiene su canal reservado: una ráfaga de move.wav
+# solo se pisa a sí misma y nunca deja sin canal a line.wav.
+CLASES_EFECTO = {
+    "move.wav": 0, "rotate.wav": 0,        # movimiento
+    "piece_landed.wav": 1,                 # fijación
+    "line.wav": 2, "4_lines.wav": 2,       # líneas
+    "level_up.wav": 3, "game_over.wav": 3, # eventos
+}
+MAX_VOCES = 8  # Canales totales del mixer (reservados + libres)
+
+
+class BancoSonidos:
+    """Sonidos decodificados una sola vez por proceso, con canales reservados por clase."""
 
     def __init__(self):
         self.sonidos = {}
         self.audio_disponible = True
-        self._cargar_sonidos()
+        self.musica_cargada = False
+        self._canales = {}
+        self._listo = threading.Event()
 
-    def _cargar_sonidos(self):
+    @property
+    def listo(self):
+        return self._listo.is_set()
+
+    def esperar(self, timeout=None):
+        """Espera a que termine la carga (útil si se cargó en segundo plano)."""
+        return self._listo.wait(timeout)
+
+    def cargar(self):
+        """Lee y decodifica los WAV de Sound_Effects (hermana de src)."""
         try:
-            if '__file__' in globals():
-                dir_actual = os.path.dirname(os.path.abspath(__file__))
-            else:
-                dir_actual = os.getcwd()
+            self._cargar_sonidos()
+            if self.audio_disponible:
+                self._configurar_canales()
+        finally:
+            self._listo.set()
 
-            ruta_sonidos = os.path.join(dir_actual, "..", "Sound_Effects")
-            ruta_sonidos = os.path.abspath(ruta_sonidos)
+    def _cargar_sonidos(self):
+        try:
+            ruta_sonidos = os.path.join(DIRECTORIO_BASE, DIRECTORIO_SONIDOS)
 
             print(f"--- Buscando sonidos en: {ruta_sonidos} ---")
 
@@ -304,20 +792,15 @@ class GestorAudio:
                 self.audio_disponible = False
                 return
 
-            archivos = [
-                "4_lines.wav", "background.wav", "game_over.wav", 
-                "level_up.wav", "line.wav", "move.wav", 
-                "piece_landed.wav", "rotate.wav"
-            ]
-
             sonidos_cargados = 0
-            for nombre in archivos:
+            for nombre in ARCHIVOS_SONIDO:
                 ruta_completa = os.path.join(ruta_sonidos, nombre)
                 
                 if os.path.exists(ruta_completa):
                     try:
                         if nombre == "background.wav":
                             pygame.mixer.music.load(ruta_completa)
+                            self.musica_cargada = True
                         else:
                             self.sonidos[nombre] = pygame.mixer.Sound(ruta_completa)
                         sonidos_cargados += 1
@@ -335,15 +818,67 @@ class GestorAudio:
             print(f"[ERROR CRITICO] Audio deshabilitado: {e}")
             self.audio_disponible = False
 
+    def _configurar_canales(self):
+        try:
+            n_clases = len(set(CLASES_EFECTO.values()))
+            pygame.mixer.set_num_channels(MAX_VOCES)
+            pygame.mixer.set_reserved(n_clases)
+            self._canales = {i: pygame.mixer.Channel(i) for i in range(n_clases)}
+        except Exception as e:
+            print(f"[ADVERTENCIA] Sin canales reservados: {e}")
+            self._canales = {}
+
     def reproducir(self, nombre):
-        if self.audio_disponible and nombre in self.sonidos:
-            try:
-                self.sonidos[nombre].play()
-            except:
-                pass
+        if not self.listo or not self.audio_disponible:
+            return
+        sonido = self.sonidos.get(nombre)
+        if sonido is None:
+            return
+        try:
+            canal = self._canales.get(CLASES_EFECTO.get(nombre))
+            if canal is not None:
+                canal.play(sonido)  # Reemplaza al efecto anterior de su clase
+            else:
+                sonido.play()
+        except Exception:
+            pass
+
+
+_banco_sonidos = None
+_lock_banco = threading.Lock()
+
+def obtener_banco_sonidos(en_segundo_plano=False):
+    """Retorna el banco compartido del proceso, cargándolo la primera vez."""
+    global _banco_sonidos
+    with _lock_banco:
+        if _banco_sonidos is None:
+            _banco_sonidos = BancoSonidos()
+            if en_segundo_plano:
+                threading.Thread(target=_banco_sonidos.cargar, daemon=True).start()
+            else:
+                _banco_sonidos.cargar()
+    return _banco_sonidos
+
+
+class GestorAudio:
+    """Audio de una partida sobre el banco de sonidos compartido del proceso."""
+
+    def __init__(self, banco=None):
+        self.banco = banco if banco is not None else obtener_banco_sonidos()
+
+    @property
+    def sonidos(self):
+        return self.banco.sonidos
+
+    @property
+    def audio_disponible(self):
+        return self.banco.audio_disponible
+
+    def reproducir(self, nombre):
+        self.banco.reproducir(nombre)
     
     def iniciar_musica(self):
-        if self.audio_disponible:
+        if self.banco.listo and self.banco.musica_cargada:
             try:
                 pygame.mixer.music.play(-1)
             except:
@@ -354,234 +889,377 @@ class GestorAudio:
             pygame.mixer.music.stop()
         except:
             pass
+    
+    def pausar_musica(self):
+        try:
+            pygame.mixer.music.pause()
+        except:
+            pass
+    
+    def reanudar_musica(self):
+        try:
+            pygame.mixer.music.unpause()
+        except:
+            pass
+
+def guardar_repeticion(registro, nombre_jugador):
+    """Guarda la repetición en DIRECTORIO_REPETICIONES. Nunca interrumpe el juego."""
+    try:
+        os.makedirs(DIRECTORIO_REPETICIONES, exist_ok=True)
+        nombre_seguro = "".join(c for c in nombre_jugador if c.isalnum()) or "Jugador"
+        archivo = f"{time.strftime('%Y%m%d_%H%M%S')}_{nombre_seguro}.ttr"
+        registro.guardar(os.path.join(DIRECTORIO_REPETICIONES, archivo))
+    except Exception as e:
+        print(f"[ERROR] No se pudo guardar la repetición: {e}")
+
+def crear_ventana():
+    pantalla = pygame.display.set_mode((ANCHO, ALTO))
+    pygame.display.set_caption("Tetris — Controles Teclado + Mano")
+    return pantalla
+
+def mano_lista(mano, carga_manos, perfil=None):
+    """Retorna el controlador de manos si ya está disponible, o None.
+    
+    Al tomar el controlador le aplica el perfil de gestos del jugador (None = por defecto).
+    """
+    if mano is None and carga_manos is not None and carga_manos.terminado:
+        mano = carga_manos.controlador
+        if mano is not None:
+            mano.aplicar_perfil(perfil)
+    return mano
+
+def esperar_fin_pausa(render):
+    """Duerme en pygame.event.wait hasta que el jugador reanude. Retorna False si quiere salir."""
+    fondo = render.pantalla.copy()
+    render.dibujar_pausa(fondo)
+    while True:
+        event = pygame.event.wait()
+        if event.type == pygame.QUIT:
+            return False
+        if event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_p, pygame.K_ESCAPE):
+                return True
+            if event.key == pygame.K_q:
+                return False
+        elif event.type == pygame.VIDEOEXPOSE:
+            render.dibujar_pausa(fondo)
+
+def calibrar_gestos(render, mano, reloj):
+    """Graba las poses de calibracion.POSES y retorna el perfil ajustado, o None."""
+    sesion = SesionCalibracion()
+    mano.establecer_estado_juego('calibrando')  # Inferencia a tasa plena aunque no se juegue
+    try:
+        while not sesion.terminada:
+            reloj.tick(FPS)
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.event.post(event)  # Lo atiende la pantalla de inicio
+                    return None
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    return None
+            # Las muestras no dependen de PREVISUALIZACION_CAMARA: salen de cada inferencia
+            detectados = mano.landmarks_detectados
+            sesion.agregar(detectados)
+            cuadro = mano.ultimo_frame
+            # Sin cuadro ('ninguna') se dibujan las manos detectadas para guiar las poses
+            vista = mano.ultimos_landmarks if cuadro is not None else detectados
+            render.pantalla_calibracion(sesion.instruccion, sesion.grabando, sesion.progreso,
+                                        cuadro, vista)
+        return sesion.resultado()
+    finally:
+        mano.establecer_estado_juego('menu')
+
+def estado_carga_manos(mano, carga_manos):
+    """Retorna (mensaje, progreso) para la pantalla de inicio."""
+    if mano is None and carga_manos is not None:
+        progreso = None if carga_manos.terminado else carga_manos.progreso
+        return carga_manos.mensaje, progreso
+    return ("Control por gestos activado" if mano else "Modo solo teclado"), None
+
+def reportar_arranque():
+    """Imprime el tiempo desde el arranque del proceso hasta el primer frame (una vez)."""
+    global _T_ARRANQUE
+    if _T_ARRANQUE is not None:
+        print(f"[ARRANQUE] Primer frame en {(time.perf_counter() - _T_ARRANQUE) * 1000:.0f} ms")
+        _T_ARRANQUE = None
 
 # ============================================================
 #                    BUCLE PRINCIPAL DEL JUEGO
 # ============================================================
-def ejecutar_juego(mano=None):
-    pantalla = pygame.display.set_mode((ANCHO, ALTO))
-    pygame.display.set_caption("Tetris — Controles Teclado + Mano")
+def ejecutar_juego(mano=None, carga_manos=None, columnas=COLUMNAS, filas=FILAS, puntuaciones=None,
+                   telemetria=None):
+    """Una partida completa. carga_manos (opcional) entrega el controlador cuando termine de cargar.
+    
+    Con puntuaciones (TablaPuntuaciones) la partida se guarda y el menú final muestra el top.
+    Con telemetria (Telemetria) se emiten los eventos del motor y los tiempos de frame.
+    """
+    pantalla = pygame.display.get_surface() or crear_ventana()
     reloj = pygame.time.Clock()
     
-    motor = Motor(COLUMNAS, FILAS, GRAVEDAD_BASE_S)
-    render = RenderizadorTetris(pantalla)
+    semilla = random.getrandbits(63)
+    motor = Motor(columnas, filas, GRAVEDAD_BASE_S, semilla=semilla)
+    render = RenderizadorTetris(pantalla, columnas, filas)
     audio = GestorAudio()
     
     # 1. Solicitar Nombre del Jugador
     nombre_jugador = render.input_nombre()
+    perfil = None
+    if ARCHIVO_PERFILES_GESTOS:
+        perfil = cargar_perfil(ARCHIVO_PERFILES_GESTOS, nombre_jugador)
+    if mano is not None:
+        mano.aplicar_perfil(perfil)
     
-    # 2. Pantalla de carga / instrucciones
-    mensaje = ("Control por gestos activado" if mano else "Modo solo teclado")
-    render.pantalla_carga(mensaje, mano is not None)
+    # 2. Pantalla de carga / instrucciones (la cámara puede seguir cargando)
+    mano = mano_lista(mano, carga_manos, perfil)
+    carga_mostrada = estado_carga_manos(mano, carga_manos)
+    render.pantalla_carga(carga_mostrada[0], mano is not None, carga_mostrada[1])
     
     esperando = True
     while esperando:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        event = pygame.event.wait(ESPERA_MENU_MS)
+        mano = mano_lista(mano, carga_manos, perfil)
+        if mano is not None:
+            mano.establecer_estado_juego('menu')
+        carga_actual = estado_carga_manos(mano, carga_manos)
+        if carga_actual != carga_mostrada or event.type == pygame.VIDEOEXPOSE:
+            carga_mostrada = carga_actual
+            render.pantalla_carga(carga_mostrada[0], mano is not None, carga_mostrada[1])
+        
+        if event.type == pygame.QUIT:
+            return False
+        if event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+                esperando = False
+            elif event.key in (pygame.K_ESCAPE, pygame.K_q):
                 return False
-            if event.type == pygame.KEYDOWN:
-                if event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
-                    esperando = False
-                elif event.key in (pygame.K_ESCAPE, pygame.K_q):
-                    return False
+            elif event.key == pygame.K_k and mano is not None and ARCHIVO_PERFILES_GESTOS:
+                nuevo = calibrar_gestos(render, mano, reloj)
+                if nuevo is not None:
+                    perfil = nuevo
+                    mano.aplicar_perfil(perfil)
+                    guardar_perfil(ARCHIVO_PERFILES_GESTOS, nombre_jugador, perfil)
+                    mensaje = "Gestos calibrados para " + nombre_jugador
+                else:
+                    mensaje = "Calibración incompleta: se mantienen los umbrales"
+                render.pantalla_carga(mensaje, True)
     
     audio.iniciar_musica()
     
-    ultima_gravedad = time.time()
-    caida_suave_teclado = False
-    caida_suave_mano = False
-    ultima_caida_suave = time.time()
-    
-    mover_izq = mover_der = False
-    retraso_repeticion = 0.15
-    ultimo_mov = 0.0
+    registro = RegistroPartida(semilla, columnas, filas)
+    sim = SimulacionTetris(motor, audio, registro)
+    acumulador = AcumuladorTicks()
+    muestreo = None
+    if telemetria is not None:
+        motor.suscribir(telemetria.al_evento_motor)
+        muestreo = MuestreoFrames(telemetria)
+        telemetria.emitir('partida_inicio', jugador=nombre_jugador, semilla=semilla,
+                          columnas=columnas, filas=filas, manos=mano is not None)
     
-    nivel_anterior = 1
-    
-    ejecutando = True
-    while ejecutando and not motor.game_over:
-        ahora = time.time()
+    while not motor.game_over:
         reloj.tick(FPS)
+        if muestreo is not None:
+            muestreo.frame()
+        mano = mano_lista(mano, carga_manos, perfil)
         
         # EVENTOS TECLADO
+        pausar = False
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
             
+            elif event.type in (pygame.WINDOWFOCUSLOST, pygame.WINDOWMINIMIZED):
+                pausar = True
+            
             elif event.type == pygame.KEYDOWN:
                 if event.key in (pygame.K_LEFT, pygame.K_a):
-                    if motor.mover(-1, 0):
-                        audio.reproducir('move.wav')
-                    mover_izq = True
-                    ultimo_mov = ahora
-                
+                    sim.pulsar_horizontal(-1)
                 elif event.key in (pygame.K_RIGHT, pygame.K_d):
-                    if motor.mover(1, 0):
-                        audio.reproducir('move.wav')
-                    mover_der = True
-                    ultimo_mov = ahora
-                
+                    sim.pulsar_horizontal(1)
                 elif event.key in (pygame.K_UP, pygame.K_x):
-                    if motor.rotar(1):
-                        audio.reproducir('rotate.wav')
-                
+                    sim.encolar('rotar', 1)
                 elif event.key == pygame.K_z:
-                    if motor.rotar(-1):
-                        audio.reproducir('rotate.wav')
-                
+                    sim.encolar('rotar', -1)
                 elif event.key == pygame.K_DOWN:
-                    caida_suave_teclado = True
-                
+                    sim.caida_suave_teclado = True
                 elif event.key == pygame.K_SPACE:
-                    filas = motor.caida_dura()
-                    audio.reproducir('piece_landed.wav')
-                    
-                    estado = motor.obtener_estado()
-                    if estado['lineas'] >= 4:
-                        audio.reproducir('4_lines.wav')
-                    elif estado['lineas'] > 0:
-                        audio.reproducir('line.wav')
-                    
-                    if estado['nivel'] > nivel_anterior:
-                        audio.reproducir('level_up.wav')
-                        nivel_anterior = estado['nivel']
-                    
-                    ultima_gravedad = ahora
+                    sim.encolar('caida_dura')
+                elif event.key in (pygame.K_c, pygame.K_LSHIFT, pygame.K_RSHIFT):
+                    sim.encolar('hold')
+                elif event.key in (pygame.K_p, pygame.K_ESCAPE):
+                    pausar = True
             
             elif event.type == pygame.KEYUP:
                 if event.key in (pygame.K_LEFT, pygame.K_a):
-                    mover_izq = False
+                    sim.soltar_horizontal(-1)
                 elif event.key in (pygame.K_RIGHT, pygame.K_d):
-                    mover_der = False
+                    sim.soltar_horizontal(1)
                 elif event.key == pygame.K_DOWN:
-                    caida_suave_teclado = False
+                    sim.caida_suave_teclado = False
+        
+        # PAUSA (tecla o ventana sin foco): ni gravedad, ni música, ni inferencia
+        if pausar:
+            audio.pausar_musica()
+            if mano is not None:
+                mano.establecer_estado_juego('pausa')
+            if telemetria is not None:
+                telemetria.emitir('pausa')
+            if not esperar_fin_pausa(render):
+                return False
+            audio.reanudar_musica()
+            sim.soltar_todo()
+            acumulador.reiniciar()  # El tiempo en pausa no se recupera como ráfaga de ticks
+            if muestreo is not None:
+                muestreo.reiniciar()
+            if telemetria is not None:
+                telemetria.emitir('reanudar')
+            continue
         
         # INPUT MANOS
         frame_camara = None
+        landmarks_camara = None
         if mano is not None:
+            mano.establecer_estado_juego('jugando')  # No envía nada si no cambió
             dir_mov, caida_suave_m, rotar_borde, caida_dura_borde = mano.consultar()
             
             try:
                 frame_camara = mano.ultimo_frame
+                landmarks_camara = mano.ultimos_landmarks
             except:
                 frame_camara = None
             
-            if dir_mov == -1:
-                if motor.mover(-1, 0):
-                    audio.reproducir('move.wav')
-            elif dir_mov == 1:
-                if motor.mover(1, 0):
-                    audio.reproducir('move.wav')
-            
+            if dir_mov != 0:
+                sim.encolar('mover', dir_mov)
             if rotar_borde:
-                if motor.rotar(1):
-                    audio.reproducir('rotate.wav')
-            
+                sim.encolar('rotar', 1)
             if caida_dura_borde:
-                filas = motor.caida_dura()
-                audio.reproducir('piece_landed.wav')
-                
-                estado = motor.obtener_estado()
-                lineas_nuevas = estado['lineas']
-                
-                if lineas_nuevas == 4:
-                    audio.reproducir('4_lines.wav')
-                elif lineas_nuevas > 0:
-                    audio.reproducir('line.wav')
-                
-                if estado['nivel'] > nivel_anterior:
-                    audio.reproducir('level_up.wav')
-                    nivel_anterior = estado['nivel']
-                
-                ultima_gravedad = ahora
-            
-            caida_suave_mano = bool(caida_suave_m)
-        
-        # REPETICIÓN TECLAS
-        if mover_izq or mover_der:
-            if ahora - ultimo_mov >= retraso_repeticion:
-                if mover_izq and motor.mover(-1, 0):
-                    audio.reproducir('move.wav')
-                    ultimo_mov = ahora
-                if mover_der and motor.mover(1, 0):
-                    audio.reproducir('move.wav')
-                    ultimo_mov = ahora
-        
-        # CAÍDA SUAVE
-        caida_suave_activa = caida_suave_teclado or caida_suave_mano
-        if caida_suave_activa and (ahora - ultima_caida_suave) >= INTERVALO_CAIDA_SUAVE_S:
-            motor.caida_suave()
-            ultima_caida_suave = ahora
-        
-        # GRAVEDAD
-        gravedad_s = motor.gravedad_actual()
-        if caida_suave_activa:
-            gravedad_s *= 0.15
-        
-        if ahora - ultima_gravedad >= gravedad_s:
-            if not motor.caida_suave():
-                estado_anterior = motor.obtener_estado()
-                motor._fijar_pieza()
-                audio.reproducir('piece_landed.wav')
-                
-                estado = motor.obtener_estado()
-                lineas_nuevas = estado['lineas'] - estado_anterior['lineas']
-                
-                if lineas_nuevas == 4:
-                    audio.reproducir('4_lines.wav')
-                elif lineas_nuevas > 0:
-                    audio.reproducir('line.wav')
-                
-                if estado['nivel'] > nivel_anterior:
-                    audio.reproducir('level_up.wav')
-                    nivel_anterior = estado['nivel']
-            
-            ultima_gravedad = ahora
+                sim.encolar('caida_dura')
+            sim.caida_suave_mano = bool(caida_suave_m)
+        
+        # LÓGICA (paso fijo)
+        for _ in range(acumulador.ticks_pendientes()):
+            sim.paso()
+            if motor.game_over:
+                break
         
         # DIBUJAR
         estado = motor.obtener_estado()
-        render.dibujar_tablero(estado['tablero'])
+        render.dibujar_tablero(estado['tablero'], filas_ocupadas=estado['filas_ocupadas'])
+        render.dibujar_fantasma(estado['pieza_actual'], estado['fila_fantasma'])
         render.dibujar_pieza(estado['pieza_actual'])
         render.dibujar_hud(estado, mano is not None)
+        render.dibujar_paneles(estado['vista_previa'], estado['pieza_guardada'], estado['hold_usado'])
         
-        if mano is not None and frame_camara is not None:
-            render.dibujar_camara(frame_camara)
+        if mano is not None:
+            render.dibujar_camara(frame_camara, landmarks_camara)
         
         pygame.display.flip()
     
     # GAME OVER
+    if mano is not None:
+        mano.establecer_estado_juego('menu')
     audio.detener_musica()
     audio.reproducir('game_over.wav')
     
+    registro.finalizar(motor)
+    if GUARDAR_REPETICIONES:
+        # En segundo plano, mientras corre el barrido
+        threading.Thread(target=guardar_repeticion, args=(registro, nombre_jugador)).start()
+    
     estado_final = motor.obtener_estado()
-    render.barrido_game_over(estado_final['tablero'])
+    if telemetria is not None:
+        telemetria.emitir('partida_fin', jugador=nombre_jugador, puntaje=estado_final['puntaje'],
+                          lineas=estado_final['lineas'], nivel=estado_final['nivel'])
+    guardada = None
+    if puntuaciones is not None:
+        # Lo escribe el hilo de la tabla mientras corre el barrido
+        guardada = puntuaciones.registrar(nombre_jugador, estado_final['puntaje'],
+                                          estado_final['lineas'], estado_final['nivel'])
+    render.dibujar_tablero(estado_final['tablero'], filas_ocupadas=estado_final['filas_ocupadas'])
+    pygame.display.flip()
+    
+    barrido = AnimacionBarrido(filas)
+    while not barrido.terminado:
+        reloj.tick(FPS)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+            if event.type == pygame.KEYDOWN:
+                barrido.saltar()
+        
+        zona = render.dibujar_barrido(barrido.avanzar())
+        if zona is not None:
+            pygame.display.update(zona)
+    
+    ranking = mejor_personal = None
+    if puntuaciones is not None:
+        guardada.wait(ESPERA_PUNTUACION_S)
+        ranking = puntuaciones.mejores(TOP_GAME_OVER)
+        mejor_personal = puntuaciones.mejor_de(nombre_jugador)
     
     return render.menu_game_over(
         estado_final['puntaje'],
         estado_final['lineas'],
         estado_final['nivel'],
-        nombre_jugador  # Pasamos el nombre aquí
+        nombre_jugador,  # Pasamos el nombre aquí
+        ranking,
+        mejor_personal,
     )
 
 # ============================================================
 #                          MAIN
 # ============================================================
+def dimensiones_tablero(argumentos):
+    """Lee --tablero COLUMNASxFILAS (p. ej. --tablero 40x80); por defecto 10x20."""
+    if "--tablero" in argumentos:
+        i = argumentos.index("--tablero")
+        try:
+            columnas, filas = (int(v) for v in argumentos[i + 1].lower().split("x"))
+            if columnas >= 4 and filas >= 4:
+                return columnas, filas
+        except (IndexError, ValueError):
+            pass
+        print("[AVISO] --tablero espera COLUMNASxFILAS (mínimo 4x4); se usa 10x20")
+    return COLUMNAS, FILAS
+
 def main():
+    columnas, filas = dimensiones_tablero(sys.argv[1:])
     pygame.mixer.pre_init(44100, -16, 2, 512)
     pygame.init()
     
-    mano = crear_controlador_manos_o_nada(mostrar_camara=False, espejo=False)
+    # La ventana aparece primero; audio, MediaPipe y cámara cargan en segundo plano
+    render = RenderizadorTetris(crear_ventana())
+    render.pantalla_carga("Iniciando...", False)
+    reportar_arranque()
+    
+    obtener_banco_sonidos(en_segundo_plano=True)
+    telemetria = None
+    if DIRECTORIO_TELEMETRIA:
+        telemetria = Telemetria(DIRECTORIO_TELEMETRIA).iniciar()
+    carga_manos = CargaManosAsincrona(mostrar_camara=False, espejo=False,
+                                      en_proceso=MANOS_EN_PROCESO,
+                                      previsualizacion=PREVISUALIZACION_CAMARA,
+                                      telemetria=telemetria).iniciar()
+    puntuaciones = None
+    if ARCHIVO_PUNTUACIONES:
+        puntuaciones = TablaPuntuaciones(ARCHIVO_PUNTUACIONES).iniciar()
     
     while True:
-        reiniciar = ejecutar_juego(mano)
+        reiniciar = ejecutar_juego(carga_manos=carga_manos, columnas=columnas, filas=filas,
+                                   puntuaciones=puntuaciones, telemetria=telemetria)
         if not reiniciar:
             break
     
+    if puntuaciones is not None:
+        puntuaciones.cerrar()
+    
+    mano = carga_manos.controlador
     if mano is not None:
         try:
             mano.detener()
         except:
             pass
+    if telemetria is not None:
+        telemetria.cerrar()
     
     pygame.quit()
     sys.exit()
@@ -16,35 +16,270 @@ from __future__ import annotations
 import threading
 import math
 import time
-from typing import Tuple, Optional, List
+from typing import Callable, Tuple, Optional, List
 
 # Silenciar logs
 import os, warnings
 os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
 os.environ.setdefault("GLOG_minloglevel", "3")
 warnings.filterwarnings("ignore", category=UserWarning, module=r"google\.protobuf")
-try:
-    from absl import logging as absl_logging
-    absl_logging.set_verbosity(absl_logging.ERROR)
-except Exception:
-    pass
 
-try:
-    import cv2
-    import mediapipe as mp
-    MEDIAPIPE_DISPONIBLE = True
-except Exception:
-    MEDIAPIPE_DISPONIBLE = False
+# cv2 y mediapipe tardan segundos en importarse: se cargan la primera vez
+# que se necesitan (ver cargar_dependencias), no al importar este módulo.
+cv2 = None
+mp = None
+MEDIAPIPE_DISPONIBLE: Optional[bool] = None  # None = aún no se intentó
 
 
-class ControladorMano:
-    """Controlador de gestos de mano para Tetris."""
+def cargar_dependencias() -> bool:
+    """Importa cv2 y mediapipe si hace falta. Retorna True si están disponibles."""
+    global cv2, mp, MEDIAPIPE_DISPONIBLE
+    if MEDIAPIPE_DISPONIBLE is None:
+        try:
+            from absl import logging as absl_logging
+            absl_logging.set_verbosity(absl_logging.ERROR)
+        except Exception:
+            pass
+        try:
+            import cv2 as _cv2
+            import mediapipe as _mp
+            cv2, mp = _cv2, _mp
+            MEDIAPIPE_DISPONIBLE = True
+        except Exception:
+            MEDIAPIPE_DISPONIBLE = False
+    return MEDIAPIPE_DISPONIBLE
+
+
+def crear_detector_manos():
+    """Instancia de MediaPipe Hands con la configuración del juego."""
+    return mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=2,
+        min_detection_confidence=0.7, # Subido a 0.7
+        min_tracking_confidence=0.7,  # Subido a 0.7 para evitar flickering
+    )
+
+
+# Modos de captura en orden de preferencia: (formato, escala sobre el tamaño
+# pedido, FPS). MJPG primero: muchas webcams UVC en YUYV 640x480 no pasan de
+# 15-30 FPS y decodificar YUYV cuesta CPU. Después, menos resolución a más
+# FPS: los landmarks son normalizados y el detector no necesita el cuadro grande.
+MODOS_CAPTURA = (
+    ('MJPG', 1.0, 60),
+    ('MJPG', 1.0, 30),
+    ('MJPG', 0.5, 60),
+    ('YUYV', 0.5, 60),
+    ('YUYV', 1.0, 30),
+)
+MEDICION_FPS_S = 3.0  # Segundos de captura para medir los FPS logrados
+
+# Estados que el juego informa con establecer_estado_juego()
+ESTADOS_JUEGO = ('menu', 'jugando', 'pausa', 'calibrando')
+INTERVALO_PRESENCIA_S = 0.25  # Sin manos o fuera de juego: una inferencia cada tanto
+ESPERA_SIN_MANOS_S = 1.0      # En juego, tanto sin ver manos baja la tasa
+PASO_ESPERA_S = 0.05          # Las esperas se cortan en pasos para notar cambios de estado
+
+
+def _texto_fourcc(valor) -> str:
+    valor = int(valor)
+    return "".join(chr((valor >> 8 * i) & 0xFF) for i in range(4))
+
+
+def _modo_actual(cap) -> dict:
+    return {
+        'fourcc': _texto_fourcc(cap.get(cv2.CAP_PROP_FOURCC)),
+        'ancho': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        'alto': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        'fps': float(cap.get(cv2.CAP_PROP_FPS)),
+    }
+
+
+def abrir_camara(indice_cam: int, ancho: int, alto: int, modos=MODOS_CAPTURA):
+    """Abre la cámara y negocia el modo de captura. Retorna (cap, modo).
+
+    Se queda con el primer modo que la cámara confirma: formato y tamaño
+    leídos de vuelta y un cuadro real de ese tamaño. Si ninguno se confirma
+    vuelve al formato original y al tamaño pedido. modo describe lo que la cámara reporta, con
+    'confirmado' indicando si fue uno de los modos preferidos.
+    """
+    cap = cv2.VideoCapture(indice_cam)
+    # Un solo cuadro en cola: siempre se procesa el más reciente, no uno viejo
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    if not cap.isOpened():
+        return cap, None
+    fourcc_original = cap.get(cv2.CAP_PROP_FOURCC)
+    for fourcc, escala, fps in modos:
+        w, h = int(ancho * escala), int(alto * escala)
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, w)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, h)
+        cap.set(cv2.CAP_PROP_FPS, fps)
+        modo = _modo_actual(cap)
+        if (modo['fourcc'], modo['ancho'], modo['alto']) != (fourcc, w, h):
+            continue
+        ok, cuadro = cap.read()
+        if ok and cuadro is not None and tuple(cuadro.shape[:2]) == (h, w):
+            modo['confirmado'] = True
+            print(f"[CAMARA] {indice_cam}: {fourcc} {w}x{h} a {modo['fps']:.0f} FPS nominales")
+            return cap, modo
+    # Sin el formato del último intento: algunos backends seguirían en MJPG o sin cuadros
+    cap.set(cv2.CAP_PROP_FOURCC, fourcc_original)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, ancho)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, alto)
+    modo = _modo_actual(cap)
+    modo['confirmado'] = False
+    print(f"[AVISO] Cámara {indice_cam}: ningún modo preferido confirmado; "
+          f"se usa {modo['fourcc']!r} {modo['ancho']}x{modo['alto']}")
+    return cap, modo
+
+
+class MedidorFps:
+    """Cuenta los cuadros de los primeros segundos de captura para informar los FPS logrados."""
+
+    def __init__(self, etiqueta: str, duracion_s: float = MEDICION_FPS_S) -> None:
+        self.etiqueta = etiqueta
+        self.duracion_s = duracion_s
+        self.fps: Optional[float] = None
+        self._inicio: Optional[float] = None
+        self._cuadros = 0
+
+    def cuadro(self, ahora: float) -> Optional[float]:
+        """Registra un cuadro. Retorna los FPS solo en el cuadro en que termina la medición."""
+        if self.fps is not None:
+            return None
+        if self._inicio is None:
+            self._inicio = ahora
+            return None
+        self._cuadros += 1
+        if ahora - self._inicio < self.duracion_s:
+            return None
+        self.fps = self._cuadros / (ahora - self._inicio)
+        print(f"[CAMARA] {self.etiqueta}: {self.fps:.1f} FPS logrados")
+        return self.fps
+
+    def reiniciar(self) -> None:
+        """Descarta la medición en curso (la captura dejó de ser continua)."""
+        self._inicio = None
+        self._cuadros = 0
+
+
+class PlanificadorInferencia:
+    """Decide cuándo inferir según el estado del juego y si hay manos a la vista.
+
+    A tasa plena mientras se juega con manos a la vista (y al calibrar); si no,
+    una inferencia cada intervalo_presencia_s, suficiente para notar que
+    apareció una mano. En pausa no se infiere ni se leen cuadros.
+    """
+
+    def __init__(self, estado: str = 'jugando', intervalo_presencia_s: float = INTERVALO_PRESENCIA_S,
+                 espera_sin_manos_s: float = ESPERA_SIN_MANOS_S) -> None:
+        self.establecer_estado(estado)
+        self.intervalo_presencia_s = intervalo_presencia_s
+        self.espera_sin_manos_s = espera_sin_manos_s
+        self._ultima_mano: Optional[float] = None
+        self._ultima_inferencia: Optional[float] = None
+
+    def establecer_estado(self, estado: str) -> None:
+        if estado not in ESTADOS_JUEGO:
+            raise ValueError(f"Estado de juego desconocido: {estado}")
+        self.estado_juego = estado
+
+    def a_pleno(self, ahora: float) -> bool:
+        if self.estado_juego == 'calibrando':
+            return True
+        return (self.estado_juego == 'jugando' and self._ultima_mano is not None
+                and ahora - self._ultima_mano < self.espera_sin_manos_s)
+
+    def espera(self, ahora: float) -> float:
+        """Segundos hasta la próxima inferencia (0 = ya)."""
+        if self.estado_juego == 'pausa':
+            return PASO_ESPERA_S  # Se vuelve a consultar, sin fin, hasta que cambie el estado
+        if self._ultima_inferencia is None or self.a_pleno(ahora):
+            return 0.0
+        return max(0.0, self._ultima_inferencia + self.intervalo_presencia_s - ahora)
+
+    def registrar(self, ahora: float, hay_manos: bool) -> None:
+        self._ultima_inferencia = ahora
+        if hay_manos:
+            self._ultima_mano = ahora
+
+
+# Qué publica el controlador para la previsualización en el juego:
+#   'ninguna'   → nada (ni copia ni dibujo del cuadro)
+#   'cruda'     → el cuadro tal cual
+#   'anotada'   → el cuadro con los landmarks dibujados por OpenCV
+#   'landmarks' → el cuadro tal cual + los landmarks como arreglo; el juego
+#                 dibuja las conexiones como líneas vectoriales
+MODOS_PREVISUALIZACION = ('ninguna', 'cruda', 'anotada', 'landmarks')
+
+# Cada cuánto se reportan los FPS de la cámara a la telemetría
+INTERVALO_FPS_TELEMETRIA_S = 1.0
+
+# Parámetros de InterpreteGestos que puede fijar un perfil de calibración
+PARAMETROS_PERFIL = (
+    'dist_min_dedo', 'umbral_dir_pulgar',
+    'rotar_debounce_s', 'caida_dura_debounce_s', 'movimiento_debounce_s',
+)
+
+# Conexiones entre los 21 landmarks de una mano (igual que HAND_CONNECTIONS)
+CONEXIONES_MANO = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)
+
+
+def extraer_landmarks(resultados) -> Tuple[Tuple[Tuple[float, float], ...], ...]:
+    """Landmarks normalizados (x, y) de cada mano detectada."""
+    if not resultados.multi_hand_landmarks:
+        return ()
+    return tuple(
+        tuple((p.x, p.y) for p in mano_lms.landmark)
+        for mano_lms in resultados.multi_hand_landmarks
+    )
+
+
+def preparar_previsualizacion(modo: str, cuadro_bgr, resultados):
+    """Retorna (cuadro, landmarks) a publicar según el modo de previsualización.
+
+    En modo 'anotada' dibuja sobre cuadro_bgr: el llamador debe ser su dueño.
+    """
+    if modo == 'ninguna':
+        return None, None
+    if modo == 'cruda':
+        return cuadro_bgr, None
+    if modo == 'anotada':
+        dibujar_landmarks(cuadro_bgr, resultados)
+        return cuadro_bgr, None
+    return cuadro_bgr, extraer_landmarks(resultados)
+
+
+def dibujar_landmarks(cuadro_bgr, resultados) -> None:
+    """Dibuja sobre el cuadro los landmarks de todas las manos detectadas."""
+    if not resultados.multi_hand_landmarks:
+        return
+    estilo = mp.solutions.drawing_styles
+    for mano_lms in resultados.multi_hand_landmarks:
+        mp.solutions.drawing_utils.draw_landmarks(
+            cuadro_bgr,
+            mano_lms,
+            mp.solutions.hands.HAND_CONNECTIONS,
+            estilo.get_default_hand_landmarks_style(),
+            estilo.get_default_hand_connections_style(),
+        )
+
+
+class InterpreteGestos:
+    """Convierte landmarks de MediaPipe en intenciones de juego, con anti-rebote.
+
+    No toca cámara ni modelo: recibe resultados de inferencia ya calculados,
+    así puede alimentarse desde ControladorMano o desde un GestorCamaras.
+    """
 
     def __init__(
         self,
-        indice_cam: int = 0,
-        ancho: int = 640,
-        alto: int = 480,
         dist_min_dedo: float = 0.18,
         umbral_dir_pulgar: float = 0.10,
         pose_activar_ms: int = 220,
@@ -52,16 +287,7 @@ class ControladorMano:
         rotar_debounce_s: float = 0.20,
         caida_dura_debounce_s: float = 0.5,
         movimiento_debounce_s: float = 0.25,
-        mostrar_camara: bool = False,
-        espejar_previsualizacion: bool = False,
-        escala_previsualizacion: float = 1.5,
-        depurar: bool = False,
     ) -> None:
-        if not MEDIAPIPE_DISPONIBLE:
-            raise RuntimeError("MediaPipe / OpenCV no disponibles")
-
-        self.ancho = ancho
-        self.alto = alto
         self.dist_min_dedo = dist_min_dedo
         self.umbral_dir_pulgar = umbral_dir_pulgar
         self.pose_activar_ms = pose_activar_ms
@@ -69,36 +295,16 @@ class ControladorMano:
         self.rotar_debounce_s = rotar_debounce_s
         self.caida_dura_debounce_s = caida_dura_debounce_s
         self.movimiento_debounce_s = movimiento_debounce_s
-        self.mostrar_camara = mostrar_camara
-        self.espejar_previsualizacion = espejar_previsualizacion
-        self.escala_previsualizacion = escala_previsualizacion
-        self.depurar = depurar
-
-        # Cámara
-        self.cap = cv2.VideoCapture(indice_cam)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, ancho)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, alto)
-
-        # MediaPipe - MODIFICADO: Tracking más estricto (0.7)
-        self.mp_manos = mp.solutions.hands
-        self.mp_dibujar = mp.solutions.drawing_utils
-        self.mp_estilo = mp.solutions.drawing_styles
-        self.manos = self.mp_manos.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            min_detection_confidence=0.7, # Subido a 0.7
-            min_tracking_confidence=0.7,  # Subido a 0.7 para evitar flickering
-        )
+        self._parametros_base = {nombre: getattr(self, nombre) for nombre in PARAMETROS_PERFIL}
 
         # Estado público
         self.dir_mov: int = 0
         self.caida_suave: bool = False
         self.borde_rotar_hor: bool = False
         self.borde_caida_dura: bool = False
-        
-        # NUEVO: Frame actual para renderizado externo
-        self.ultimo_frame = None
-        self._lock_frame = threading.Lock()
+        self.al_gesto: Optional[Callable[[str], None]] = None  # Callback(nombre) al disparar un gesto
+        # Manos (x, y) de la última inferencia, sea cual sea el modo de previsualización (calibración)
+        self.landmarks_detectados: Optional[Tuple[Tuple[Tuple[float, float], ...], ...]] = None
 
         # Estado interno para debouncing
         self._izq_armado: bool = True
@@ -123,36 +329,25 @@ class ControladorMano:
         self._rotar_destellar_hasta: float = 0.0
         self._caida_dura_destellar_hasta: float = 0.0
 
-        # Hilo
-        self._ejecutando = False
-        self._hilo = threading.Thread(target=self._bucle, daemon=True)
+    def aplicar_perfil(self, perfil: Optional[dict]) -> None:
+        """Umbrales y tiempos de un perfil de calibración; con None vuelven los del constructor."""
+        for nombre, base in self._parametros_base.items():
+            setattr(self, nombre, float((perfil or {}).get(nombre, base)))
 
-    def iniciar(self) -> None:
-        """Iniciar el bucle de cámara en segundo plano."""
-        self._ejecutando = True
-        self._hilo.start()
+    def soltar_intenciones(self) -> None:
+        """Descarta el movimiento y los bordes pendientes al cambiar el estado del juego.
+
+        Los gestos hechos en un menú o en pausa no deben disparar en la próxima partida.
+        """
+        self.dir_mov = 0
+        self.caida_suave = False
+        self.borde_rotar_hor = False
+        self.borde_caida_dura = False
+
+    def _disparar(self, nombre: str) -> None:
+        if self.al_gesto is not None:
+            self.al_gesto(nombre)
 
-    def detener(self) -> None:
-        """Detener el bucle y limpiar recursos."""
-        self._ejecutando = False
-        try:
-            self._hilo.join(timeout=1.0)
-        except Exception:
-            pass
-        try:
-            self.manos.close()
-        except Exception:
-            pass
-        try:
-            if self.cap is not None:
-                self.cap.release()
-        except Exception:
-            pass
-        try:
-            if self.mostrar_camara:
-                cv2.destroyAllWindows()
-        except Exception:
-            pass
     def consultar(self) -> Tuple[int, bool, bool, bool]:
         """Retorna (dir_mov, caida_suave, borde_rotar, borde_caida_dura)."""
        
@@ -206,6 +401,238 @@ class ControladorMano:
         dist = math.hypot(punta.x - muneca.x, punta.y - muneca.y)
         return dist >= self.dist_min_dedo
 
+    def procesar_resultados(self, resultados, ahora: float):
+        """Actualiza las intenciones a partir de un resultado de Hands.process().
+
+        Retorna (mano_izq_usuario, mano_der_usuario) con los datos de cada mano o None.
+        """
+        self.landmarks_detectados = extraer_landmarks(resultados)
+
+        # Reiniciar intenciones
+        self.dir_mov = 0
+        self.caida_suave = False
+
+        mano_izq_usuario = None
+        mano_der_usuario = None
+
+        if resultados.multi_hand_landmarks:
+            for idx, mano_lms in enumerate(resultados.multi_hand_landmarks):
+                etiqueta_camara = None
+                if hasattr(resultados, 'multi_handedness') and resultados.multi_handedness:
+                    if idx < len(resultados.multi_handedness):
+                        md = resultados.multi_handedness[idx]
+                        if hasattr(md, 'classification') and len(md.classification):
+                            etiqueta_camara = md.classification[0].label
+
+                lm = mano_lms.landmark
+                ind, med, anl, men = self._contar_dedos_extendidos(lm)
+                pulgar_arriba, pulgar_abajo = self._pulgar_arriba_abajo(lm)
+                pulgar_ext = self._pulgar_extendido(lm)
+
+                datos_mano = {
+                    'lm': lm,
+                    'landmarks': mano_lms,
+                    'pulgar_arriba': pulgar_arriba,
+                    'pulgar_abajo': pulgar_abajo,
+                    'pulgar_extendido': pulgar_ext,
+                    'ind': ind,
+                    'med': med,
+                    'anl': anl,
+                    'men': men,
+                    'solo_menique': men and not ind and not med and not anl,
+                }
+
+                if etiqueta_camara == 'Left':
+                    mano_der_usuario = datos_mano
+                elif etiqueta_camara == 'Right':
+                    mano_izq_usuario = datos_mano
+
+        # ===== PROCESAR GESTOS =====
+        dedo_libre_detectado = False
+        
+        if mano_izq_usuario:
+            dedos_sin_menique = [mano_izq_usuario['ind'], mano_izq_usuario['med'], 
+                                 mano_izq_usuario['anl']]
+            if sum(dedos_sin_menique) == 1 and not mano_izq_usuario['men']:
+                if not mano_izq_usuario['pulgar_arriba'] and not mano_izq_usuario['pulgar_abajo']:
+                    dedo_libre_detectado = True
+        
+        if mano_der_usuario:
+            dedos_sin_menique = [mano_der_usuario['ind'], mano_der_usuario['med'], 
+                                 mano_der_usuario['anl']]
+            if sum(dedos_sin_menique) == 1 and not mano_der_usuario['men']:
+                if not mano_der_usuario['pulgar_arriba'] and not mano_der_usuario['pulgar_abajo']:
+                    dedo_libre_detectado = True
+
+        # Gesto: Caída Dura (Dedo libre)
+        if dedo_libre_detectado:
+            if self._caida_dura_armado and (ahora - self._ultimo_tiempo_caida_dura) >= self.caida_dura_debounce_s:
+                self.borde_caida_dura = True
+                self._ultimo_tiempo_caida_dura = ahora
+                self._caida_dura_destellar_hasta = ahora + 0.40
+                self._contador_caida_dura += 1
+                self._caida_dura_armado = False
+                self._disparar('caida_dura')
+        else:
+            self._caida_dura_armado = True
+
+        # Gesto: Rotar (Solo Meñique)
+        solo_menique_izq = (mano_izq_usuario and mano_izq_usuario['solo_menique'] 
+                            and not dedo_libre_detectado)
+        solo_menique_der = (mano_der_usuario and mano_der_usuario['solo_menique']
+                            and not dedo_libre_detectado)
+        solo_menique_detectado = solo_menique_izq or solo_menique_der
+
+        if solo_menique_detectado and not dedo_libre_detectado:
+            if self._rotar_armado and (ahora - self._ultimo_tiempo_rotar) >= self.rotar_debounce_s:
+                self.borde_rotar_hor = True
+                self._ultimo_tiempo_rotar = ahora
+                self._rotar_destellar_hasta = ahora + 0.30
+                self._contador_rotar += 1
+                self._rotar_armado = False
+                self._disparar('rotar')
+        else:
+            self._rotar_armado = True
+
+
+        
+        # --- IZQUIERDA ---
+        es_gesto_izq = (mano_izq_usuario and mano_izq_usuario['pulgar_arriba'] 
+                        and not solo_menique_izq 
+                        and not dedo_libre_detectado)
+        
+        if es_gesto_izq:
+            self._ultimo_tiempo_izq_visto = ahora  
+            
+            if self._izq_armado and (ahora - self._ultimo_tiempo_izq) >= self.movimiento_debounce_s:
+                self.dir_mov = -1
+                self._pasos_izq += 1
+                self._ultimo_tiempo_izq = ahora
+                self._izq_armado = False 
+                self._disparar('izquierda')
+
+        elif (ahora - self._ultimo_tiempo_izq_visto) > 0.30: 
+            self._izq_armado = True
+
+        
+        es_gesto_der = (mano_der_usuario and mano_der_usuario['pulgar_arriba'] 
+                        and not solo_menique_der 
+                        and not dedo_libre_detectado)
+        
+        if es_gesto_der:
+            self._ultimo_tiempo_der_visto = ahora
+            
+            if self._der_armado and (ahora - self._ultimo_tiempo_der) >= self.movimiento_debounce_s:
+                self.dir_mov = 1
+                self._pasos_der += 1
+                self._ultimo_tiempo_der = ahora
+                self._der_armado = False
+                self._disparar('derecha')
+        
+        
+        elif (ahora - self._ultimo_tiempo_der_visto) > 0.30:
+            self._der_armado = True
+
+        # ==========================================================
+
+        pulgar_abajo_detectado = False
+        if not dedo_libre_detectado:
+            if mano_izq_usuario and mano_izq_usuario['pulgar_abajo']:
+                pulgar_abajo_detectado = True
+            if mano_der_usuario and mano_der_usuario['pulgar_abajo']:
+                pulgar_abajo_detectado = True
+        self.caida_suave = pulgar_abajo_detectado
+
+        return mano_izq_usuario, mano_der_usuario
+
+
+class ControladorMano(InterpreteGestos):
+    """Controlador de gestos de mano para Tetris: una cámara, un modelo y un hilo."""
+
+    def __init__(
+        self,
+        indice_cam: int = 0,
+        ancho: int = 640,
+        alto: int = 480,
+        mostrar_camara: bool = False,
+        espejar_previsualizacion: bool = False,
+        escala_previsualizacion: float = 1.5,
+        depurar: bool = False,
+        previsualizacion: str = 'anotada',
+        telemetria=None,
+        **kwargs_gestos,
+    ) -> None:
+        if not cargar_dependencias():
+            raise RuntimeError("MediaPipe / OpenCV no disponibles")
+        if previsualizacion not in MODOS_PREVISUALIZACION:
+            raise ValueError(f"Modo de previsualización desconocido: {previsualizacion}")
+        super().__init__(**kwargs_gestos)
+
+        self.ancho = ancho
+        self.alto = alto
+        self.previsualizacion = previsualizacion
+        self.mostrar_camara = mostrar_camara
+        self.espejar_previsualizacion = espejar_previsualizacion
+        self.escala_previsualizacion = escala_previsualizacion
+        self.depurar = depurar
+        self.telemetria = telemetria  # Telemetria opcional: gestos y FPS de cámara
+        if telemetria is not None:
+            self.al_gesto = lambda nombre: telemetria.emitir('gesto', gesto=nombre)
+
+        # Cámara
+        self.cap, self.modo_camara = abrir_camara(indice_cam, ancho, alto)
+        self._medidor_fps = MedidorFps(f"Cámara {indice_cam}")
+        self.planificador = PlanificadorInferencia()
+
+        # MediaPipe - MODIFICADO: Tracking más estricto (0.7)
+        self.mp_manos = mp.solutions.hands
+        self.mp_dibujar = mp.solutions.drawing_utils
+        self.mp_estilo = mp.solutions.drawing_styles
+        self.manos = crear_detector_manos()
+
+        # NUEVO: Frame actual para renderizado externo
+        self.ultimo_frame = None
+        self.ultimos_landmarks = None
+        self._lock_frame = threading.Lock()
+
+        # Hilo
+        self._ejecutando = False
+        self._hilo = threading.Thread(target=self._bucle, daemon=True)
+
+    def iniciar(self) -> None:
+        """Iniciar el bucle de cámara en segundo plano."""
+        self._ejecutando = True
+        self._hilo.start()
+
+    def establecer_estado_juego(self, estado: str) -> None:
+        """'menu', 'jugando', 'pausa' o 'calibrando': fija la tasa de inferencia (ver PlanificadorInferencia)."""
+        anterior = self.planificador.estado_juego
+        self.planificador.establecer_estado(estado)
+        if estado != anterior:
+            self.soltar_intenciones()
+
+    def detener(self) -> None:
+        """Detener el bucle y limpiar recursos."""
+        self._ejecutando = False
+        try:
+            self._hilo.join(timeout=1.0)
+        except Exception:
+            pass
+        try:
+            self.manos.close()
+        except Exception:
+            pass
+        try:
+            if self.cap is not None:
+                self.cap.release()
+        except Exception:
+            pass
+        try:
+            if self.mostrar_camara:
+                cv2.destroyAllWindows()
+        except Exception:
+            pass
+
     def _bucle(self) -> None:
         """Bucle principal de detección."""
         if self.mostrar_camara:
@@ -221,8 +648,14 @@ class ControladorMano:
 
         tiempo_previo = time.time()
         fps = 0.0
+        proximo_reporte_fps = tiempo_previo + INTERVALO_FPS_TELEMETRIA_S
 
         while self._ejecutando:
+            espera = self.planificador.espera(time.monotonic())
+            if espera > 0:
+                self._medidor_fps.reiniciar()
+                time.sleep(min(espera, PASO_ESPERA_S))
+                continue
             ok, cuadro_bgr = self.cap.read()
             if not ok:
                 time.sleep(0.01)
@@ -233,159 +666,37 @@ class ControladorMano:
             tiempo_previo = ahora_cuadro
             if dt > 0:
                 fps = 0.9 * fps + 0.1 * (1.0 / dt)
+            fps_logrados = self._medidor_fps.cuadro(ahora_cuadro)
+            if fps_logrados is not None and self.modo_camara is not None:
+                self.modo_camara['fps_logrados'] = round(fps_logrados, 1)
+                if self.telemetria is not None:
+                    self.telemetria.emitir('camara_modo', **self.modo_camara)
+            if self.telemetria is not None and ahora_cuadro >= proximo_reporte_fps:
+                self.telemetria.emitir('camara_fps', fps=round(fps, 1))
+                proximo_reporte_fps = ahora_cuadro + INTERVALO_FPS_TELEMETRIA_S
 
-            dibujar_bgr = cuadro_bgr.copy()
             cuadro_rgb = cv2.cvtColor(cuadro_bgr, cv2.COLOR_BGR2RGB)
             resultados = self.manos.process(cuadro_rgb)
-
-            # Reiniciar intenciones
-            self.dir_mov = 0
-            self.caida_suave = False
+            self.planificador.registrar(time.monotonic(), bool(resultados.multi_hand_landmarks))
 
             ahora = time.time()
-
-            mano_izq_usuario = None
-            mano_der_usuario = None
-
-            if resultados.multi_hand_landmarks:
-                for idx, mano_lms in enumerate(resultados.multi_hand_landmarks):
-                    etiqueta_camara = None
-                    if hasattr(resultados, 'multi_handedness') and resultados.multi_handedness:
-                        if idx < len(resultados.multi_handedness):
-                            md = resultados.multi_handedness[idx]
-                            if hasattr(md, 'classification') and len(md.classification):
-                                etiqueta_camara = md.classification[0].label
-
-                    lm = mano_lms.landmark
-                    ind, med, anl, men = self._contar_dedos_extendidos(lm)
-                    pulgar_arriba, pulgar_abajo = self._pulgar_arriba_abajo(lm)
-                    pulgar_ext = self._pulgar_extendido(lm)
-
-                    datos_mano = {
-                        'lm': lm,
-                        'landmarks': mano_lms,
-                        'pulgar_arriba': pulgar_arriba,
-                        'pulgar_abajo': pulgar_abajo,
-                        'pulgar_extendido': pulgar_ext,
-                        'ind': ind,
-                        'med': med,
-                        'anl': anl,
-                        'men': men,
-                        'solo_menique': men and not ind and not med and not anl,
-                    }
-
-                    if etiqueta_camara == 'Left':
-                        mano_der_usuario = datos_mano
-                    elif etiqueta_camara == 'Right':
-                        mano_izq_usuario = datos_mano
-
-                    # Dibujar landmarks
-                    self.mp_dibujar.draw_landmarks(
-                        dibujar_bgr,
-                        mano_lms,
-                        self.mp_manos.HAND_CONNECTIONS,
-                        self.mp_estilo.get_default_hand_landmarks_style(),
-                        self.mp_estilo.get_default_hand_connections_style(),
-                    )
-
-            # ===== PROCESAR GESTOS =====
-            dedo_libre_detectado = False
-            
-            if mano_izq_usuario:
-                dedos_sin_menique = [mano_izq_usuario['ind'], mano_izq_usuario['med'], 
-                                     mano_izq_usuario['anl']]
-                if sum(dedos_sin_menique) == 1 and not mano_izq_usuario['men']:
-                    if not mano_izq_usuario['pulgar_arriba'] and not mano_izq_usuario['pulgar_abajo']:
-                        dedo_libre_detectado = True
-            
-            if mano_der_usuario:
-                dedos_sin_menique = [mano_der_usuario['ind'], mano_der_usuario['med'], 
-                                     mano_der_usuario['anl']]
-                if sum(dedos_sin_menique) == 1 and not mano_der_usuario['men']:
-                    if not mano_der_usuario['pulgar_arriba'] and not mano_der_usuario['pulgar_abajo']:
-                        dedo_libre_detectado = True
-
-            # Gesto: Caída Dura (Dedo libre)
-            if dedo_libre_detectado:
-                if self._caida_dura_armado and (ahora - self._ultimo_tiempo_caida_dura) >= self.caida_dura_debounce_s:
-                    self.borde_caida_dura = True
-                    self._ultimo_tiempo_caida_dura = ahora
-                    self._caida_dura_destellar_hasta = ahora + 0.40
-                    self._contador_caida_dura += 1
-                    self._caida_dura_armado = False
-            else:
-                self._caida_dura_armado = True
-
-            # Gesto: Rotar (Solo Meñique)
-            solo_menique_izq = (mano_izq_usuario and mano_izq_usuario['solo_menique'] 
-                                and not dedo_libre_detectado)
-            solo_menique_der = (mano_der_usuario and mano_der_usuario['solo_menique']
-                                and not dedo_libre_detectado)
-            solo_menique_detectado = solo_menique_izq or solo_menique_der
-
-            if solo_menique_detectado and not dedo_libre_detectado:
-                if self._rotar_armado and (ahora - self._ultimo_tiempo_rotar) >= self.rotar_debounce_s:
-                    self.borde_rotar_hor = True
-                    self._ultimo_tiempo_rotar = ahora
-                    self._rotar_destellar_hasta = ahora + 0.30
-                    self._contador_rotar += 1
-                    self._rotar_armado = False
-            else:
-                self._rotar_armado = True
-
-
-            
-            # --- IZQUIERDA ---
-            es_gesto_izq = (mano_izq_usuario and mano_izq_usuario['pulgar_arriba'] 
-                            and not solo_menique_izq 
-                            and not dedo_libre_detectado)
-            
-            if es_gesto_izq:
-                self._ultimo_tiempo_izq_visto = ahora  
-                
-                if self._izq_armado and (ahora - self._ultimo_tiempo_izq) >= self.movimiento_debounce_s:
-                    self.dir_mov = -1
-                    self._pasos_izq += 1
-                    self._ultimo_tiempo_izq = ahora
-                    self._izq_armado = False 
-
-            elif (ahora - self._ultimo_tiempo_izq_visto) > 0.30: 
-                self._izq_armado = True
-
-            
-            es_gesto_der = (mano_der_usuario and mano_der_usuario['pulgar_arriba'] 
-                            and not solo_menique_der 
-                            and not dedo_libre_detectado)
-            
-            if es_gesto_der:
-                self._ultimo_tiempo_der_visto = ahora
-                
-                if self._der_armado and (ahora - self._ultimo_tiempo_der) >= self.movimiento_debounce_s:
-                    self.dir_mov = 1
-                    self._pasos_der += 1
-                    self._ultimo_tiempo_der = ahora
-                    self._der_armado = False
-            
-            
-            elif (ahora - self._ultimo_tiempo_der_visto) > 0.30:
-                self._der_armado = True
-
-            # ==========================================================
-
-            pulgar_abajo_detectado = False
-            if not dedo_libre_detectado:
-                if mano_izq_usuario and mano_izq_usuario['pulgar_abajo']:
-                    pulgar_abajo_detectado = True
-                if mano_der_usuario and mano_der_usuario['pulgar_abajo']:
-                    pulgar_abajo_detectado = True
-            self.caida_suave = pulgar_abajo_detectado
+            mano_izq_usuario, mano_der_usuario = self.procesar_resultados(resultados, ahora)
 
             # ===== GUARDAR FRAME PARA RENDERIZADO EXTERNO =====
+            # cap.read() entrega un cuadro nuevo cada vez: se publica sin copiarlo
+            cuadro_publicado, landmarks = preparar_previsualizacion(
+                self.previsualizacion, cuadro_bgr, resultados)
             with self._lock_frame:
-                self.ultimo_frame = dibujar_bgr.copy()
+                self.ultimo_frame = cuadro_publicado
+                self.ultimos_landmarks = landmarks
 
             # ===== HUD (solo si mostrar_camara está activado) =====
             if self.mostrar_camara:
+                # Copia propia: el cuadro publicado no debe recibir el texto del HUD
+                dibujar_bgr = cuadro_bgr.copy()
+                if self.previsualizacion != 'anotada':
+                    dibujar_landmarks(dibujar_bgr, resultados)
+
                 def poner(y, texto):
                     cv2.putText(dibujar_bgr, texto, (8, y), cv2.FONT_HERSHEY_SIMPLEX, 0.5,
                                 (255, 255, 255), 1, cv2.LINE_AA)
@@ -417,9 +728,24 @@ class ControladorMano:
             time.sleep(1/60.0)
 
 
-def crear_controlador_manos_o_nada(mostrar_camara: bool = False, espejo: bool = False, **kwargs) -> Optional[ControladorMano]:
-    """Crea y retorna un controlador de manos o None si falla."""
-    if not MEDIAPIPE_DISPONIBLE:
+def crear_controlador_manos_o_nada(mostrar_camara: bool = False, espejo: bool = False,
+                                   en_proceso: bool = False, **kwargs) -> Optional[ControladorMano]:
+    """Crea y retorna un controlador de manos o None si falla.
+
+    Con en_proceso=True la detección corre en un proceso hijo (ver proceso_manos).
+    """
+    if en_proceso:
+        cm = None
+        try:
+            from proceso_manos import ControladorManoProceso
+            cm = ControladorManoProceso(mostrar_camara=mostrar_camara, espejar_previsualizacion=espejo, **kwargs)
+            cm.iniciar()
+            return cm
+        except Exception:
+            if cm is not None:
+                cm.detener()
+            return None
+    if not cargar_dependencias():
         return None
     try:
         cm = ControladorMano(mostrar_camara=mostrar_camara, espejar_previsualizacion=espejo, **kwargs)
@@ -429,6 +755,59 @@ def crear_controlador_manos_o_nada(mostrar_camara: bool = False, espejo: bool =
         return None
 
 
+
+class CargaManosAsincrona:
+    """Crea el ControladorMano en un hilo para que la ventana aparezca sin esperar.
+
+    Estados: 'pendiente' → 'importando' → 'abriendo_camara' → 'listo' | 'no_disponible'.
+    """
+
+    MENSAJES = {
+        'pendiente': "Preparando control por gestos...",
+        'importando': "Cargando MediaPipe...",
+        'abriendo_camara': "Abriendo cámara...",
+        'listo': "Control por gestos activado",
+        'no_disponible': "Modo solo teclado",
+    }
+
+    def __init__(self, **kwargs) -> None:
+        self.kwargs = kwargs
+        self.estado = 'pendiente'
+        self.progreso = 0.0
+        self.controlador: Optional[ControladorMano] = None
+        self.duracion_s: Optional[float] = None
+        self._hilo = threading.Thread(target=self._cargar, daemon=True)
+
+    def iniciar(self) -> "CargaManosAsincrona":
+        self._hilo.start()
+        return self
+
+    @property
+    def terminado(self) -> bool:
+        return self.estado in ('listo', 'no_disponible')
+
+    @property
+    def mensaje(self) -> str:
+        return self.MENSAJES[self.estado]
+
+    def esperar(self, timeout: Optional[float] = None) -> Optional[ControladorMano]:
+        self._hilo.join(timeout)
+        return self.controlador
+
+    def _cargar(self) -> None:
+        inicio = time.perf_counter()
+        self.estado, self.progreso = 'importando', 0.1
+        # En modo proceso el hijo importa MediaPipe; el juego no lo necesita
+        disponible = self.kwargs.get('en_proceso') or cargar_dependencias()
+        if disponible:
+            self.estado, self.progreso = 'abriendo_camara', 0.5
+            self.controlador = crear_controlador_manos_o_nada(**self.kwargs)
+        self.duracion_s = time.perf_counter() - inicio
+        self.progreso = 1.0
+        self.estado = 'listo' if self.controlador is not None else 'no_disponible'
+        print(f"[ARRANQUE] Control por gestos: {self.estado} en {self.duracion_s:.2f} s")
+
+
 if __name__ == "__main__":
     ctrl = crear_controlador_manos_o_nada(mostrar_camara=True, espejo=False)
     if ctrl is None:
@@ -50,30 +50,153 @@ TETROMINOS = {
     ]},
 }
 
+# Celdas ocupadas (i, j) de cada rotación, relativas a la esquina de la matriz 4x4
+CELDAS_PIEZA = {
+    tipo: tuple(tuple((i, j) for j in range(4) for i in range(4) if mat[j][i])
+                for mat in datos["rot"])
+    for tipo, datos in TETROMINOS.items()
+}
+
+# Wall kicks SRS por transición (desde, hasta), tal como las publica la guía:
+# +y hacia arriba. _kicks_tablero las pasa a coordenadas del tablero (+y abajo).
+_KICKS_JLSTZ = {
+    (0, 1): ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),
+    (1, 0): ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2)),
+    (1, 2): ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2)),
+    (2, 1): ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),
+    (2, 3): ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2)),
+    (3, 2): ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),
+    (3, 0): ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),
+    (0, 3): ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2)),
+}
+_KICKS_I = {
+    (0, 1): ((0, 0), (-2, 0), (1, 0), (-2, -1), (1, 2)),
+    (1, 0): ((0, 0), (2, 0), (-1, 0), (2, 1), (-1, -2)),
+    (1, 2): ((0, 0), (-1, 0), (2, 0), (-1, 2), (2, -1)),
+    (2, 1): ((0, 0), (1, 0), (-2, 0), (1, -2), (-2, 1)),
+    (2, 3): ((0, 0), (2, 0), (-1, 0), (2, 1), (-1, -2)),
+    (3, 2): ((0, 0), (-2, 0), (1, 0), (-2, -1), (1, 2)),
+    (3, 0): ((0, 0), (1, 0), (-2, 0), (1, -2), (-2, 1)),
+    (0, 3): ((0, 0), (-1, 0), (2, 0), (-1, 2), (2, -1)),
+}
+SIN_KICKS = ((0, 0),)
+
+
+def _kicks_tablero(tabla):
+    return {transicion: tuple((dx, -dy) for dx, dy in kicks)
+            for transicion, kicks in tabla.items()}
+
+
+KICKS_SRS = {tipo: _kicks_tablero(_KICKS_I if tipo == "I" else _KICKS_JLSTZ)
+             for tipo in TETROMINOS if tipo != "O"}
+KICKS_SRS["O"] = {}  # La O no rota: solo se prueba (0, 0)
+
+# Identificadores compactos de tipo (la cola de piezas guarda estos índices)
+TIPOS = tuple(TETROMINOS)
+ID_TIPO = {tipo: i for i, tipo in enumerate(TIPOS)}
+TAMANO_VISTA_PREVIA = 5
+
+# Líneas de basura enviadas al rival según líneas limpiadas (0..4)
+LINEAS_BASURA = [0, 0, 1, 2, 4]
+TIPO_BASURA = "G"
+
+TICKS_POR_SEGUNDO = 60
+
+# Manejo por defecto (en ticks de 1/60 s)
+DAS_TICKS = 10  # Retardo antes de que un lado mantenido empiece a repetir
+ARR_TICKS = 2  # Ticks entre repeticiones; 0 = directo a la pared
+BUFFER_ENTRADA_TICKS = 8  # Cuánto se reintenta una rotación que no entró
+FACTOR_CAIDA_SUAVE = 6  # La caída suave divide los ticks por fila por este factor
+
+# ============================================================
+#                     REGLAS DE JUEGO
+# ============================================================
+def gravedad_clasica(gravedad_base=0.8):
+    """Curva original: cada nivel es un 10 % más rápido, con tope de 0.1 s."""
+    return lambda nivel: max(0.1, gravedad_base * (0.9 ** (nivel - 1)))
+
+
+def gravedad_guideline(nivel):
+    """Segundos por fila según la guía moderna: (0.8 - (n-1) * 0.007) ** (n-1)."""
+    return (0.8 - (nivel - 1) * 0.007) ** (nivel - 1)
+
+
+class ReglasJuego:
+    """Gravedad y puntuación de un modo de juego como tablas precalculadas.
+
+    El Motor solo hace búsquedas en estas tablas; cambiar de reglas (o
+    barrer muchas en una simulación) no requiere tocar código.
+    """
+
+    def __init__(self, nombre, curva_gravedad, puntos_lineas=(0, 100, 300, 500, 800),
+                 multiplicar_por_nivel=False, puntos_caida_suave=1, puntos_caida_dura=2,
+                 puntos_combo=0, factor_b2b=1.0, lineas_por_nivel=10, nivel_max=30,
+                 retraso_bloqueo_ticks=30, max_reinicios_bloqueo=15):
+        self.nombre = nombre
+        # Lock delay: ticks apoyada antes de fijarse y cuántas veces un
+        # movimiento o rotación puede reiniciarlo por pieza
+        self.retraso_bloqueo_ticks = retraso_bloqueo_ticks
+        self.max_reinicios_bloqueo = max_reinicios_bloqueo
+        self.puntos_caida_suave = puntos_caida_suave
+        self.puntos_caida_dura = puntos_caida_dura
+        self.factor_b2b = factor_b2b
+        self.lineas_por_nivel = lineas_por_nivel
+        self.nivel_max = nivel_max
+
+        # Índice 0 sin usar: se indexa directamente con el nivel
+        niveles = range(nivel_max + 1)
+        self.gravedad_s = tuple(curva_gravedad(max(1, n)) for n in niveles)
+        self.ticks_por_fila = tuple(max(1, round(g * TICKS_POR_SEGUNDO)) for g in self.gravedad_s)
+        mult = [max(1, n) if multiplicar_por_nivel else 1 for n in niveles]
+        self.puntos_lineas = tuple(tuple(p * m for p in puntos_lineas) for m in mult)
+        self.puntos_combo = tuple(puntos_combo * m for m in mult)
+
+    def _nivel(self, nivel):
+        return min(nivel, self.nivel_max)
+
+    def gravedad(self, nivel):
+        """Segundos por fila en el nivel dado."""
+        return self.gravedad_s[self._nivel(nivel)]
+
+    def ticks_gravedad(self, nivel):
+        """Ticks lógicos por fila en el nivel dado (al menos 1)."""
+        return self.ticks_por_fila[self._nivel(nivel)]
+
+    def puntos(self, lineas, nivel, combo=0, b2b=False):
+        """Puntos por limpiar `lineas` con `combo` limpiezas seguidas previas."""
+        n = self._nivel(nivel)
+        puntos = self.puntos_lineas[n][lineas]
+        if b2b:
+            puntos = int(puntos * self.factor_b2b)
+        return puntos + self.puntos_combo[n] * combo
+
+
+REGLAS_CLASICAS = ReglasJuego("clasicas", gravedad_clasica())
+REGLAS_GUIDELINE = ReglasJuego("guideline", gravedad_guideline, multiplicar_por_nivel=True,
+                               puntos_combo=50, factor_b2b=1.5, nivel_max=20)
+REGLAS = {r.nombre: r for r in (REGLAS_CLASICAS, REGLAS_GUIDELINE)}
+
 class Pieza:
     """Representa un tetrominó con posición y rotación."""
     
     def __init__(self, tipo, columnas=10):
         self.tipo = tipo
+        self.columnas = columnas
         self.rot = 0
         self.x = (columnas - 4) // 2  # Centrar horizontalmente
         self.y = -2  # Empezar arriba del área visible
         self.forma = TETROMINOS[tipo]["rot"]
+        self.offsets = CELDAS_PIEZA[tipo]
     
     def celdas(self, rot=None):
         """Retorna lista de coordenadas (x, y) ocupadas por la pieza."""
         r = self.rot if rot is None else rot
-        salida = []
-        mat = self.forma[r]
-        for j in range(4):
-            for i in range(4):
-                if mat[j][i]:
-                    salida.append((self.x + i, self.y + j))
-        return salida
+        x, y = self.x, self.y
+        return [(x + i, y + j) for i, j in self.offsets[r]]
     
     def clonar(self):
         """Crea una copia de esta pieza."""
-        nueva = Pieza(self.tipo)
+        nueva = Pieza(self.tipo, self.columnas)
         nueva.rot = self.rot
         nueva.x = self.x
         nueva.y = self.y
@@ -85,28 +208,52 @@ class Pieza:
 class Motor:
     """Clase que maneja toda la lógica del juego Tetris."""
     
-    def __init__(self, columnas=10, filas=20, gravedad_base=0.8):
+    def __init__(self, columnas=10, filas=20, gravedad_base=0.8, semilla=None, reglas=None,
+                 das_ticks=DAS_TICKS, arr_ticks=ARR_TICKS, buffer_entrada_ticks=BUFFER_ENTRADA_TICKS,
+                 tamano_vista_previa=TAMANO_VISTA_PREVIA):
         self.columnas = columnas
         self.filas = filas
         self.gravedad_base = gravedad_base
+        self.reglas = reglas or ReglasJuego("clasicas", gravedad_clasica(gravedad_base))
+        self.das_ticks = das_ticks
+        self.arr_ticks = arr_ticks
+        self.buffer_entrada_ticks = buffer_entrada_ticks
+        self.tamano_vista_previa = tamano_vista_previa
+        
+        # RNG propio: con la misma semilla y las mismas entradas la partida
+        # es reproducible (ver repeticion.py)
+        self.semilla = semilla
+        self.rng = random.Random(semilla)
         
         # Estado del juego
         self.tablero = self._nuevo_tablero()
-        self.bolsa = self._generar_bolsa()
+        # Versiones: suben con cada cambio, así quien dibuja o cachea compara un entero
+        self.version_tablero = 0  # Bloques fijos
+        self.version_pieza = 0  # Pieza actual, cola y hold
+        self.version_estadisticas = 0  # Puntaje, líneas y nivel
+        self._observadores = []
+        self._cache_fantasma = None  # ((tipo, rot, x, version), y desde, y de aterrizaje)
+        self._cache_filas = None  # (version_tablero, filas con bloques)
         self.pieza_actual = None
-        self.siguiente_pieza = None
+        self._reiniciar_cola()
+        
+        # Hold: tipo guardado; solo se puede usar una vez por pieza fijada
+        self.pieza_guardada = None
+        self.hold_usado = False
         
         # Estadísticas
         self.puntaje = 0
         self.nivel = 1
         self.lineas_totales = 0
+        self.ultimas_lineas = 0  # Líneas limpiadas por la última pieza fijada
+        self.combo = -1  # Limpiezas seguidas menos uno; -1 = sin combo
+        self.b2b = False  # La última limpieza fue un Tetris
         
         # Estado de juego
         self.game_over = False
+        self._reiniciar_entradas()
         
-        # Generar primera y segunda pieza
         self._generar_nueva_pieza()
-        self._generar_siguiente_pieza()
     
     def _nuevo_tablero(self):
         """Crea un tablero vacío."""
@@ -115,37 +262,101 @@ class Motor:
     def _generar_bolsa(self):
         """Sistema 7-bag: cada pieza aparece una vez por bolsa."""
         bolsa = list(TETROMINOS.keys())
-        random.shuffle(bolsa)
+        self.rng.shuffle(bolsa)
         return bolsa
     
-    def _generar_nueva_pieza(self):
-        """Toma una pieza de la bolsa y la hace actual."""
-        if not self.bolsa:
-            self.bolsa = self._generar_bolsa()
-        tipo = self.bolsa.pop()
+    # ----- Cola de piezas (buffer circular de IDs de tipo) -----
+    def _reiniciar_cola(self):
+        # Nunca hay más que la vista previa + la pieza a sacar + una bolsa nueva
+        self._cola = [0] * (self.tamano_vista_previa + 1 + len(TIPOS))
+        self._cola_inicio = 0
+        self._cola_cantidad = 0
+        self._siguiente = None  # Pieza de la cabeza de la cola, creada al pedirla
+        self._rellenar_cola()
+    
+    def _rellenar_cola(self):
+        capacidad = len(self._cola)
+        while self._cola_cantidad <= self.tamano_vista_previa:
+            for tipo in reversed(self._generar_bolsa()):
+                fin = (self._cola_inicio + self._cola_cantidad) % capacidad
+                self._cola[fin] = ID_TIPO[tipo]
+                self._cola_cantidad += 1
+    
+    def _sacar_de_cola(self):
+        tipo = TIPOS[self._cola[self._cola_inicio]]
+        self._cola_inicio = (self._cola_inicio + 1) % len(self._cola)
+        self._cola_cantidad -= 1
+        self._siguiente = None
+        self._rellenar_cola()
+        return tipo
+    
+    def vista_previa(self, n=None):
+        """Tipos de las próximas n piezas (por defecto, toda la vista previa)."""
+        n = self.tamano_vista_previa if n is None else min(n, self.tamano_vista_previa)
+        capacidad = len(self._cola)
+        return tuple(TIPOS[self._cola[(self._cola_inicio + i) % capacidad]] for i in range(n))
+    
+    @property
+    def siguiente_pieza(self):
+        """Próxima pieza (la cabeza de la cola); para solo los tipos, vista_previa()."""
+        if self._siguiente is None:
+            self._siguiente = Pieza(TIPOS[self._cola[self._cola_inicio]], self.columnas)
+        return self._siguiente
+    
+    def _reiniciar_entradas(self):
+        """Estado del modelo por ticks (entradas mantenidas, DAS, lock delay)."""
+        self.ticks = 0
+        self.direccion_horizontal = 0
+        self.caida_suave_activa = False
+        self._acciones = []
+        self._mover_pendiente = 0
+        self._ticks_das = 0
+        self._rotacion_buffer = None  # (dirección, tick de vencimiento)
+        self._hold_buffer = None  # Tick de vencimiento
+        self._ticks_gravedad = 0
+        self._reiniciar_bloqueo_pieza()
+    
+    def _reiniciar_bloqueo_pieza(self):
+        self._ticks_bloqueo = 0
+        self._reinicios_bloqueo = 0
+        self._y_mas_baja = None
+    
+    def _generar_nueva_pieza(self, tipo=None):
+        """Hace actual la pieza del tipo dado o la primera de la cola."""
+        if tipo is None:
+            tipo = self._sacar_de_cola()
         self.pieza_actual = Pieza(tipo, self.columnas)
+        self._reiniciar_bloqueo_pieza()
+        self._ticks_gravedad = 0
+        
+        self.version_pieza += 1
         
         # Verificar si hay game over inmediato
         if self.colisiona(self.pieza_actual):
-            self.game_over = True
-            
+            self._terminar()
     
-    def _generar_siguiente_pieza(self):
-        """Prepara la siguiente pieza para mostrar."""
-        if not self.bolsa:
-            self.bolsa = self._generar_bolsa()
-        tipo = self.bolsa[-1]  # Peek sin sacar
-        self.siguiente_pieza = Pieza(tipo, self.columnas)
+    def guardar_pieza(self):
+        """Hold: guarda la pieza actual y saca la guardada (o la siguiente). Retorna True si se hizo."""
+        if self.game_over or self.pieza_actual is None or self.hold_usado:
+            return False
+        tipo_actual = self.pieza_actual.tipo
+        self._generar_nueva_pieza(self.pieza_guardada)
+        self.pieza_guardada = tipo_actual
+        self.hold_usado = True
+        return True
     
     def colisiona(self, pieza, rot=None, dx=0, dy=0):
         """Verifica si la pieza colisiona con bordes o bloques."""
-        for (x, y) in pieza.celdas(rot=rot):
-            nx, ny = x + dx, y + dy
+        offsets = pieza.offsets[pieza.rot if rot is None else rot]
+        bx, by = pieza.x + dx, pieza.y + dy
+        columnas, filas, tablero = self.columnas, self.filas, self.tablero
+        for i, j in offsets:
+            nx, ny = bx + i, by + j
             # Fuera de límites
-            if nx < 0 or nx >= self.columnas or ny >= self.filas:
+            if nx < 0 or nx >= columnas or ny >= filas:
                 return True
             # Colisión con bloque existente
-            if ny >= 0 and self.tablero[ny][nx] is not None:
+            if ny >= 0 and tablero[ny][nx] is not None:
                 return True
         return False
     
@@ -157,29 +368,77 @@ class Motor:
         if not self.colisiona(self.pieza_actual, dx=dx, dy=dy):
             self.pieza_actual.x += dx
             self.pieza_actual.y += dy
+            self.version_pieza += 1
             return True
         return False
     
     def rotar(self, direccion=1):
-        """Intenta rotar la pieza con wall kicks. Retorna True si tuvo éxito."""
+        """Intenta rotar la pieza con wall kicks SRS. Retorna True si tuvo éxito."""
         if self.game_over or self.pieza_actual is None:
             return False
         
-        nueva_rot = (self.pieza_actual.rot + direccion) % len(self.pieza_actual.forma)
-        
-        # Sistema de kicks: intentar diferentes posiciones
-        kicks = [(0,0), (-1,0), (1,0), (0,-1), (-2,0), (2,0)]
+        pieza = self.pieza_actual
+        nueva_rot = (pieza.rot + direccion) % 4
+        kicks = KICKS_SRS[pieza.tipo].get((pieza.rot, nueva_rot), SIN_KICKS)
         for dx, dy in kicks:
-            if not self.colisiona(self.pieza_actual, rot=nueva_rot, dx=dx, dy=dy):
-                self.pieza_actual.rot = nueva_rot
-                self.pieza_actual.x += dx
-                self.pieza_actual.y += dy
+            if not self.colisiona(pieza, rot=nueva_rot, dx=dx, dy=dy):
+                pieza.rot = nueva_rot
+                pieza.x += dx
+                pieza.y += dy
+                self.version_pieza += 1
                 return True
         return False
     
     def caida_suave(self):
         """Intenta mover la pieza una fila abajo. Retorna True si tuvo éxito."""
-        return self.mover(0, 1)
+        if self.mover(0, 1):
+            self.puntaje += self.reglas.puntos_caida_suave
+            self.version_estadisticas += 1
+            return True
+        return False
+    
+    def aplicar_gravedad(self):
+        """Baja la pieza una fila o la fija si no puede. Retorna True si se fijó."""
+        if self.game_over or self.pieza_actual is None:
+            return False
+        if self.mover(0, 1):
+            return False
+        self._fijar_pieza()
+        return True
+    
+    def fila_fantasma(self):
+        """Fila y donde aterrizaría la pieza actual (pieza fantasma).
+        
+        Solo se recalcula si cambió el tipo, la rotación o la columna de la
+        pieza, o el tablero; bajar por gravedad no invalida el resultado.
+        """
+        pieza = self.pieza_actual
+        if pieza is None:
+            return None
+        clave = (pieza.tipo, pieza.rot, pieza.x, self.version_tablero)
+        cache = self._cache_fantasma
+        if cache is not None and cache[0] == clave and cache[1] <= pieza.y <= cache[2]:
+            return cache[2]
+        
+        filas = 0
+        while not self.colisiona(pieza, dy=filas + 1):
+            filas += 1
+        self._cache_fantasma = (clave, pieza.y, pieza.y + filas)
+        return pieza.y + filas
+    
+    def filas_ocupadas(self):
+        """Índices de las filas con algún bloque fijo, de arriba hacia abajo.
+        
+        Se recalcula solo cuando cambia version_tablero, así quien dibuja no
+        recorre el tablero entero en cada frame.
+        """
+        cache = self._cache_filas
+        if cache is not None and cache[0] == self.version_tablero:
+            return cache[1]
+        columnas = self.columnas
+        filas = tuple(y for y, fila in enumerate(self.tablero) if fila.count(None) != columnas)
+        self._cache_filas = (self.version_tablero, filas)
+        return filas
     
     def caida_dura(self):
         """Deja caer la pieza hasta el fondo y la fija. Retorna filas bajadas."""
@@ -191,83 +450,279 @@ class Motor:
             filas += 1
         
         self.pieza_actual.y += filas
-        self._fijar_pieza()
+        self._fijar_pieza(bonus_caida_dura=filas)
         return filas
     
-    def _fijar_pieza(self):
+    def _fijar_pieza(self, bonus_caida_dura=0):
         """Convierte la pieza actual en bloques fijos en el tablero."""
         if self.pieza_actual is None:
             return
         
         topout = False
+        filas_tocadas = set()
         for (x, y) in self.pieza_actual.celdas():
             if y < 0:
                 topout = True
                 continue
             if 0 <= y < self.filas:
                 self.tablero[y][x] = self.pieza_actual.tipo
+                filas_tocadas.add(y)
+        self.version_tablero += 1
+        self._notificar('pieza_fijada', self.pieza_actual.tipo)
         
         if topout:
-            self.game_over = True
+            self._terminar()
             return
         
-        # Limpiar líneas y actualizar estadísticas
-        lineas_limpiadas = self._limpiar_lineas()
-        self._actualizar_puntaje(lineas_limpiadas)
+        # Limpiar líneas (solo pueden completarse las filas de la pieza) y actualizar estadísticas
+        lineas_limpiadas = self._limpiar_lineas(filas_tocadas)
+        self.ultimas_lineas = lineas_limpiadas
+        self._actualizar_puntaje(lineas_limpiadas, bonus_caida_dura)
         
         # Generar nueva pieza
+        self.hold_usado = False
         self._generar_nueva_pieza()
-        self._generar_siguiente_pieza()
     
-    def _limpiar_lineas(self):
-        """Elimina líneas completas. Retorna cantidad de líneas limpiadas."""
-        mantener = [fila for fila in self.tablero if any(celda is None for celda in fila)]
-        limpiadas = self.filas - len(mantener)
+    def _limpiar_lineas(self, filas_candidatas=None):
+        """Elimina líneas completas (entre las candidatas, o todas). Retorna cantidad de líneas limpiadas."""
+        tablero = self.tablero
+        if filas_candidatas is None:
+            filas_candidatas = range(self.filas)
+        completas = sorted((y for y in filas_candidatas if None not in tablero[y]), reverse=True)
         
+        # De abajo hacia arriba, para que los índices pendientes no se desplacen
+        for y in completas:
+            del tablero[y]
         # Agregar filas vacías arriba
-        while len(mantener) < self.filas:
-            mantener.insert(0, [None for _ in range(self.columnas)])
-        
-        self.tablero = mantener
-        return limpiadas
+        for _ in completas:
+            tablero.insert(0, [None] * self.columnas)
+        if completas:
+            self.version_tablero += 1
+            self._notificar('lineas_limpiadas', tuple(reversed(completas)))
+        return len(completas)
     
     def _actualizar_puntaje(self, lineas_limpiadas, bonus_caida_dura=0):
-        """Actualiza puntaje, líneas y nivel."""
-        # Sistema de puntuación: 100, 300, 500, 800 por 1-4 líneas
-        puntos_lineas = [0, 100, 300, 500, 800]
-        self.puntaje += puntos_lineas[lineas_limpiadas] + bonus_caida_dura * 2
+        """Actualiza puntaje, líneas y nivel según las reglas."""
+        reglas = self.reglas
+        if lineas_limpiadas:
+            self.combo += 1
+            tetris = lineas_limpiadas >= 4
+            puntos = reglas.puntos(lineas_limpiadas, self.nivel, self.combo, tetris and self.b2b)
+            self.b2b = tetris
+        else:
+            self.combo = -1
+            puntos = 0
+        self.puntaje += puntos + bonus_caida_dura * reglas.puntos_caida_dura
         
         self.lineas_totales += lineas_limpiadas
         
-        # Nivel aumenta cada 10 líneas
         nivel_anterior = self.nivel
-        self.nivel = 1 + self.lineas_totales // 10
+        self.nivel = 1 + self.lineas_totales // reglas.lineas_por_nivel
+        self.version_estadisticas += 1
+        
+        if self.nivel > nivel_anterior:
+            self._notificar('subida_nivel', self.nivel)
+            return True  # Retorna True si subió de nivel
+        return False
+    
+    def recibir_basura(self, cantidad, hueco):
+        """Empuja el tablero hacia arriba y agrega filas de basura con un hueco en la columna dada."""
+        if cantidad <= 0 or self.game_over:
+            return
+        cantidad = min(cantidad, self.filas)
+        # Si salen bloques por arriba, el jugador pierde
+        if any(celda is not None for fila in self.tablero[:cantidad] for celda in fila):
+            self._terminar()
+        
+        del self.tablero[:cantidad]
+        self.version_tablero += 1
+        for _ in range(cantidad):
+            fila = [TIPO_BASURA] * self.columnas
+            fila[hueco] = None
+            self.tablero.append(fila)
         
-        return self.nivel > nivel_anterior  # Retorna True si subió de nivel
+        # La pieza en juego sube con el tablero en lugar de quedar incrustada
+        if self.pieza_actual is not None:
+            while self.colisiona(self.pieza_actual) and self.pieza_actual.y > -4:
+                self.pieza_actual.y -= 1
+            self.version_pieza += 1
+    
+    # ============================================================
+    #                      NOTIFICACIONES
+    # ============================================================
+    def suscribir(self, funcion):
+        """Registra funcion(evento, datos). Eventos:
+        
+        - 'pieza_fijada': tipo de la pieza que se fijó
+        - 'lineas_limpiadas': índices de las filas completas (antes de quitarlas)
+        - 'subida_nivel': nivel nuevo
+        - 'game_over': None
+        """
+        self._observadores.append(funcion)
+    
+    def desuscribir(self, funcion):
+        if funcion in self._observadores:
+            self._observadores.remove(funcion)
+    
+    def _notificar(self, evento, datos=None):
+        for funcion in self._observadores:
+            funcion(evento, datos)
+    
+    def _terminar(self):
+        if not self.game_over:
+            self.game_over = True
+            self._notificar('game_over')
+    
+    # ============================================================
+    #          MODELO POR TICKS (DAS/ARR, LOCK DELAY, BUFFER)
+    # ============================================================
+    def establecer_horizontal(self, dx):
+        """Dirección mantenida (-1, 0, 1). Un cambio a un lado mueve un paso en el próximo tick."""
+        if dx != self.direccion_horizontal and dx != 0:
+            self._mover_pendiente = dx
+            self._ticks_das = 0
+        self.direccion_horizontal = dx
+    
+    def establecer_caida_suave(self, activa):
+        self.caida_suave_activa = bool(activa)
+    
+    def encolar(self, accion, valor=0):
+        """Entrada puntual ('mover', 'rotar', 'caida_dura', 'hold') para el próximo tick."""
+        self._acciones.append((accion, valor))
+    
+    def tick(self):
+        """Avanza un tick lógico. Retorna lo ocurrido: 'mover', 'rotar', 'hold' y/o 'fijar'."""
+        if self.game_over or self.pieza_actual is None:
+            return []
+        self.ticks += 1
+        eventos = []
+        
+        acciones, self._acciones = self._acciones, []
+        for accion, valor in acciones:
+            if accion == 'mover':
+                if self._mover_en_tick(valor):
+                    eventos.append('mover')
+            elif accion == 'rotar':
+                # Se guarda y se reintenta unos ticks (también sobre la pieza siguiente)
+                self._rotacion_buffer = (valor, self.ticks + self.buffer_entrada_ticks)
+            elif accion == 'hold':
+                # Si ya se usó en esta pieza, espera a la siguiente unos ticks
+                self._hold_buffer = self.ticks + self.buffer_entrada_ticks
+            elif accion == 'caida_dura':
+                self.caida_dura()
+                eventos.append('fijar')
+                if self.game_over:
+                    return eventos
+        
+        if self._hold_buffer is not None:
+            if self.guardar_pieza():
+                eventos.append('hold')
+                self._hold_buffer = None
+                if self.game_over:
+                    return eventos
+            elif self.ticks >= self._hold_buffer:
+                self._hold_buffer = None
+        
+        if self._rotacion_buffer is not None:
+            direccion, vence = self._rotacion_buffer
+            if self.rotar(direccion):
+                self._tras_maniobra()
+                eventos.append('rotar')
+                self._rotacion_buffer = None
+            elif self.ticks >= vence:
+                self._rotacion_buffer = None
+        
+        # DAS / ARR
+        if self._mover_pendiente:
+            if self._mover_en_tick(self._mover_pendiente):
+                eventos.append('mover')
+            self._mover_pendiente = 0
+        elif self.direccion_horizontal:
+            self._ticks_das += 1
+            if self._ticks_das >= self.das_ticks:
+                if self.arr_ticks == 0:
+                    while self._mover_en_tick(self.direccion_horizontal):
+                        eventos.append('mover')
+                elif (self._ticks_das - self.das_ticks) % self.arr_ticks == 0:
+                    if self._mover_en_tick(self.direccion_horizontal):
+                        eventos.append('mover')
+        
+        # Gravedad (la caída suave la acelera y suma puntos por fila)
+        ticks_fila = self.reglas.ticks_gravedad(self.nivel)
+        if self.caida_suave_activa:
+            ticks_fila = max(1, ticks_fila // FACTOR_CAIDA_SUAVE)
+        self._ticks_gravedad += 1
+        if self._ticks_gravedad >= ticks_fila:
+            self._ticks_gravedad = 0
+            if self.mover(0, 1) and self.caida_suave_activa:
+                self.puntaje += self.reglas.puntos_caida_suave
+                self.version_estadisticas += 1
+        
+        # Lock delay
+        pieza = self.pieza_actual
+        if self._y_mas_baja is None or pieza.y > self._y_mas_baja:
+            # Llegar a una fila nueva devuelve los reinicios
+            self._y_mas_baja = pieza.y
+            self._reinicios_bloqueo = 0
+        if self.colisiona(pieza, dy=1):
+            self._ticks_bloqueo += 1
+            if self._ticks_bloqueo >= self.reglas.retraso_bloqueo_ticks:
+                self._fijar_pieza()
+                eventos.append('fijar')
+        else:
+            self._ticks_bloqueo = 0
+        return eventos
+    
+    def _mover_en_tick(self, dx):
+        if self.mover(dx, 0):
+            self._tras_maniobra()
+            return True
+        return False
+    
+    def _tras_maniobra(self):
+        """Mover o rotar sobre el suelo reinicia el lock delay, con tope por pieza."""
+        if self._ticks_bloqueo and self._reinicios_bloqueo < self.reglas.max_reinicios_bloqueo:
+            self._ticks_bloqueo = 0
+            self._reinicios_bloqueo += 1
     
     def gravedad_actual(self):
-        """Calcula el intervalo de gravedad actual basado en el nivel."""
-        return max(0.1, self.gravedad_base * (0.9 ** (self.nivel - 1)))
+        """Intervalo de gravedad (segundos por fila) del nivel actual."""
+        return self.reglas.gravedad(self.nivel)
     
     def reiniciar(self):
         """Reinicia el juego a estado inicial."""
         self.tablero = self._nuevo_tablero()
-        self.bolsa = self._generar_bolsa()
+        self.version_tablero += 1
+        self._reiniciar_cola()
+        self.pieza_guardada = None
+        self.hold_usado = False
         self.puntaje = 0
         self.nivel = 1
         self.lineas_totales = 0
+        self.ultimas_lineas = 0
+        self.combo = -1
+        self.b2b = False
         self.game_over = False
+        self.version_estadisticas += 1
+        self._reiniciar_entradas()
         self._generar_nueva_pieza()
-        self._generar_siguiente_pieza()
     
     def obtener_estado(self):
         """Retorna un diccionario con el estado completo del juego."""
         return {
             'tablero': self.tablero,
+            'filas_ocupadas': self.filas_ocupadas(),
             'pieza_actual': self.pieza_actual,
+            'fila_fantasma': self.fila_fantasma(),
             'siguiente_pieza': self.siguiente_pieza,
+            'vista_previa': self.vista_previa(),
+            'pieza_guardada': self.pieza_guardada,
+            'hold_usado': self.hold_usado,
             'puntaje': self.puntaje,
             'nivel': self.nivel,
             'lineas': self.lineas_totales,
-            'game_over': self.game_over
+            'game_over': self.game_over,
+            'version_tablero': self.version_tablero,
+            'version_pieza': self.version_pieza,
+            'version_estadisticas': self.version_estadisticas,
         }
\ No newline at end of file
@@ -0,0 +1,237 @@
+# gestor_camaras.py — Varias cámaras con un grupo acotado de hilos de inferencia
+"""
+Cada cámara tiene un hilo de captura que solo conserva el cuadro más reciente
+(los que no alcanzan a procesarse se descartan) y su propio flujo de
+intenciones (FlujoCamara.consultar(), igual que ControladorMano).
+
+La inferencia de MediaPipe la hacen N trabajadores compartidos, con N fijo:
+el CPU total queda acotado por N y no crece con cada cámara. Los trabajadores
+atienden las cámaras por turno (round-robin) y cada cámara tiene además un
+tope de inferencias por segundo.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+import controlador_manos
+from controlador_manos import (
+    ESTADOS_JUEGO, InterpreteGestos, MedidorFps, MODOS_PREVISUALIZACION, abrir_camara, cargar_dependencias,
+    crear_detector_manos, preparar_previsualizacion,
+)
+
+
+class FlujoCamara(InterpreteGestos):
+    """Una cámara: captura propia, último cuadro e intenciones propias."""
+
+    def __init__(
+        self,
+        indice_cam: int = 0,
+        ancho: int = 640,
+        alto: int = 480,
+        previsualizacion: str = 'anotada',
+        **kwargs_gestos,
+    ) -> None:
+        if previsualizacion not in MODOS_PREVISUALIZACION:
+            raise ValueError(f"Modo de previsualización desconocido: {previsualizacion}")
+        super().__init__(**kwargs_gestos)
+        self.indice_cam = indice_cam
+        self.previsualizacion = previsualizacion
+
+        self.cap, self.modo_camara = abrir_camara(indice_cam, ancho, alto)
+        if not self.cap.isOpened():
+            self.cap.release()
+            raise RuntimeError(f"No se pudo abrir la cámara {indice_cam}")
+        self._medidor_fps = MedidorFps(f"Cámara {indice_cam}")
+        # Modelo propio: el tracking de Hands guarda estado entre cuadros de una misma cámara
+        try:
+            self.detector = crear_detector_manos()
+        except Exception:
+            self.cap.release()
+            raise
+
+        self.estado_juego: str = 'jugando'
+        self.ultimo_frame = None
+        self.ultimos_landmarks = None
+        self.cuadros_capturados: int = 0
+        self.cuadros_descartados: int = 0
+        self.inferencias: int = 0
+
+        # Protegidos por la condición del gestor
+        self._cuadro = None
+        self._ocupado: bool = False
+        self._ultima_inferencia: float = 0.0
+        self._aviso: Optional[threading.Condition] = None
+
+        self._ejecutando = False
+        self._hilo = threading.Thread(target=self._bucle_captura, daemon=True)
+
+    def establecer_estado_juego(self, estado: str) -> None:
+        """Al cambiar de estado descarta las intenciones pendientes, igual que ControladorMano."""
+        if estado not in ESTADOS_JUEGO:
+            raise ValueError(f"Estado de juego desconocido: {estado}")
+        if estado != self.estado_juego:
+            self.estado_juego = estado
+            self.soltar_intenciones()
+
+    def _iniciar(self, aviso: threading.Condition) -> None:
+        self._aviso = aviso
+        self._ejecutando = True
+        self._hilo.start()
+
+    def _detener(self) -> None:
+        self._ejecutando = False
+        try:
+            self._hilo.join(timeout=1.0)
+        except Exception:
+            pass
+        for cerrar in (self.detector.close, self.cap.release):
+            try:
+                cerrar()
+            except Exception:
+                pass
+
+    def _bucle_captura(self) -> None:
+        while self._ejecutando:
+            ok, cuadro = self.cap.read()
+            if not ok:
+                time.sleep(0.01)
+                continue
+            fps_logrados = self._medidor_fps.cuadro(time.monotonic())
+            if fps_logrados is not None and self.modo_camara is not None:
+                self.modo_camara['fps_logrados'] = round(fps_logrados, 1)
+            with self._aviso:
+                if self._cuadro is not None:
+                    self.cuadros_descartados += 1
+                self._cuadro = cuadro
+                self.cuadros_capturados += 1
+                self._aviso.notify()
+
+    def _inferir(self, cuadro) -> None:
+        """Ejecutado por un trabajador del gestor (nunca dos a la vez por cámara)."""
+        cv2 = controlador_manos.cv2
+        resultados = self.detector.process(cv2.cvtColor(cuadro, cv2.COLOR_BGR2RGB))
+        self.procesar_resultados(resultados, time.time())
+        self.inferencias += 1
+        # El hilo de captura ya soltó este cuadro: se puede anotar sin copiarlo
+        self.ultimo_frame, self.ultimos_landmarks = preparar_previsualizacion(
+            self.previsualizacion, cuadro, resultados)
+
+
+class GestorCamaras:
+    """Maneja N cámaras con un grupo acotado de trabajadores de inferencia."""
+
+    def __init__(
+        self,
+        indices: Sequence[int] = (0, 1),
+        max_trabajadores: int = 1,
+        fps_max_por_camara: float = 30.0,
+        **kwargs_flujo,
+    ) -> None:
+        if not cargar_dependencias():
+            raise RuntimeError("MediaPipe / OpenCV no disponibles")
+
+        self.flujos: List[FlujoCamara] = []
+        try:
+            for i in indices:
+                self.flujos.append(FlujoCamara(i, **kwargs_flujo))
+        except Exception:
+            # Liberar las cámaras ya abiertas: si no, quedan tomadas hasta que termine el proceso
+            for flujo in self.flujos:
+                flujo._detener()
+            raise
+        self.max_trabajadores = max(1, min(max_trabajadores, len(self.flujos)))
+        self.intervalo_min_s = 1.0 / fps_max_por_camara if fps_max_por_camara > 0 else 0.0
+
+        self._aviso = threading.Condition()
+        self._turno = 0
+        self._ejecutando = False
+        self._trabajadores: List[threading.Thread] = []
+
+    def iniciar(self) -> None:
+        self._ejecutando = True
+        for flujo in self.flujos:
+            flujo._iniciar(self._aviso)
+        for _ in range(self.max_trabajadores):
+            hilo = threading.Thread(target=self._bucle_trabajador, daemon=True)
+            hilo.start()
+            self._trabajadores.append(hilo)
+
+    def detener(self) -> None:
+        self._ejecutando = False
+        with self._aviso:
+            self._aviso.notify_all()
+        for hilo in self._trabajadores:
+            hilo.join(timeout=1.0)
+        for flujo in self.flujos:
+            flujo._detener()
+
+    def establecer_estado_juego(self, estado: str) -> None:
+        for flujo in self.flujos:
+            flujo.establecer_estado_juego(estado)
+
+    def _tomar_trabajo(self, ahora: float):
+        """Siguiente (flujo, cuadro) por turno; llamar con la condición tomada."""
+        n = len(self.flujos)
+        for k in range(n):
+            indice = (self._turno + k) % n
+            flujo = self.flujos[indice]
+            if flujo._cuadro is None or flujo._ocupado:
+                continue
+            if ahora - flujo._ultima_inferencia < self.intervalo_min_s:
+                continue
+            self._turno = (indice + 1) % n
+            cuadro, flujo._cuadro = flujo._cuadro, None
+            flujo._ocupado = True
+            flujo._ultima_inferencia = ahora
+            return flujo, cuadro
+        return None
+
+    def _bucle_trabajador(self) -> None:
+        while self._ejecutando:
+            with self._aviso:
+                trabajo = self._tomar_trabajo(time.monotonic())
+                while trabajo is None and self._ejecutando:
+                    # El timeout cubre el caso de cámaras limitadas por fps_max
+                    self._aviso.wait(timeout=max(0.005, self.intervalo_min_s / 2))
+                    trabajo = self._tomar_trabajo(time.monotonic())
+            if trabajo is None:
+                break
+
+            flujo, cuadro = trabajo
+            try:
+                flujo._inferir(cuadro)
+            except Exception:
+                pass
+            finally:
+                with self._aviso:
+                    flujo._ocupado = False
+                    self._aviso.notify()
+
+    def estadisticas(self) -> Dict[int, Dict[str, int]]:
+        """Cuadros capturados, descartados e inferidos por cámara."""
+        return {
+            f.indice_cam: {
+                'capturados': f.cuadros_capturados,
+                'descartados': f.cuadros_descartados,
+                'inferencias': f.inferencias,
+            }
+            for f in self.flujos
+        }
+
+
+def crear_gestor_camaras_o_nada(indices: Sequence[int] = (0, 1), **kwargs) -> Optional[GestorCamaras]:
+    """Crea e inicia un GestorCamaras, o retorna None si falla."""
+    if not cargar_dependencias():
+        return None
+    try:
+        gestor = GestorCamaras(indices, **kwargs)
+    except Exception:
+        return None
+    try:
+        gestor.iniciar()
+    except Exception:
+        gestor.detener()
+        return None
+    return gestor
@@ -0,0 +1,272 @@
+# modo_versus.py
+# =============================================================================
+#                         MODO VERSUS (2 TABLEROS)
+# =============================================================================
+# Dos Motor independientes lado a lado. Limpiar 2+ líneas envía basura al
+# rival. Cada tablero tiene sus propias fuentes de entrada (teclado, mano o
+# bot); ninguna bloquea el bucle, así una fuente lenta no frena al otro.
+#
+#   python src/modo_versus.py          → jugador 1 (WASD + espacio) vs jugador 2 (flechas + Enter)
+#   python src/modo_versus.py --bot    → jugador (teclado/manos) vs bot
+#   python src/modo_versus.py --dos-camaras → además, cada jugador con su cámara
+
+import random
+import sys
+
+import pygame
+
+from core_tetris import Motor, LINEAS_BASURA
+from cascara_tetris import (
+    RenderizadorTetris, SimulacionTetris, AcumuladorTicks, GestorAudio,
+    obtener_banco_sonidos, COLUMNAS, FILAS, CELDA, ALTO, FPS, GRAVEDAD_BASE_S, NEGRO,
+)
+from bot_tetris import BotTetris
+from controlador_manos import CargaManosAsincrona
+from gestor_camaras import crear_gestor_camaras_o_nada
+
+MARGEN_VERSUS = 40
+ANCHO_VERSUS = 2 * COLUMNAS * CELDA + 3 * MARGEN_VERSUS
+ALTO_VERSUS = ALTO + 30
+
+TECLAS_J1 = {'izq': pygame.K_a, 'der': pygame.K_d, 'rotar': pygame.K_w,
+             'suave': pygame.K_s, 'dura': pygame.K_SPACE, 'hold': pygame.K_q}
+TECLAS_J2 = {'izq': pygame.K_LEFT, 'der': pygame.K_RIGHT, 'rotar': pygame.K_UP,
+             'suave': pygame.K_DOWN, 'dura': pygame.K_RETURN, 'hold': pygame.K_RSHIFT}
+
+ACCIONES_BOT_POR_SEGUNDO = 10
+
+# ============================================================
+#                    FUENTES DE ENTRADA
+# ============================================================
+class FuenteTeclado:
+    """Teclas asignadas a un tablero."""
+
+    def __init__(self, teclas):
+        self.teclas = teclas
+
+    def procesar_evento(self, event, sim):
+        t = self.teclas
+        if event.type == pygame.KEYDOWN:
+            if event.key == t['izq']:
+                sim.pulsar_horizontal(-1)
+            elif event.key == t['der']:
+                sim.pulsar_horizontal(1)
+            elif event.key == t['rotar']:
+                sim.encolar('rotar', 1)
+            elif event.key == t['suave']:
+                sim.caida_suave_teclado = True
+            elif event.key == t['dura']:
+                sim.encolar('caida_dura')
+            elif event.key == t['hold']:
+                sim.encolar('hold')
+        elif event.type == pygame.KEYUP:
+            if event.key == t['izq']:
+                sim.soltar_horizontal(-1)
+            elif event.key == t['der']:
+                sim.soltar_horizontal(1)
+            elif event.key == t['suave']:
+                sim.caida_suave_teclado = False
+
+    def actualizar(self, sim):
+        pass
+
+
+class FuenteMano:
+    """Gestos de un ControladorMano (o de una carga en segundo plano que aún no terminó)."""
+
+    def __init__(self, controlador=None, carga=None):
+        self.controlador = controlador
+        self.carga = carga
+
+    def procesar_evento(self, event, sim):
+        pass
+
+    def actualizar(self, sim):
+        if self.controlador is None:
+            if self.carga is None or not self.carga.terminado:
+                return
+            self.controlador = self.carga.controlador
+            if self.controlador is None:
+                self.carga = None
+                return
+        dir_mov, caida_suave, rotar_borde, caida_dura_borde = self.controlador.consultar()
+        if dir_mov != 0:
+            sim.encolar('mover', dir_mov)
+        if rotar_borde:
+            sim.encolar('rotar', 1)
+        if caida_dura_borde:
+            sim.encolar('caida_dura')
+        sim.caida_suave_mano = bool(caida_suave)
+
+
+class FuenteBot:
+    """Bot con ritmo limitado de acciones; planifica en su propio hilo."""
+
+    def __init__(self, bot=None, acciones_por_segundo=ACCIONES_BOT_POR_SEGUNDO):
+        self.bot = bot if bot is not None else BotTetris()
+        self.ticks_entre_acciones = max(1, 60 // acciones_por_segundo)
+        self._ultimo_tick = -self.ticks_entre_acciones
+
+    def procesar_evento(self, event, sim):
+        pass
+
+    def actualizar(self, sim):
+        if sim.tick - self._ultimo_tick < self.ticks_entre_acciones:
+            return
+        accion = self.bot.siguiente_accion(sim.motor)
+        if accion is not None:
+            sim.encolar(*accion)
+            self._ultimo_tick = sim.tick
+
+    def detener(self):
+        self.bot.detener()
+
+# ============================================================
+#                      TABLERO + BASURA
+# ============================================================
+class TableroVersus:
+    """Un Motor con su simulación, sus fuentes y su basura pendiente."""
+
+    def __init__(self, nombre, fuentes, origen, semilla, audio=None):
+        self.nombre = nombre
+        self.fuentes = fuentes
+        self.origen = origen
+        self.motor = Motor(COLUMNAS, FILAS, GRAVEDAD_BASE_S, semilla=semilla)
+        self.sim = SimulacionTetris(self.motor, audio)
+        self.sim.al_fijar = self._al_fijar
+        self.rival = None
+        self.basura_pendiente = 0
+        self._rng_basura = random.Random(semilla)
+
+    def _al_fijar(self, lineas):
+        enviar = LINEAS_BASURA[min(lineas, 4)]
+        # Las líneas propias cancelan primero la basura que venía en camino
+        cancelada = min(enviar, self.basura_pendiente)
+        self.basura_pendiente -= cancelada
+        enviar -= cancelada
+
+        if lineas == 0 and self.basura_pendiente:
+            hueco = self._rng_basura.randrange(COLUMNAS)
+            self.motor.recibir_basura(self.basura_pendiente, hueco)
+            self.basura_pendiente = 0
+
+        if enviar and self.rival is not None:
+            self.rival.basura_pendiente += enviar
+
+    def procesar_evento(self, event):
+        for fuente in self.fuentes:
+            fuente.procesar_evento(event, self.sim)
+
+    def actualizar_entradas(self):
+        for fuente in self.fuentes:
+            fuente.actualizar(self.sim)
+
+    def detener(self):
+        for fuente in self.fuentes:
+            if hasattr(fuente, 'detener'):
+                fuente.detener()
+
+# ============================================================
+#                       BUCLE VERSUS
+# ============================================================
+def ejecutar_versus(contra_bot=False, carga_manos=None, gestor_camaras=None):
+    pantalla = pygame.display.set_mode((ANCHO_VERSUS, ALTO_VERSUS))
+    pygame.display.set_caption("Tetris — Versus")
+    reloj = pygame.time.Clock()
+    render = RenderizadorTetris(pantalla)
+    audio = GestorAudio()
+
+    semilla = random.getrandbits(63)  # Misma secuencia de piezas para ambos
+    fuentes_j1 = [FuenteTeclado(TECLAS_J1)]
+    fuentes_j2 = [FuenteBot()] if contra_bot else [FuenteTeclado(TECLAS_J2)]
+    if gestor_camaras is not None:
+        # Un flujo de intenciones por cámara
+        fuentes_j1.append(FuenteMano(gestor_camaras.flujos[0]))
+        if not contra_bot and len(gestor_camaras.flujos) > 1:
+            fuentes_j2.append(FuenteMano(gestor_camaras.flujos[1]))
+    elif carga_manos is not None:
+        fuentes_j1.append(FuenteMano(carga=carga_manos))
+
+    origen_2 = (2 * MARGEN_VERSUS + COLUMNAS * CELDA, 0)
+    tableros = [
+        TableroVersus("J1", fuentes_j1, (MARGEN_VERSUS, 0), semilla, audio),
+        TableroVersus("BOT" if contra_bot else "J2", fuentes_j2, origen_2, semilla, audio),
+    ]
+    tableros[0].rival, tableros[1].rival = tableros[1], tableros[0]
+
+    if gestor_camaras is not None:
+        gestor_camaras.establecer_estado_juego('jugando')
+    audio.iniciar_musica()
+    acumulador = AcumuladorTicks()
+    try:
+        while not any(t.motor.game_over for t in tableros):
+            reloj.tick(FPS)
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return False
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    return False
+                for t in tableros:
+                    t.procesar_evento(event)
+
+            for t in tableros:
+                t.actualizar_entradas()
+
+            for _ in range(acumulador.ticks_pendientes()):
+                for t in tableros:
+                    t.sim.paso()
+
+            # Un solo fill y todos los tableros en el mismo frame
+            pantalla.fill(NEGRO)
+            for t in tableros:
+                estado = t.motor.obtener_estado()
+                render.dibujar_tablero(estado['tablero'], t.origen, limpiar=False,
+                                       filas_ocupadas=estado['filas_ocupadas'])
+                render.dibujar_fantasma(estado['pieza_actual'], estado['fila_fantasma'], t.origen)
+                render.dibujar_pieza(estado['pieza_actual'], t.origen)
+                render.dibujar_marcador(estado, t.origen, t.nombre, t.basura_pendiente)
+            pygame.display.flip()
+    finally:
+        for t in tableros:
+            t.detener()
+        if gestor_camaras is not None:
+            gestor_camaras.establecer_estado_juego('menu')
+
+    audio.detener_musica()
+    audio.reproducir('game_over.wav')
+
+    vivos = [t for t in tableros if not t.motor.game_over]
+    ganador = vivos[0] if vivos else max(tableros, key=lambda t: t.motor.puntaje)
+    return render.menu_game_over(ganador.motor.puntaje, ganador.motor.lineas_totales,
+                                 ganador.motor.nivel, f"{ganador.nombre} GANA")
+
+
+def main():
+    contra_bot = "--bot" in sys.argv[1:]
+    dos_camaras = "--dos-camaras" in sys.argv[1:]
+    pygame.mixer.pre_init(44100, -16, 2, 512)
+    pygame.init()
+    obtener_banco_sonidos(en_segundo_plano=True)
+
+    carga_manos = gestor = None
+    if dos_camaras:
+        # El versus no muestra la cámara: sin previsualización no se copia ni se dibuja nada
+        gestor = crear_gestor_camaras_o_nada((0, 1), max_trabajadores=1, previsualizacion='ninguna')
+    else:
+        carga_manos = CargaManosAsincrona(mostrar_camara=False, espejo=False,
+                                          previsualizacion='ninguna').iniciar()
+
+    while ejecutar_versus(contra_bot, carga_manos, gestor):
+        pass
+
+    if gestor is not None:
+        gestor.detener()
+    if carga_manos is not None and carga_manos.controlador is not None:
+        carga_manos.controlador.detener()
+    pygame.quit()
+    sys.exit()
+
+
+if __name__ == "__main__":
+    main()
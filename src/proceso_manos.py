@@ -0,0 +1,416 @@
+# proceso_manos.py — Control por gestos en un proceso hijo (fuera del GIL del juego)
+"""
+ControladorManoProceso corre cámara, MediaPipe, cvtColor, el dibujo de
+landmarks y la lógica de gestos en otro proceso, así nada de eso compite por
+el GIL con el render de pygame.
+
+- Los cuadros (y, en modo 'landmarks', los landmarks) viajan por memoria
+  compartida (BufferCuadros): dos ranuras y un contador de secuencia; el hijo
+  escribe, el juego copia la más reciente. El juego crea el buffer del
+  tamaño del modo que negoció la cámara, así el hijo publica cada cuadro sin
+  reescalarlo; el juego lo escala una vez al dibujarlo.
+- Las intenciones viajan por un Pipe como tuplas pequeñas, solo cuando hay
+  algo que informar (un borde o un cambio de caída suave). Una vez por
+  segundo viajan también los FPS de la cámara, y una vez el modo de captura
+  negociado con los FPS logrados. Al calibrar viajan además los landmarks
+  de cada inferencia. En sentido contrario solo viajan un
+  perfil de calibración, el estado del juego (que fija la tasa de
+  inferencia) o la orden de detenerse.
+
+Expone la misma interfaz que ControladorMano: iniciar(), detener(),
+consultar() y ultimo_frame.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+import controlador_manos
+from controlador_manos import (
+    ESTADOS_JUEGO, INTERVALO_FPS_TELEMETRIA_S, InterpreteGestos, MedidorFps, MODOS_PREVISUALIZACION,
+    PASO_ESPERA_S, PlanificadorInferencia, abrir_camara, cargar_dependencias, crear_detector_manos,
+    preparar_previsualizacion,
+)
+
+TIMEOUT_ARRANQUE_S = 30.0  # El hijo importa MediaPipe desde cero
+MAX_MANOS = 2
+PUNTOS_MANO = 21
+
+
+class BufferCuadros:
+    """Dos ranuras (cuadro BGR + landmarks) en memoria compartida más un contador.
+
+    Un solo escritor: escribe en la ranura que no es la última publicada y
+    luego incrementa el contador. El lector copia la ranura publicada y
+    reintenta si el contador cambió mientras copiaba.
+    """
+
+    _CABECERA = 8  # int64 con la secuencia
+
+    def __init__(self, ancho: int, alto: int, nombre: Optional[str] = None) -> None:
+        self.forma = (alto, ancho, 3)
+        tam_cuadros = 2 * alto * ancho * 3
+        forma_lms = (2, MAX_MANOS, PUNTOS_MANO, 2)
+        tam_lms = int(np.prod(forma_lms)) * 4
+        crear = nombre is None
+        self._shm = shared_memory.SharedMemory(
+            name=nombre, create=crear,
+            size=self._CABECERA + 16 + tam_lms + tam_cuadros if crear else 0)
+        self._propietario = crear
+
+        buf = self._shm.buf
+        self._secuencia = np.ndarray((1,), dtype=np.int64, buffer=buf)
+        # Manos por ranura; -1 = la ranura no trae landmarks
+        self._n_manos = np.ndarray((2,), dtype=np.int64, buffer=buf, offset=self._CABECERA)
+        self._landmarks = np.ndarray(forma_lms, dtype=np.float32, buffer=buf,
+                                     offset=self._CABECERA + 16)
+        self._ranuras = np.ndarray((2,) + self.forma, dtype=np.uint8, buffer=buf,
+                                   offset=self._CABECERA + 16 + tam_lms)
+        if crear:
+            self._secuencia[0] = 0
+
+    @property
+    def nombre(self) -> str:
+        return self._shm.name
+
+    @property
+    def secuencia(self) -> int:
+        return int(self._secuencia[0])
+
+    def escribir(self, cuadro, landmarks=None) -> None:
+        siguiente = self.secuencia + 1
+        ranura = siguiente % 2
+        self._ranuras[ranura][...] = cuadro
+        if landmarks is None:
+            self._n_manos[ranura] = -1
+        else:
+            manos = landmarks[:MAX_MANOS]
+            for i, mano in enumerate(manos):
+                self._landmarks[ranura, i] = mano
+            self._n_manos[ranura] = len(manos)
+        self._secuencia[0] = siguiente
+
+    def _leer_consistente(self, copiar):
+        for _ in range(3):
+            antes = self.secuencia
+            if antes == 0:
+                return None
+            copia = copiar(antes % 2)
+            if self.secuencia == antes:
+                return copia
+        return copia  # Escritor muy rápido: se acepta una copia posiblemente mezclada
+
+    def leer(self):
+        """Copia del último cuadro publicado, o None si aún no hay ninguno."""
+        return self._leer_consistente(lambda ranura: self._ranuras[ranura].copy())
+
+    def leer_landmarks(self):
+        """Landmarks del último cuadro como tuplas (x, y) por mano, o None."""
+        def copiar(ranura):
+            n = int(self._n_manos[ranura])
+            if n < 0:
+                return None
+            return tuple(tuple(map(tuple, mano)) for mano in self._landmarks[ranura, :n].tolist())
+        return self._leer_consistente(copiar)
+
+    def cerrar(self) -> None:
+        # Las vistas numpy deben soltarse antes de cerrar el mapeo
+        self._secuencia = self._n_manos = self._landmarks = self._ranuras = None
+        try:
+            self._shm.close()
+            if self._propietario:
+                self._shm.unlink()
+        except Exception:
+            pass
+
+
+def _proceso_hijo(conexion, indice_cam: int, ancho: int, alto: int,
+                  mostrar_camara: bool, espejar: bool, previsualizacion: str,
+                  kwargs_gestos: dict) -> None:
+    """Bucle de detección del proceso hijo."""
+    if not cargar_dependencias():
+        conexion.send(('error', "MediaPipe / OpenCV no disponibles"))
+        return
+    cv2 = controlador_manos.cv2
+
+    cap, modo = abrir_camara(indice_cam, ancho, alto)
+    if not cap.isOpened():
+        conexion.send(('error', f"No se pudo abrir la cámara {indice_cam}"))
+        return
+
+    detector = crear_detector_manos()
+    interprete = InterpreteGestos(**kwargs_gestos)
+    planificador = PlanificadorInferencia()
+    buffer = None
+    # El juego crea la memoria compartida del tamaño negociado y manda su nombre
+    conexion.send(('camara', modo))
+    try:
+        while buffer is None:
+            mensaje = conexion.recv()
+            if mensaje[0] == 'buffer':
+                buffer = BufferCuadros(mensaje[2], mensaje[3], nombre=mensaje[1])
+            elif mensaje[0] == 'perfil':
+                interprete.aplicar_perfil(mensaje[1])
+            elif mensaje[0] == 'estado_juego':
+                planificador.establecer_estado(mensaje[1])
+            else:
+                break
+    except (EOFError, OSError):
+        pass
+    if buffer is None:
+        for cerrar in (detector.close, cap.release):
+            try:
+                cerrar()
+            except Exception:
+                pass
+        return
+    alto_buffer, ancho_buffer = buffer.forma[:2]
+    medidor = MedidorFps(f"Cámara {indice_cam}")
+
+    suave_previo = False
+    tiempo_previo = time.time()
+    fps = 0.0
+    proximo_reporte_fps = tiempo_previo + INTERVALO_FPS_TELEMETRIA_S
+    try:
+        while True:
+            # Salvo un perfil o un estado de juego, cualquier mensaje (o el cierre) detiene el bucle
+            if conexion.poll():
+                mensaje = conexion.recv()
+                if mensaje[0] == 'perfil':
+                    interprete.aplicar_perfil(mensaje[1])
+                elif mensaje[0] == 'estado_juego':
+                    planificador.establecer_estado(mensaje[1])
+                else:
+                    break
+            espera = planificador.espera(time.monotonic())
+            if espera > 0:
+                medidor.reiniciar()
+                time.sleep(min(espera, PASO_ESPERA_S))
+                continue
+            ok, cuadro_bgr = cap.read()
+            if not ok:
+                time.sleep(0.01)
+                continue
+
+            ahora = time.time()
+            fps_logrados = medidor.cuadro(ahora)
+            if fps_logrados is not None:
+                modo['fps_logrados'] = round(fps_logrados, 1)
+                conexion.send(('modo_camara', modo))
+            if ahora > tiempo_previo:
+                fps = 0.9 * fps + 0.1 / (ahora - tiempo_previo)
+            tiempo_previo = ahora
+            if ahora >= proximo_reporte_fps:
+                conexion.send(('fps', round(fps, 1)))
+                proximo_reporte_fps = ahora + INTERVALO_FPS_TELEMETRIA_S
+
+            resultados = detector.process(cv2.cvtColor(cuadro_bgr, cv2.COLOR_BGR2RGB))
+            planificador.registrar(time.monotonic(), bool(resultados.multi_hand_landmarks))
+            interprete.procesar_resultados(resultados, time.time())
+            if planificador.estado_juego == 'calibrando':
+                # La calibración necesita las manos aunque la previsualización no las publique
+                conexion.send(('landmarks', interprete.landmarks_detectados))
+            dir_mov, caida_suave, rotar, caida_dura = interprete.consultar()
+            if dir_mov or rotar or caida_dura or caida_suave != suave_previo:
+                conexion.send(('intencion', dir_mov, caida_suave, rotar, caida_dura))
+                suave_previo = caida_suave
+
+            # El cuadro ya es nuestro: se anota sin copiarlo
+            cuadro_publicado, landmarks = preparar_previsualizacion(
+                previsualizacion, cuadro_bgr, resultados)
+            if cuadro_publicado is not None:
+                if cuadro_publicado.shape[:2] != (alto_buffer, ancho_buffer):
+                    # Solo si la cámara entrega otro tamaño que el que informó
+                    cuadro_publicado = cv2.resize(cuadro_publicado, (ancho_buffer, alto_buffer))
+                buffer.escribir(cuadro_publicado, landmarks)
+
+            if mostrar_camara:
+                cv2.imshow("Cámara Mano", cv2.flip(cuadro_bgr, 1) if espejar else cuadro_bgr)
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+    except (EOFError, BrokenPipeError, KeyboardInterrupt):
+        pass
+    finally:
+        for cerrar in (detector.close, cap.release, buffer.cerrar):
+            try:
+                cerrar()
+            except Exception:
+                pass
+        if mostrar_camara:
+            try:
+                cv2.destroyAllWindows()
+            except Exception:
+                pass
+
+
+class ControladorManoProceso:
+    """Misma interfaz que ControladorMano, con la detección en un proceso hijo."""
+
+    def __init__(
+        self,
+        indice_cam: int = 0,
+        ancho: int = 640,
+        alto: int = 480,
+        mostrar_camara: bool = False,
+        espejar_previsualizacion: bool = False,
+        previsualizacion: str = 'anotada',
+        telemetria=None,
+        **kwargs_gestos,
+    ) -> None:
+        if previsualizacion not in MODOS_PREVISUALIZACION:
+            raise ValueError(f"Modo de previsualización desconocido: {previsualizacion}")
+        self.ancho = ancho
+        self.alto = alto
+        self.previsualizacion = previsualizacion
+        self.mostrar_camara = mostrar_camara
+        # La telemetría vive en este proceso: el hijo solo manda intenciones y FPS
+        self.telemetria = telemetria
+        self.fps_camara: float = 0.0
+        self._landmarks_detectados = None  # Solo llegan mientras se calibra
+        self.modo_camara: Optional[dict] = None  # Lo informa el hijo al abrir la cámara
+        self.estado_juego = 'jugando'  # Igual que el PlanificadorInferencia del hijo
+
+        # Estado público (acumulado entre consultas, como en ControladorMano)
+        self.dir_mov: int = 0
+        self.caida_suave: bool = False
+        self.borde_rotar_hor: bool = False
+        self.borde_caida_dura: bool = False
+
+        # 'spawn': el hijo no hereda el estado de SDL/pygame del juego
+        contexto = multiprocessing.get_context('spawn')
+        self._buffer: Optional[BufferCuadros] = None  # Se crea al conocer el modo de la cámara
+        self._conexion, conexion_hijo = contexto.Pipe()
+        self._proceso = contexto.Process(
+            target=_proceso_hijo,
+            args=(conexion_hijo, indice_cam, ancho, alto,
+                  mostrar_camara, espejar_previsualizacion, previsualizacion, kwargs_gestos),
+            daemon=True,
+        )
+
+    def iniciar(self, timeout: float = TIMEOUT_ARRANQUE_S) -> None:
+        """Lanza el proceso, espera a que la cámara esté abierta y le pasa el buffer de cuadros."""
+        self._proceso.start()
+        if not self._conexion.poll(timeout):
+            raise RuntimeError("El proceso de manos no respondió a tiempo")
+        mensaje = self._conexion.recv()
+        if mensaje[0] != 'camara':
+            raise RuntimeError(mensaje[1])
+        self.modo_camara = mensaje[1]
+        self._crear_buffer(self.modo_camara['ancho'], self.modo_camara['alto'])
+        self._conexion.send(('buffer', self._buffer.nombre, self._buffer.forma[1], self._buffer.forma[0]))
+
+    def _crear_buffer(self, ancho: int, alto: int) -> None:
+        """Memoria compartida del tamaño real de los cuadros (el del modo negociado)."""
+        if ancho <= 0 or alto <= 0:
+            ancho, alto = self.ancho, self.alto  # La cámara no informó su tamaño
+        self._buffer = BufferCuadros(ancho, alto)
+
+    def aplicar_perfil(self, perfil: Optional[dict]) -> None:
+        """Envía un perfil de calibración al intérprete del hijo (None = valores por defecto)."""
+        try:
+            self._conexion.send(('perfil', perfil))
+        except (BrokenPipeError, OSError):
+            pass
+
+    soltar_intenciones = InterpreteGestos.soltar_intenciones
+
+    def establecer_estado_juego(self, estado: str) -> None:
+        """Informa al hijo el estado del juego; solo se envía cuando cambia.
+
+        Fuera del juego nadie llama a consultar(): el pipe se vacía aquí para que
+        los menús no acumulen mensajes ni intenciones viejas para la próxima partida.
+        """
+        if estado not in ESTADOS_JUEGO:
+            raise ValueError(f"Estado de juego desconocido: {estado}")
+        self._recibir()  # Lo pendiente llegó durante el estado anterior
+        if estado == self.estado_juego:
+            return
+        self.estado_juego = estado
+        self.soltar_intenciones()
+        try:
+            self._conexion.send(('estado_juego', estado))
+        except (BrokenPipeError, OSError):
+            pass
+
+    def detener(self) -> None:
+        """Pide al hijo que termine y libera la memoria compartida."""
+        try:
+            self._conexion.send(('detener',))
+        except Exception:
+            pass
+        if self._proceso.is_alive():
+            self._proceso.join(timeout=2.0)
+            if self._proceso.is_alive():
+                self._proceso.terminate()
+        try:
+            self._conexion.close()
+        except Exception:
+            pass
+        if self._buffer is not None:
+            self._buffer.cerrar()
+
+    @property
+    def ultimo_frame(self):
+        return self._buffer.leer() if self._buffer is not None else None
+
+    @property
+    def ultimos_landmarks(self):
+        return self._buffer.leer_landmarks() if self._buffer is not None else None
+
+    @property
+    def landmarks_detectados(self):
+        """Manos de la última inferencia (como InterpreteGestos); el hijo las manda al calibrar."""
+        self._recibir()
+        return self._landmarks_detectados
+
+    def _recibir(self) -> None:
+        """Acumula las intenciones llegadas desde la última consulta (fuera del juego se descartan)."""
+        try:
+            while self._conexion.poll():
+                mensaje = self._conexion.recv()
+                if mensaje[0] == 'fps':
+                    self.fps_camara = mensaje[1]
+                    if self.telemetria is not None:
+                        self.telemetria.emitir('camara_fps', fps=self.fps_camara)
+                    continue
+                if mensaje[0] == 'landmarks':
+                    self._landmarks_detectados = mensaje[1]
+                    continue
+                if mensaje[0] == 'modo_camara':
+                    self.modo_camara = mensaje[1]
+                    if self.telemetria is not None:
+                        self.telemetria.emitir('camara_modo', **self.modo_camara)
+                    continue
+                if mensaje[0] != 'intencion' or self.estado_juego != 'jugando':
+                    continue
+                _, dir_mov, caida_suave, rotar, caida_dura = mensaje
+                if self.telemetria is not None:
+                    self._emitir_gestos(dir_mov, rotar, caida_dura)
+                if dir_mov:
+                    self.dir_mov = dir_mov
+                self.caida_suave = caida_suave
+                self.borde_rotar_hor = self.borde_rotar_hor or rotar
+                self.borde_caida_dura = self.borde_caida_dura or caida_dura
+        except (EOFError, OSError):
+            self.caida_suave = False
+
+    def _emitir_gestos(self, dir_mov: int, rotar: bool, caida_dura: bool) -> None:
+        if dir_mov:
+            self.telemetria.emitir('gesto', gesto='izquierda' if dir_mov < 0 else 'derecha')
+        if rotar:
+            self.telemetria.emitir('gesto', gesto='rotar')
+        if caida_dura:
+            self.telemetria.emitir('gesto', gesto='caida_dura')
+
+    def consultar(self) -> Tuple[int, bool, bool, bool]:
+        """Retorna (dir_mov, caida_suave, borde_rotar, borde_caida_dura)."""
+        self._recibir()
+        dm, brh, bcd = self.dir_mov, self.borde_rotar_hor, self.borde_caida_dura
+        self.dir_mov = 0
+        self.borde_rotar_hor = False
+        self.borde_caida_dura = False
+        return dm, self.caida_suave, brh, bcd
@@ -0,0 +1,147 @@
+# puntuaciones.py
+# =============================================================================
+#                        TABLA DE PUNTUACIONES
+# =============================================================================
+# Cada partida terminada se guarda en una base SQLite local. Las escrituras
+# las hace un hilo propio (el bucle del juego solo encola), y las consultas
+# usan índices sobre el puntaje, así el top N y el mejor de cada jugador no
+# dependen de cuántas partidas se hayan jugado.
+#
+#   python src/puntuaciones.py [ruta.db]   → imprime el top 10
+
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+TOP_POR_DEFECTO = 10
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS partidas (
+    id INTEGER PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    puntaje INTEGER NOT NULL,
+    lineas INTEGER NOT NULL,
+    nivel INTEGER NOT NULL,
+    fecha REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_partidas_puntaje ON partidas (puntaje DESC);
+CREATE INDEX IF NOT EXISTS idx_partidas_nombre ON partidas (nombre, puntaje DESC);
+"""
+
+_FIN = object()  # Marca de cierre para el hilo escritor
+
+
+def _abrir(ruta):
+    conexion = sqlite3.connect(ruta, timeout=5.0)
+    # WAL: las lecturas del juego no esperan a la escritura en curso
+    conexion.execute("PRAGMA journal_mode=WAL")
+    conexion.executescript(_ESQUEMA)
+    return conexion
+
+
+class TablaPuntuaciones:
+    """Partidas guardadas en SQLite con un hilo escritor y lecturas indexadas."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._cola = queue.Queue()
+        self._hilo = None
+        self._lectura = threading.local()  # Una conexión de lectura por hilo
+
+    def iniciar(self):
+        directorio = os.path.dirname(os.path.abspath(self.ruta))
+        os.makedirs(directorio, exist_ok=True)
+        self._hilo = threading.Thread(target=self._escritor, daemon=True)
+        self._hilo.start()
+        return self
+
+    # ----- Escritura (hilo propio) -----
+    def registrar(self, nombre, puntaje, lineas, nivel):
+        """Encola la partida y retorna enseguida. El Event se activa cuando quedó guardada."""
+        hecho = threading.Event()
+        self._cola.put(((nombre, int(puntaje), int(lineas), int(nivel), time.time()), hecho))
+        return hecho
+
+    def _escritor(self):
+        try:
+            conexion = _abrir(self.ruta)
+        except sqlite3.Error as e:
+            print(f"[ERROR] No se pudo abrir la tabla de puntuaciones: {e}")
+            conexion = None
+        while True:
+            item = self._cola.get()
+            if item is _FIN:
+                break
+            # Se agrupan las partidas que ya estén esperando en una transacción
+            lote = [item]
+            while True:
+                try:
+                    siguiente = self._cola.get_nowait()
+                except queue.Empty:
+                    break
+                if siguiente is _FIN:
+                    self._cola.put(_FIN)
+                    break
+                lote.append(siguiente)
+            if conexion is not None:
+                try:
+                    with conexion:
+                        conexion.executemany(
+                            "INSERT INTO partidas (nombre, puntaje, lineas, nivel, fecha)"
+                            " VALUES (?, ?, ?, ?, ?)", [fila for fila, _ in lote])
+                except sqlite3.Error as e:
+                    print(f"[ERROR] No se pudo guardar la puntuación: {e}")
+            for _, hecho in lote:
+                hecho.set()
+        if conexion is not None:
+            conexion.close()
+
+    def cerrar(self, timeout=2.0):
+        """Termina de escribir lo pendiente y detiene el hilo."""
+        if self._hilo is not None:
+            self._cola.put(_FIN)
+            self._hilo.join(timeout)
+            self._hilo = None
+
+    # ----- Lectura -----
+    def _conexion(self):
+        conexion = getattr(self._lectura, 'conexion', None)
+        if conexion is None:
+            conexion = self._lectura.conexion = _abrir(self.ruta)
+        return conexion
+
+    def mejores(self, n=TOP_POR_DEFECTO):
+        """Top n como tuplas (nombre, puntaje, lineas, nivel), de mayor a menor."""
+        try:
+            return self._conexion().execute(
+                "SELECT nombre, puntaje, lineas, nivel FROM partidas"
+                " ORDER BY puntaje DESC LIMIT ?", (n,)).fetchall()
+        except sqlite3.Error as e:
+            print(f"[ERROR] No se pudo leer la tabla de puntuaciones: {e}")
+            return []
+
+    def mejor_de(self, nombre):
+        """Mejor puntaje del jugador, o None si no tiene partidas."""
+        try:
+            fila = self._conexion().execute(
+                "SELECT puntaje FROM partidas WHERE nombre = ?"
+                " ORDER BY puntaje DESC LIMIT 1", (nombre,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"[ERROR] No se pudo leer la tabla de puntuaciones: {e}")
+            return None
+        return fila[0] if fila else None
+
+
+def main():
+    ruta = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "puntuaciones.db")
+    tabla = TablaPuntuaciones(ruta)
+    for i, (nombre, puntaje, lineas, nivel) in enumerate(tabla.mejores(), 1):
+        print(f"{i:>2}. {nombre:<12} {puntaje:>8}  lín {lineas:>4}  niv {nivel:>2}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# rendimiento_render.py
+# =============================================================================
+#                  MEDICIÓN DEL RENDER SIN VENTANA
+# =============================================================================
+# Dibuja frames completos con RenderizadorTetris sobre el driver de video
+# 'dummy' de SDL y mide cada llamada: tablero, fantasma, pieza, HUD, paneles,
+# cámara y flip. Los tableros son sintéticos (vacío, a medias, casi al tope)
+# o salen de una repetición grabada; la cámara recibe un cuadro NumPy y
+# landmarks de dos manos, como en modo 'landmarks'.
+#
+#   python src/rendimiento_render.py [--frames N] [--tablero COLxFIL] [--repeticion ruta.ttr]
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import random
+import sys
+import time
+
+import numpy as np
+import pygame
+
+import cascara_tetris
+from cascara_tetris import CAMARA_ALTO, CAMARA_ANCHO, RenderizadorTetris, crear_ventana, dimensiones_tablero
+from core_tetris import Motor, TETROMINOS
+from repeticion import RegistroPartida, aplicar_entrada
+
+FRAMES_POR_DEFECTO = 300
+CAMBIO_HUD_CADA = 30  # Frames entre cambios de estadísticas (el HUD se vuelve a componer)
+LLAMADAS = ('tablero', 'fantasma', 'pieza', 'hud', 'paneles', 'camara', 'flip')
+
+
+# ----- Estados a dibujar -----
+def _llenar(motor, altura, rng):
+    """Llena las `altura` filas de abajo con bloques, un hueco por fila (no se completan líneas)."""
+    tipos = list(TETROMINOS)
+    for y in range(motor.filas - altura, motor.filas):
+        hueco = rng.randrange(motor.columnas)
+        motor.tablero[y] = [None if x == hueco else rng.choice(tipos) for x in range(motor.columnas)]
+    motor.version_tablero += 1
+
+
+def tableros_sinteticos(columnas, filas, semilla=0):
+    """{nombre: estado} con el tablero vacío, a medias y a tres filas del tope."""
+    rng = random.Random(semilla)
+    estados = {}
+    for nombre, altura in (('vacio', 0), ('medio', filas // 2), ('casi_tope', filas - 3)):
+        motor = Motor(columnas, filas, semilla=semilla)
+        _llenar(motor, altura, rng)
+        estados[nombre] = motor.obtener_estado()
+    return estados
+
+
+def estados_de_repeticion(registro, muestras=3):
+    """{nombre: estado} tomados a intervalos parejos de una partida grabada."""
+    motor = Motor(registro.columnas, registro.filas, semilla=registro.semilla)
+    eventos = list(registro.eventos())
+    ultimo = eventos[-1][0] if eventos else 0
+    cortes = [ultimo * (i + 1) // muestras for i in range(muestras)]
+    estados = {}
+
+    def tomar(i):
+        estado = motor.obtener_estado()
+        estado['tablero'] = [fila[:] for fila in estado['tablero']]
+        estados[f"repeticion_{i + 1}"] = estado
+
+    i = 0
+    for tick, accion, valor in eventos:
+        while motor.ticks < tick and not motor.game_over:
+            motor.tick()
+            while i < len(cortes) and motor.ticks >= cortes[i]:
+                tomar(i)
+                i += 1
+        aplicar_entrada(motor, accion, valor)
+    while i < len(cortes):
+        tomar(i)
+        i += 1
+    return estados
+
+
+def cuadro_sintetico():
+    """Cuadro BGR de ruido. Sin OpenCV se usa el tamaño del panel (el juego necesita cv2 para escalar)."""
+    try:
+        import cv2  # noqa: F401
+        alto, ancho = 480, 640
+    except ImportError:
+        alto, ancho = CAMARA_ALTO, CAMARA_ANCHO
+    return np.random.default_rng(0).integers(0, 256, (alto, ancho, 3), dtype=np.uint8)
+
+
+def landmarks_sinteticos():
+    """Dos manos de 21 puntos normalizados."""
+    rng = random.Random(1)
+    return tuple(tuple((centro + rng.uniform(-0.1, 0.1), 0.5 + rng.uniform(-0.2, 0.2))
+                       for _ in range(21))
+                 for centro in (0.3, 0.7))
+
+
+# ----- Medición -----
+def medir(render, estado, frames, cuadro=None, landmarks=None):
+    """Dibuja `frames` frames del estado. Retorna {llamada: [segundos, ...]} más 'frame'."""
+    tiempos = {nombre: [] for nombre in LLAMADAS + ('frame',)}
+    reloj = time.perf_counter
+    version = estado.get('version_estadisticas') or 0
+    for n in range(frames):
+        # Las estadísticas cambian cada tanto, como al fijar piezas
+        estado['version_estadisticas'] = version + n // CAMBIO_HUD_CADA
+        pygame.event.pump()
+        inicio = t0 = reloj()
+        render.dibujar_tablero(estado['tablero'], filas_ocupadas=estado['filas_ocupadas'])
+        t1 = reloj(); tiempos['tablero'].append(t1 - t0); t0 = t1
+        render.dibujar_fantasma(estado['pieza_actual'], estado['fila_fantasma'])
+        t1 = reloj(); tiempos['fantasma'].append(t1 - t0); t0 = t1
+        render.dibujar_pieza(estado['pieza_actual'])
+        t1 = reloj(); tiempos['pieza'].append(t1 - t0); t0 = t1
+        render.dibujar_hud(estado, cuadro is not None)
+        t1 = reloj(); tiempos['hud'].append(t1 - t0); t0 = t1
+        render.dibujar_paneles(estado['vista_previa'], estado['pieza_guardada'], estado['hold_usado'])
+        t1 = reloj(); tiempos['paneles'].append(t1 - t0); t0 = t1
+        render.dibujar_camara(cuadro, landmarks)
+        t1 = reloj(); tiempos['camara'].append(t1 - t0); t0 = t1
+        pygame.display.flip()
+        t1 = reloj(); tiempos['flip'].append(t1 - t0)
+        tiempos['frame'].append(t1 - inicio)
+    return tiempos
+
+
+def resumen(tiempos):
+    """{llamada: (media_ms, p95_ms)} y los FPS que permite el frame completo."""
+    filas = {}
+    for nombre, valores in tiempos.items():
+        ordenados = sorted(valores)
+        p95 = ordenados[min(len(ordenados) - 1, int(0.95 * len(ordenados)))]
+        filas[nombre] = (sum(valores) / len(valores) * 1000, p95 * 1000)
+    fps = len(tiempos['frame']) / max(sum(tiempos['frame']), 1e-9)
+    return filas, fps
+
+
+def imprimir(resultados):
+    print(f"{'escenario':<14} {'FPS':>8}  " + "  ".join(f"{n:>13}" for n in LLAMADAS))
+    print(f"{'':<14} {'':>8}  " + "  ".join(f"{'media/p95 ms':>13}" for _ in LLAMADAS))
+    for nombre, (filas, fps) in resultados.items():
+        celdas = "  ".join(f"{filas[n][0]:>6.3f}/{filas[n][1]:<6.3f}" for n in LLAMADAS)
+        print(f"{nombre:<14} {fps:>8.0f}  {celdas}")
+
+
+def main(argumentos):
+    frames = FRAMES_POR_DEFECTO
+    if "--frames" in argumentos:
+        try:
+            frames = max(1, int(argumentos[argumentos.index("--frames") + 1]))
+        except (IndexError, ValueError):
+            print(f"[AVISO] --frames espera un número; se usan {frames}")
+    if "--repeticion" in argumentos:
+        # La repetición fija las dimensiones del tablero
+        registro = RegistroPartida.cargar(argumentos[argumentos.index("--repeticion") + 1])
+        columnas, filas = registro.columnas, registro.filas
+        estados = estados_de_repeticion(registro)
+    else:
+        columnas, filas = dimensiones_tablero(argumentos)
+        estados = tableros_sinteticos(columnas, filas)
+
+    pygame.init()
+    render = RenderizadorTetris(crear_ventana(), columnas, filas)
+
+    cuadro, landmarks = cuadro_sintetico(), landmarks_sinteticos()
+    print(f"Driver {pygame.display.get_driver()}, {frames} frames por escenario, "
+          f"tablero {render.columnas}x{render.filas}, cuadro de cámara {cuadro.shape[1]}x{cuadro.shape[0]}")
+    resultados = {}
+    for nombre, estado in estados.items():
+        medir(render, estado, min(frames, 10), cuadro, landmarks)  # Calienta cachés y sprites
+        resultados[nombre] = resumen(medir(render, estado, frames, cuadro, landmarks))
+    resultados['sin_camara'] = resumen(medir(render, estados[next(iter(estados))], frames))
+    imprimir(resultados)
+    pygame.quit()
+    return resultados
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,181 @@
+# repeticion.py
+# =============================================================================
+#                 GRABACIÓN Y REPRODUCCIÓN DE PARTIDAS
+# =============================================================================
+# Una partida queda determinada por la semilla del Motor y la secuencia de
+# entradas del jugador, cada una con el número de ticks del Motor ya
+# transcurridos cuando llegó. Este módulo guarda esa secuencia en un formato
+# binario compacto y la reproduce sin pygame, mucho más rápido que el
+# tiempo real.
+#
+# Formato v3 (little endian):
+#   cabecera  '<4sBQHHI'  magia b"TTRP", versión (3), semilla, columnas, filas, n_eventos
+#   eventos   '<HB'       delta de ticks del Motor respecto al evento anterior, código
+#   cierre    '<qII'      puntaje (-1 si la partida no se cerró), líneas y nivel finales
+#
+# Códigos de evento (ver CODIGOS): 0-1 mover, 2-3 rotar, 4 caída dura,
+# 5-7 lado mantenido (-1, 0, 1), 8-9 caída suave soltada/mantenida,
+# 10 fin (ticks totales de la partida), 11 hold y 0xFF relleno para deltas
+# que no caben en 16 bits. El Motor pone la gravedad, el DAS y el lock delay.
+#
+# La versión sube cuando cambian las reglas aunque no cambien los bytes: la
+# 2 pasó de movimientos sueltos a entradas del Motor y la 3 agregó las
+# patadas SRS al rotar. Las repeticiones de otra versión se rechazan.
+
+import struct
+import sys
+import time
+
+from core_tetris import Motor
+
+MAGIA = b"TTRP"
+VERSION = 3  # Sube cuando cambian las reglas del motor (las repeticiones viejas no reproducen igual)
+
+_CABECERA = struct.Struct('<4sBQHHI')
+_EVENTO = struct.Struct('<HB')
+_CIERRE = struct.Struct('<qII')
+
+# Entradas del Motor -> código de 1 byte
+CODIGOS = {
+    ('mover', -1): 0,
+    ('mover', 1): 1,
+    ('rotar', 1): 2,
+    ('rotar', -1): 3,
+    ('caida_dura', 0): 4,
+    ('horizontal', -1): 5,
+    ('horizontal', 0): 6,
+    ('horizontal', 1): 7,
+    ('caida_suave', 0): 8,
+    ('caida_suave', 1): 9,
+    ('fin', 0): 10,  # Ticks totales de la partida
+    ('hold', 0): 11,
+}
+ACCIONES = {codigo: accion for accion, codigo in CODIGOS.items()}
+
+# Evento de relleno para deltas de tick que no caben en 16 bits
+CODIGO_ESPERA = 0xFF
+_DELTA_MAX = 0xFFFF
+
+TICKS_POR_SEGUNDO = 60
+
+
+class RegistroPartida:
+    """Semilla, dimensiones y entradas de una partida, codificadas al vuelo."""
+
+    def __init__(self, semilla, columnas=10, filas=20):
+        self.semilla = semilla
+        self.columnas = columnas
+        self.filas = filas
+        self.n_eventos = 0
+        self.ultimo_tick = 0
+        self.final = None  # (puntaje, lineas, nivel) al terminar
+        self._datos = bytearray()
+
+    def registrar(self, tick, accion, valor=0):
+        """Agrega una entrada que llegó al Motor tras `tick` ticks."""
+        codigo = CODIGOS[(accion, valor)]
+        delta = tick - self.ultimo_tick
+        while delta > _DELTA_MAX:
+            self._datos += _EVENTO.pack(_DELTA_MAX, CODIGO_ESPERA)
+            self.n_eventos += 1
+            delta -= _DELTA_MAX
+        self._datos += _EVENTO.pack(delta, codigo)
+        self.n_eventos += 1
+        self.ultimo_tick = tick
+
+    def finalizar(self, motor):
+        """Anota la duración y el resultado final para poder verificar la reproducción."""
+        self.registrar(max(motor.ticks, self.ultimo_tick), 'fin')
+        self.final = (motor.puntaje, motor.lineas_totales, motor.nivel)
+
+    def eventos(self):
+        """Itera (tick, accion, valor) en orden."""
+        tick = 0
+        for delta, codigo in _EVENTO.iter_unpack(bytes(self._datos)):
+            tick += delta
+            if codigo == CODIGO_ESPERA:
+                continue
+            accion, valor = ACCIONES[codigo]
+            yield tick, accion, valor
+
+    # ----- Serialización -----
+    def a_bytes(self):
+        cabecera = _CABECERA.pack(MAGIA, VERSION, self.semilla, self.columnas,
+                                  self.filas, self.n_eventos)
+        puntaje, lineas, nivel = self.final if self.final else (-1, 0, 0)
+        return cabecera + bytes(self._datos) + _CIERRE.pack(puntaje, lineas, nivel)
+
+    @classmethod
+    def desde_bytes(cls, datos):
+        magia, version, semilla, columnas, filas, n_eventos = _CABECERA.unpack_from(datos, 0)
+        if magia != MAGIA or version != VERSION:
+            raise ValueError("Archivo de repetición no válido")
+
+        registro = cls(semilla, columnas, filas)
+        inicio = _CABECERA.size
+        fin = inicio + n_eventos * _EVENTO.size
+        if len(datos) != fin + _CIERRE.size:
+            raise ValueError("Archivo de repetición truncado")
+        registro._datos = bytearray(datos[inicio:fin])
+        registro.n_eventos = n_eventos
+        registro.ultimo_tick = sum(delta for delta, _ in _EVENTO.iter_unpack(registro._datos))
+
+        puntaje, lineas, nivel = _CIERRE.unpack_from(datos, fin)
+        if puntaje >= 0:
+            registro.final = (puntaje, lineas, nivel)
+        return registro
+
+    def guardar(self, ruta):
+        with open(ruta, 'wb') as f:
+            f.write(self.a_bytes())
+
+    @classmethod
+    def cargar(cls, ruta):
+        with open(ruta, 'rb') as f:
+            return cls.desde_bytes(f.read())
+
+
+# ============================================================
+#                      REPRODUCCIÓN
+# ============================================================
+def aplicar_entrada(motor, accion, valor=0):
+    """Aplica una entrada grabada usando los métodos públicos del Motor."""
+    if accion == 'horizontal':
+        motor.establecer_horizontal(valor)
+    elif accion == 'caida_suave':
+        motor.establecer_caida_suave(valor)
+    elif accion in ('mover', 'rotar', 'caida_dura', 'hold'):
+        motor.encolar(accion, valor)
+
+
+def reproducir(registro):
+    """Reconstruye la partida sin render. Retorna el Motor final."""
+    motor = Motor(registro.columnas, registro.filas, semilla=registro.semilla)
+    for tick, accion, valor in registro.eventos():
+        while motor.ticks < tick and not motor.game_over:
+            motor.tick()
+        aplicar_entrada(motor, accion, valor)
+    return motor
+
+
+def verificar(registro):
+    """True si la reproducción llega al mismo resultado que la partida original."""
+    if registro.final is None:
+        return False
+    motor = reproducir(registro)
+    return (motor.puntaje, motor.lineas_totales, motor.nivel) == registro.final
+
+
+if __name__ == "__main__":
+    for ruta in sys.argv[1:]:
+        registro = RegistroPartida.cargar(ruta)
+        inicio = time.perf_counter()
+        motor = reproducir(registro)
+        duracion = time.perf_counter() - inicio
+
+        segundos_juego = registro.ultimo_tick / TICKS_POR_SEGUNDO
+        ok = (motor.puntaje, motor.lineas_totales, motor.nivel) == registro.final
+        print(f"{ruta}: {registro.n_eventos} eventos, {segundos_juego:.0f} s de juego "
+              f"reproducidos en {duracion * 1000:.1f} ms "
+              f"(x{segundos_juego / max(duracion, 1e-9):.0f}) | "
+              f"puntaje {motor.puntaje} {'OK' if ok else 'DIFERENTE de ' + str(registro.final)}")
@@ -0,0 +1,168 @@
+# telemetria.py
+# =============================================================================
+#                     TELEMETRÍA (EVENTOS ESTRUCTURADOS)
+# =============================================================================
+# El juego y el controlador de manos emiten eventos pequeños (pieza fijada,
+# líneas, gestos, tiempos de frame, FPS de cámara) a una cola acotada. Un
+# hilo los escribe por lotes en archivos JSONL que rotan por tamaño. Si la
+# cola está llena el evento se descarta: emitir nunca bloquea el bucle.
+#
+# Cada línea es un objeto JSON con al menos "t" (epoch) y "tipo".
+
+import json
+import os
+import queue
+import threading
+import time
+
+CAPACIDAD_COLA = 10000
+TAMANO_LOTE = 500
+INTERVALO_ESCRITURA_S = 1.0
+MAX_BYTES_ARCHIVO = 5 * 1024 * 1024
+MAX_ARCHIVOS = 10
+NOMBRE_ARCHIVO = "telemetria.jsonl"
+
+_FIN = object()
+
+
+class Telemetria:
+    """Cola acotada de eventos y un hilo escritor con rotación de archivos."""
+
+    def __init__(self, directorio, capacidad=CAPACIDAD_COLA, tamano_lote=TAMANO_LOTE,
+                 intervalo_s=INTERVALO_ESCRITURA_S, max_bytes=MAX_BYTES_ARCHIVO,
+                 max_archivos=MAX_ARCHIVOS):
+        self.directorio = directorio
+        self.ruta = os.path.join(directorio, NOMBRE_ARCHIVO)
+        self.tamano_lote = tamano_lote
+        self.intervalo_s = intervalo_s
+        self.max_bytes = max_bytes
+        self.max_archivos = max_archivos
+        # Lo suman el hilo del juego y el de la cámara; el escritor lo lee
+        self.descartados = 0
+        self._descartados_escritos = 0
+        self._lock_descartados = threading.Lock()
+        self._cola = queue.Queue(maxsize=capacidad)
+        self._hilo = None
+
+    def iniciar(self):
+        self._hilo = threading.Thread(target=self._escritor, daemon=True)
+        self._hilo.start()
+        return self
+
+    def emitir(self, tipo, **datos):
+        """Encola un evento. Nunca bloquea: con la cola llena el evento se pierde."""
+        datos['t'] = time.time()
+        datos['tipo'] = tipo
+        try:
+            self._cola.put_nowait(datos)
+        except queue.Full:
+            with self._lock_descartados:
+                self.descartados += 1
+
+    def al_evento_motor(self, evento, datos):
+        """Para Motor.suscribir: cada notificación del motor se vuelve un evento."""
+        if evento == 'pieza_fijada':
+            self.emitir(evento, pieza=datos)
+        elif evento == 'lineas_limpiadas':
+            self.emitir(evento, cantidad=len(datos), filas=list(datos))
+        elif evento == 'subida_nivel':
+            self.emitir(evento, nivel=datos)
+        else:
+            self.emitir(evento)
+
+    def cerrar(self, timeout=2.0):
+        """Escribe lo pendiente y detiene el hilo."""
+        if self._hilo is None:
+            return
+        while True:
+            try:
+                self._cola.put(_FIN, timeout=0.1)
+                break
+            except queue.Full:
+                if not self._hilo.is_alive():
+                    break
+        self._hilo.join(timeout)
+        self._hilo = None
+
+    # ----- Hilo escritor -----
+    def _escritor(self):
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+        except OSError as e:
+            print(f"[ERROR] Telemetría desactivada: {e}")
+            return
+        terminar = False
+        while not terminar:
+            lote = []
+            limite = time.monotonic() + self.intervalo_s
+            while len(lote) < self.tamano_lote:
+                try:
+                    evento = self._cola.get(timeout=max(0.0, limite - time.monotonic()))
+                except queue.Empty:
+                    break
+                if evento is _FIN:
+                    terminar = True
+                    break
+                lote.append(evento)
+            with self._lock_descartados:
+                nuevos = self.descartados - self._descartados_escritos
+                self._descartados_escritos = self.descartados
+            if nuevos:
+                lote.append({'t': time.time(), 'tipo': 'descartados', 'cantidad': nuevos})
+            if lote:
+                self._escribir(lote)
+
+    def _escribir(self, lote):
+        texto = "".join(json.dumps(evento, ensure_ascii=False, separators=(',', ':')) + "\n"
+                        for evento in lote)
+        try:
+            if os.path.exists(self.ruta) and os.path.getsize(self.ruta) + len(texto) > self.max_bytes:
+                self._rotar()
+            with open(self.ruta, 'a', encoding='utf-8') as f:
+                f.write(texto)
+        except OSError as e:
+            print(f"[ERROR] No se pudo escribir la telemetría: {e}")
+
+    def _rotar(self):
+        """telemetria.jsonl -> .1.jsonl -> .2.jsonl ...; el más viejo se borra."""
+        base, extension = os.path.splitext(self.ruta)
+        viejo = f"{base}.{self.max_archivos - 1}{extension}"
+        if os.path.exists(viejo):
+            os.remove(viejo)
+        for i in range(self.max_archivos - 2, 0, -1):
+            origen = f"{base}.{i}{extension}"
+            if os.path.exists(origen):
+                os.replace(origen, f"{base}.{i + 1}{extension}")
+        os.replace(self.ruta, f"{base}.1{extension}")
+
+
+class MuestreoFrames:
+    """Acumula tiempos de frame y emite un resumen por intervalo (no un evento por frame)."""
+
+    def __init__(self, telemetria, intervalo_s=5.0, reloj=time.perf_counter):
+        self.telemetria = telemetria
+        self.intervalo_s = intervalo_s
+        self._reloj = reloj
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descarta el intervalo en curso (p. ej. tras una pausa, para no medirla como un frame)."""
+        self._inicio = self._previo = self._reloj()
+        self._n = 0
+        self._suma = 0.0
+        self._maximo = 0.0
+
+    def frame(self):
+        ahora = self._reloj()
+        dt = ahora - self._previo
+        self._previo = ahora
+        self._n += 1
+        self._suma += dt
+        self._maximo = max(self._maximo, dt)
+        if ahora - self._inicio >= self.intervalo_s:
+            self.telemetria.emitir('frames', n=self._n, medio_ms=round(self._suma / self._n * 1000, 2),
+                                   max_ms=round(self._maximo * 1000, 2))
+            self._inicio = ahora
+            self._n = 0
+            self._suma = 0.0
+            self._maximo = 0.0
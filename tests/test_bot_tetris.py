@@ -0,0 +1,58 @@
+import sys
+
+# Usar el motor real aunque otro módulo de tests lo haya sustituido por un mock
+import src.core_tetris as core_tetris
+sys.modules['core_tetris'] = core_tetris
+import src.caracteristicas_tablero as caracteristicas_tablero
+sys.modules['caracteristicas_tablero'] = caracteristicas_tablero
+
+from src.bot_tetris import mejor_jugada, evaluar_tablero, BotTetris
+
+
+def tablero_vacio():
+    return [[None] * 10 for _ in range(20)]
+
+
+def test_mejor_jugada_completa_linea():
+    tablero = tablero_vacio()
+    for x in range(10):
+        if x not in (4, 5, 6, 7):
+            tablero[19][x] = "J"
+    # La I horizontal en la fila 19, columnas 4..7, completa la línea
+    rot, x = mejor_jugada(tablero, "I")
+    assert rot in (0, 2)
+    assert (x, rot) in ((4, 0), (4, 2))
+
+
+def test_evaluar_penaliza_huecos():
+    sin_hueco = tablero_vacio()
+    con_hueco = tablero_vacio()
+    sin_hueco[19][0] = "T"
+    sin_hueco[18][0] = "T"
+    con_hueco[18][0] = "T"
+    assert evaluar_tablero(sin_hueco, 0) > evaluar_tablero(con_hueco, 0)
+
+
+def test_bot_juega_partida():
+    """The bot keeps a game alive and clears lines through the public Motor API."""
+    motor = core_tetris.Motor(semilla=3)
+    bot = BotTetris()
+    try:
+        for _ in range(4000):
+            if motor.game_over:
+                break
+            accion = bot.siguiente_accion(motor)
+            if bot._futuro is not None:
+                bot._futuro.result()  # En el test se espera al plan para ser determinista
+            if accion is None:
+                continue
+            nombre, valor = accion
+            if nombre == 'mover':
+                motor.mover(valor, 0)
+            elif nombre == 'rotar':
+                motor.rotar(valor)
+            else:
+                motor.caida_dura()
+    finally:
+        bot.detener()
+    assert motor.lineas_totales >= 10
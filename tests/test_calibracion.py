@@ -0,0 +1,95 @@
+import os
+import random
+import tempfile
+import unittest
+
+from src.calibracion import (
+    MIN_MUESTRAS, POSES, TIEMPOS_CORTOS, SesionCalibracion, ajustar_umbrales,
+    cargar_perfil, distancias_dedos, guardar_perfil,
+)
+
+
+def mano(largo_dedo, pulgar_vy, rng):
+    """21 puntos (x, y): los dedos miden largo_dedo desde el nudillo y el pulgar baja pulgar_vy."""
+    puntos = [(0.5, 0.8)] * 21
+    for i, (punta, mcp) in enumerate(((8, 5), (12, 9), (16, 13), (20, 17))):
+        x = 0.4 + 0.05 * i
+        largo = largo_dedo * rng.uniform(0.9, 1.1)
+        puntos[mcp] = (x, 0.6)
+        puntos[punta] = (x, 0.6 - largo)
+    puntos[2] = (0.3, 0.6)
+    puntos[4] = (0.3, 0.6 + pulgar_vy * rng.uniform(0.9, 1.1))
+    return tuple(puntos)
+
+
+def muestras_de_jugador(largo_extendido, largo_doblado, pulgar, rng):
+    return {
+        'abierta': [mano(largo_extendido, 0.0, rng) for _ in range(MIN_MUESTRAS)],
+        'puno': [mano(largo_doblado, 0.0, rng) for _ in range(MIN_MUESTRAS)],
+        'pulgar_arriba': [mano(largo_doblado, -pulgar, rng) for _ in range(MIN_MUESTRAS)],
+        'pulgar_abajo': [mano(largo_doblado, pulgar, rng) for _ in range(MIN_MUESTRAS)],
+    }
+
+
+class TestAjustarUmbrales(unittest.TestCase):
+    def test_umbral_entre_dedo_extendido_y_doblado(self):
+        rng = random.Random(1)
+        # Mano chica o lejos de la cámara: con el 0.18 por defecto ningún dedo contaría como extendido
+        perfil = ajustar_umbrales(muestras_de_jugador(0.12, 0.04, 0.08, rng))
+        self.assertLess(0.06, perfil['dist_min_dedo'])
+        self.assertLess(perfil['dist_min_dedo'], 0.11)
+        self.assertLess(perfil['umbral_dir_pulgar'], 0.08)
+        # Poses bien separadas: tiempos de anti-rebote más cortos
+        for nombre, valor in TIEMPOS_CORTOS.items():
+            self.assertEqual(perfil[nombre], valor)
+
+    def test_poses_confundidas_o_incompletas(self):
+        rng = random.Random(2)
+        self.assertIsNone(ajustar_umbrales(muestras_de_jugador(0.10, 0.10, 0.08, rng)))
+        muestras = muestras_de_jugador(0.12, 0.04, 0.08, rng)
+        muestras['puno'] = muestras['puno'][:3]
+        self.assertIsNone(ajustar_umbrales(muestras))
+
+    def test_distancias_dedos(self):
+        d = distancias_dedos(mano(0.1, 0.0, random.Random(0)))
+        self.assertEqual(len(d), 4)
+        self.assertTrue(all(0.08 < v < 0.12 for v in d))
+
+
+class TestSesionCalibracion(unittest.TestCase):
+    def test_graba_cada_pose_en_su_ventana(self):
+        ahora = [0.0]
+        sesion = SesionCalibracion(preparacion_s=1.0, segundos_por_pose=2.0, reloj=lambda: ahora[0])
+        rng = random.Random(3)
+        # Durante la preparación no se graba
+        sesion.agregar((mano(0.1, 0.0, rng),))
+        self.assertFalse(sesion.grabando)
+        ahora[0] = 1.5
+        landmarks = (mano(0.1, 0.0, rng),)
+        sesion.agregar(landmarks)
+        sesion.agregar(landmarks)  # Mismo cuadro: se ignora
+        ahora[0] = 4.5
+        sesion.agregar((mano(0.03, 0.0, rng), mano(0.03, 0.0, rng)))
+        self.assertEqual(sesion.instruccion, POSES[1][1])
+        self.assertEqual(len(sesion.muestras['abierta']), 1)
+        self.assertEqual(len(sesion.muestras['puno']), 2)
+        ahora[0] = 3.0 * len(POSES)
+        self.assertTrue(sesion.terminada)
+        self.assertEqual(sesion.progreso, 1.0)
+
+
+class TestPerfiles(unittest.TestCase):
+    def test_guardar_y_cargar_por_jugador(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "perfiles.json")
+            self.assertIsNone(cargar_perfil(ruta, "ana"))
+            self.assertTrue(guardar_perfil(ruta, "ana", {'dist_min_dedo': 0.1}))
+            self.assertTrue(guardar_perfil(ruta, "beto", {'dist_min_dedo': 0.2}))
+            self.assertEqual(cargar_perfil(ruta, "ana"), {'dist_min_dedo': 0.1})
+            self.assertEqual(cargar_perfil(ruta, "beto"), {'dist_min_dedo': 0.2})
+            with open(ruta, 'w') as f:
+                f.write("{roto")
+            self.assertIsNone(cargar_perfil(ruta, "ana"))
+
+if __name__ == '__main__':
+    unittest.main()
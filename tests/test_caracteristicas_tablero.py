@@ -0,0 +1,81 @@
+import random
+
+import numpy as np
+
+from src.caracteristicas_tablero import (
+    caracteristicas, desde_bitboard, tablero_a_array, alturas_columnas, pozos,
+)
+
+
+def referencia(tablero):
+    """Cálculo celda por celda, para comparar con la versión vectorizada."""
+    filas, columnas = len(tablero), len(tablero[0])
+    alturas, huecos = [], 0
+    for x in range(columnas):
+        altura = 0
+        for y in range(filas):
+            if tablero[y][x]:
+                altura = altura or filas - y
+            elif altura:
+                huecos += 1
+        alturas.append(altura)
+    pozos_total = 0
+    for x in range(columnas):
+        izq = alturas[x - 1] if x > 0 else float('inf')
+        der = alturas[x + 1] if x < columnas - 1 else float('inf')
+        pozos_total += max(0, min(izq, der) - alturas[x])
+    trans_filas = 0
+    for fila in tablero:
+        celdas = [1] + [int(bool(c)) for c in fila] + [1]
+        trans_filas += sum(a != b for a, b in zip(celdas, celdas[1:]))
+    trans_columnas = 0
+    for x in range(columnas):
+        celdas = [int(bool(tablero[y][x])) for y in range(filas)] + [1]
+        trans_columnas += sum(a != b for a, b in zip(celdas, celdas[1:]))
+    return {
+        'altura_agregada': sum(alturas),
+        'huecos': huecos,
+        'pozos': pozos_total,
+        'irregularidad': sum(abs(a - b) for a, b in zip(alturas, alturas[1:])),
+        'transiciones_filas': trans_filas,
+        'transiciones_columnas': trans_columnas,
+    }
+
+
+def tablero_aleatorio(rng, filas=20, columnas=10):
+    return [[rng.random() < y / filas * 0.8 for _ in range(columnas)] for y in range(filas)]
+
+
+def test_coincide_con_la_referencia():
+    rng = random.Random(7)
+    for _ in range(20):
+        tablero = tablero_aleatorio(rng)
+        carac = caracteristicas(np.array(tablero, dtype=np.uint8))
+        for nombre, valor in referencia(tablero).items():
+            assert carac[nombre] == valor, nombre
+
+
+def test_lote_igual_a_uno_por_uno():
+    rng = random.Random(3)
+    tableros = [tablero_aleatorio(rng, 40, 16) for _ in range(8)]
+    lote = caracteristicas(np.array(tableros, dtype=np.uint8))
+    assert lote['huecos'].shape == (8,)
+    assert lote['alturas'].shape == (8, 16)
+    for i, tablero in enumerate(tableros):
+        uno = caracteristicas(np.array(tablero, dtype=np.uint8))
+        for nombre in uno:
+            assert np.array_equal(lote[nombre][i], uno[nombre]), nombre
+
+
+def test_tablero_del_motor_y_bitboard():
+    tablero = [[None] * 4 for _ in range(3)]
+    tablero[2] = ["I", None, "G", "G"]
+    tablero[1][0] = "T"
+    arr = tablero_a_array(tablero)
+    assert arr.dtype == np.uint8
+    assert arr.tolist() == [[0, 0, 0, 0], [1, 0, 0, 0], [1, 0, 1, 1]]
+    # Fila como entero: bit i = columna i
+    assert np.array_equal(desde_bitboard([0, 0b0001, 0b1101], 4), arr)
+    assert alturas_columnas(arr).tolist() == [2, 0, 1, 1]
+    # La columna 1 es un pozo de 1 entre alturas 2 y 1
+    assert pozos(alturas_columnas(arr)) == 1
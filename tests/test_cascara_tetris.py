@@ -1,71 +1,120 @@
 import unittest
-from unittest.mock import MagicMock, patch, mock_open
+from unittest.mock import MagicMock, patch
 import sys
 import os
 
-# Mock dependencies before importing cascara_tetris
-sys.modules['pygame'] = MagicMock()
-# We don't mock urllib here to avoid conflicts, we'll patch it where used or patch the import
-sys.modules['numpy'] = MagicMock()
-sys.modules['core_tetris'] = MagicMock()
-sys.modules['controlador_manos'] = MagicMock()
+# Mock dependencies while importing cascara_tetris. patch.dict puts sys.modules
+# back afterwards, so test modules collected later get the real numpy, engine, etc.
+MODULOS_FALSOS = {
+    'pygame': MagicMock(),
+    'numpy': MagicMock(),
+    'core_tetris': MagicMock(),
+    'controlador_manos': MagicMock(),
+    'repeticion': MagicMock(),
+    'puntuaciones': MagicMock(),
+    'telemetria': MagicMock(),
+    'calibracion': MagicMock(),
+}
 
-# Import module under test
-# We need to make sure urllib.request is available or mocked if it's imported at top level
-# cascara_tetris imports urllib.request. 
-# Let's mock it in sys.modules just to be safe for the import
-mock_urllib_request = MagicMock()
-sys.modules['urllib.request'] = mock_urllib_request
-sys.modules['urllib'] = MagicMock()
-sys.modules['urllib'].request = mock_urllib_request
+with patch.dict(sys.modules, MODULOS_FALSOS):
+    from src.cascara_tetris import (GestorAudio, RenderizadorTetris, COLORES_PIEZAS,
+                                    AcumuladorTicks, SimulacionTetris, AnimacionBarrido,
+                                    BancoSonidos, obtener_banco_sonidos, esperar_fin_pausa,
+                                    ARCHIVOS_SONIDO, CLASES_EFECTO, MAX_VOCES)
+    import src.cascara_tetris as cascara_tetris
 
-from src.cascara_tetris import GestorAudio, RenderizadorTetris, COLORES_PIEZAS
+# Lazy imports inside cascara_tetris (numpy, cv2) see the same mocks while this module's tests run
+_modulos_de_prueba = patch.dict(sys.modules, {**MODULOS_FALSOS, 'src.cascara_tetris': cascara_tetris})
+
+
+def setUpModule():
+    _modulos_de_prueba.start()
+
+
+def tearDownModule():
+    _modulos_de_prueba.stop()
 
 class TestGestorAudio(unittest.TestCase):
     def setUp(self):
         self.mock_pygame = sys.modules['pygame']
-        # Reset the mock for each test
-        mock_urllib_request.reset_mock()
-        
-    @patch('os.path.exists')
-    @patch('os.makedirs')
-    @patch('builtins.open', new_callable=mock_open)
-    def test_initialization_downloads_sounds(self, mock_file, mock_makedirs, mock_exists):
-        """Test that audio manager attempts to download sounds if missing."""
-        # Simulate directory missing, then file missing for all files
-        # There are 8 files. 
-        # First check: directory exists? -> False
-        # Then loop 8 times: file exists? -> False
-        # So we need 9 False values.
-        mock_exists.side_effect = [False] + [False] * 8
-        
-        # Mock urlopen context manager
-        mock_response = MagicMock()
-        mock_response.read.return_value = b'fake_audio_data'
-        
-        # Configure the mock to return the response when called
-        mock_urllib_request.urlopen.return_value.__enter__.return_value = mock_response
-        
-        gestor = GestorAudio()
-        
-        # Should attempt to create directory
-        mock_makedirs.assert_called()
-        
-        # Should attempt to download files
-        # We expect 8 calls to urlopen
-        self.assertEqual(mock_urllib_request.urlopen.call_count, 8)
-        self.assertTrue(mock_file.called)
+        self.mock_pygame.mixer.reset_mock()
+
+    @patch('os.path.exists', return_value=True)
+    def test_carga_y_reserva_un_canal_por_clase(self, mock_exists):
+        """Loading decodes every effect, loads the music and reserves one channel per class within MAX_VOCES."""
+        banco = BancoSonidos()
+        banco.cargar()
+        mixer = self.mock_pygame.mixer
+
+        self.assertTrue(banco.listo)
+        self.assertTrue(banco.audio_disponible)
+        self.assertTrue(banco.musica_cargada)
+        self.assertEqual(sorted(banco.sonidos), sorted(n for n in ARCHIVOS_SONIDO if n != "background.wav"))
+        n_clases = len(set(CLASES_EFECTO.values()))
+        self.assertLess(n_clases, MAX_VOCES)  # Quedan canales libres para los efectos sin clase
+        mixer.set_num_channels.assert_called_once_with(MAX_VOCES)
+        mixer.set_reserved.assert_called_once_with(n_clases)
+        self.assertEqual(sorted(banco._canales), list(range(n_clases)))
+
+    @patch('os.path.exists', return_value=False)
+    def test_sin_carpeta_de_sonidos(self, mock_exists):
+        banco = BancoSonidos()
+        banco.cargar()
+        self.assertTrue(banco.listo)
+        self.assertFalse(banco.audio_disponible)
+        self.mock_pygame.mixer.set_reserved.assert_not_called()
+        GestorAudio(banco).reproducir('move.wav')  # Sin audio no hace nada
 
     def test_reproducir(self):
-        """Test playing a sound."""
-        # We need to mock _descargar_y_cargar_sonidos to avoid constructor logic
-        with patch.object(GestorAudio, '_descargar_y_cargar_sonidos'):
-            gestor = GestorAudio()
-            gestor.sonidos = {'test.wav': MagicMock()}
-            gestor.audio_disponible = True
-            
-            gestor.reproducir('test.wav')
-            gestor.sonidos['test.wav'].play.assert_called()
+        """GestorAudio plays through the bank; effects without a class use any free channel."""
+        banco = BancoSonidos()
+        banco.sonidos = {'rotate.wav': MagicMock(), 'otro.wav': MagicMock()}
+        canal_mov = MagicMock()
+        banco._canales = {0: canal_mov}
+        banco._listo.set()
+        gestor = GestorAudio(banco)
+
+        gestor.reproducir('rotate.wav')
+        gestor.reproducir('otro.wav')
+        gestor.reproducir('falta.wav')
+
+        canal_mov.play.assert_called_once_with(banco.sonidos['rotate.wav'])
+        banco.sonidos['otro.wav'].play.assert_called_once()
+
+class TestBancoSonidos(unittest.TestCase):
+    def test_banco_compartido_se_carga_una_vez(self):
+        """Every GestorAudio reuses the process-wide bank; WAVs are decoded once."""
+        with patch.object(cascara_tetris, '_banco_sonidos', None), \
+             patch.object(BancoSonidos, 'cargar') as mock_cargar:
+            primero = obtener_banco_sonidos()
+            segundo = obtener_banco_sonidos()
+            a, b = GestorAudio(), GestorAudio()
+        
+        self.assertIs(primero, segundo)
+        self.assertIs(a.banco, b.banco)
+        mock_cargar.assert_called_once()
+
+    def test_efectos_usan_canal_de_su_clase(self):
+        """Effects play on their class's reserved channel, not on any free one."""
+        banco = BancoSonidos()
+        banco.sonidos = {'move.wav': MagicMock(), 'line.wav': MagicMock()}
+        canal_mov, canal_lineas = MagicMock(), MagicMock()
+        banco._canales = {0: canal_mov, 2: canal_lineas}
+        banco._listo.set()
+        
+        banco.reproducir('move.wav')
+        banco.reproducir('move.wav')
+        banco.reproducir('line.wav')
+        
+        self.assertEqual(canal_mov.play.call_count, 2)
+        canal_lineas.play.assert_called_once_with(banco.sonidos['line.wav'])
+        banco.sonidos['move.wav'].play.assert_not_called()
+
+    def test_no_reproduce_antes_de_cargar(self):
+        banco = BancoSonidos()
+        banco.sonidos = {'move.wav': MagicMock()}
+        banco.reproducir('move.wav')
+        banco.sonidos['move.wav'].play.assert_not_called()
 
 class TestRenderizadorTetris(unittest.TestCase):
     def setUp(self):
@@ -82,7 +131,7 @@ class TestRenderizadorTetris(unittest.TestCase):
         
         # Should draw background and blocks
         self.assertTrue(self.mock_screen.fill.called)
-        self.assertTrue(sys.modules['pygame'].draw.rect.called)
+        self.assertTrue(self.mock_screen.blits.called)
 
     def test_dibujar_pieza(self):
         """Test drawing a piece."""
@@ -106,6 +155,307 @@ class TestRenderizadorTetris(unittest.TestCase):
         # Should verify blit calls for text
         self.assertTrue(self.mock_screen.blit.called)
 
+    def test_hud_en_cache_por_version(self):
+        """HUD text is only re-rendered when the stats version changes."""
+        fuente = self.renderer.fuente
+        fuente.render.reset_mock()
+        estado = {'puntaje': 10, 'lineas': 1, 'nivel': 1, 'version_estadisticas': 3}
+        self.renderer.dibujar_hud(estado, True)
+        renders = fuente.render.call_count
+        self.renderer.dibujar_hud(estado, True)
+        self.assertEqual(fuente.render.call_count, renders)
+        
+        self.renderer.dibujar_hud(dict(estado, puntaje=20, version_estadisticas=4), True)
+        self.assertEqual(fuente.render.call_count, 2 * renders)
+
+    def test_dibujar_fantasma(self):
+        """The ghost is an outline per cell at the landing row; nothing when already there."""
+        pieza = MagicMock(tipo="T", y=5)
+        pieza.celdas.return_value = [(5, 5), (4, 6), (5, 6), (6, 6)]
+        dibujar = sys.modules['pygame'].draw.rect
+        dibujar.reset_mock()
+        self.renderer.dibujar_fantasma(pieza, 17)
+        self.assertEqual(dibujar.call_count, 4)
+        
+        dibujar.reset_mock()
+        self.renderer.dibujar_fantasma(pieza, 5)
+        self.assertFalse(dibujar.called)
+
+    def test_celdas_escalan_con_el_tablero(self):
+        """Big boards shrink the cells to fit the classic board area and stay centered."""
+        self.assertEqual(cascara_tetris.tamano_celda(10, 20), cascara_tetris.CELDA)
+        self.assertEqual(cascara_tetris.tamano_celda(40, 80), 8)
+        grande = RenderizadorTetris(self.mock_screen, 40, 80)
+        self.assertEqual(grande.celda, 8)
+        self.assertEqual(grande.desplazamiento_x, (10 * 35 - 40 * 8) // 2)
+        
+        # Only occupied cells are drawn on top of the cached grid, as prerendered cell sprites
+        tablero = [[None] * 40 for _ in range(80)]
+        tablero[79][0] = "I"
+        tablero[79][1] = "I"
+        dibujar = sys.modules['pygame'].draw.rect
+        grande._fondo = MagicMock()
+        dibujar.reset_mock()
+        grande.dibujar_tablero(tablero)
+        self.assertEqual(dibujar.call_count, 1)  # Borde del sprite "I", una sola vez
+        celdas, _ = self.mock_screen.blits.call_args[0]
+        self.assertEqual([pos for _, pos in celdas], [(grande.desplazamiento_x, 20 + 79 * 8),
+                                                      (grande.desplazamiento_x + 8, 20 + 79 * 8)])
+        
+        # With the motor's occupied rows only those rows are read; no new sprites
+        dibujar.reset_mock()
+        tablero[3][5] = "T"  # Fuera de filas_ocupadas: no se mira
+        grande.dibujar_tablero(tablero, filas_ocupadas=(79,))
+        self.assertFalse(dibujar.called)
+        celdas, _ = self.mock_screen.blits.call_args[0]
+        self.assertEqual(len(celdas), 2)
+
+    def test_dimensiones_desde_argumentos(self):
+        self.assertEqual(cascara_tetris.dimensiones_tablero([]), (10, 20))
+        self.assertEqual(cascara_tetris.dimensiones_tablero(["--tablero", "40x80"]), (40, 80))
+        self.assertEqual(cascara_tetris.dimensiones_tablero(["--tablero", "ancho"]), (10, 20))
+
+    def test_sprites_de_paneles_en_cache(self):
+        """Hold and preview pieces are rendered once and reused across frames."""
+        pygame = sys.modules['pygame']
+        pygame.Surface.reset_mock()
+        for _ in range(3):
+            self.renderer.dibujar_paneles(['T', 'I', 'O'], 'S', hold_usado=False)
+        creadas = pygame.Surface.call_count
+        self.assertEqual(len(self.renderer._sprites), creadas)
+        self.assertEqual(creadas, 4)
+        
+        self.renderer.dibujar_paneles(['T', 'I', 'O'], 'S', hold_usado=True)
+        self.assertEqual(pygame.Surface.call_count, 5)
+
+    def test_dibujar_camara_landmarks_vectoriales(self):
+        """Landmarks are drawn as pygame lines, without needing an image."""
+        mock_pygame = sys.modules['pygame']
+        mock_pygame.reset_mock()
+        mano = tuple((i / 21, 0.5) for i in range(21))
+        conexiones = ((0, 1), (1, 2), (2, 3))
+        with patch.object(cascara_tetris, 'CONEXIONES_MANO', conexiones):
+            self.renderer.dibujar_camara(None, (mano,))
+
+        self.assertEqual(mock_pygame.draw.line.call_count, len(conexiones))
+        self.assertEqual(mock_pygame.draw.circle.call_count, 21)
+        self.assertFalse(mock_pygame.surfarray.make_surface.called)
+
+class TestMenusEnReposo(unittest.TestCase):
+    def setUp(self):
+        self.mock_pygame = sys.modules['pygame']
+        self.mock_pygame.reset_mock()
+        pantalla = MagicMock()
+        pantalla.get_rect.return_value.center = (300, 350)
+        pantalla.get_size.return_value = (630, 740)
+        self.renderer = RenderizadorTetris(pantalla)
+
+    def _tecla(self, key, unicode=''):
+        return MagicMock(type=self.mock_pygame.KEYDOWN, key=key, unicode=unicode)
+
+    def test_input_nombre_redibuja_solo_al_cambiar(self):
+        """The name screen blocks on event.wait and redraws only when the text changes."""
+        sin_evento = MagicMock(type=self.mock_pygame.NOEVENT)
+        self.mock_pygame.event.wait.side_effect = [
+            self._tecla(object(), 'a'), sin_evento, sin_evento, sin_evento,
+            self._tecla(self.mock_pygame.K_RETURN),
+        ]
+        
+        nombre = self.renderer.input_nombre()
+        
+        self.assertEqual(nombre, 'a')
+        self.assertEqual(self.mock_pygame.display.flip.call_count, 2)
+        self.mock_pygame.event.get.assert_not_called()
+        self.mock_pygame.event.wait.side_effect = None
+
+    def test_menu_game_over_espera_eventos(self):
+        self.mock_pygame.event.wait.side_effect = [
+            MagicMock(type=self.mock_pygame.NOEVENT),
+            self._tecla(self.mock_pygame.K_r),
+        ]
+        self.assertTrue(self.renderer.menu_game_over(100, 1, 1, "Ana"))
+        self.mock_pygame.event.get.assert_not_called()
+        self.mock_pygame.event.wait.side_effect = None
+
+    def test_pausa_duerme_hasta_reanudar(self):
+        """The pause screen blocks on event.wait, redraws on expose and resumes with P."""
+        self.mock_pygame.event.wait.side_effect = [
+            MagicMock(type=self.mock_pygame.VIDEOEXPOSE),
+            self._tecla(self.mock_pygame.K_p),
+        ]
+        with patch.object(self.renderer, 'dibujar_pausa') as dibujar:
+            self.assertTrue(esperar_fin_pausa(self.renderer))
+        self.assertEqual(dibujar.call_count, 2)
+        self.mock_pygame.event.get.assert_not_called()
+        self.mock_pygame.event.wait.side_effect = [self._tecla(self.mock_pygame.K_q)]
+        with patch.object(self.renderer, 'dibujar_pausa'):
+            self.assertFalse(esperar_fin_pausa(self.renderer))
+        self.mock_pygame.event.wait.side_effect = None
+
+    def test_calibracion_sin_previsualizacion(self):
+        """Calibration samples the hands of every inference, not the preview payload ('ninguna' publishes none)."""
+        class SesionFalsa:
+            instruccion, grabando, progreso = "Mano abierta", True, 0.5
+            def __init__(self):
+                self.muestras = []
+            @property
+            def terminada(self):
+                return len(self.muestras) >= 2
+            def agregar(self, landmarks):
+                self.muestras.append(landmarks)
+            def resultado(self):
+                return {'muestras': self.muestras}
+
+        manos = ((((0.5, 0.5),) * 21,), (((0.4, 0.5),) * 21,))
+        mano = MagicMock(ultimo_frame=None, ultimos_landmarks=None)
+        type(mano).landmarks_detectados = property(lambda _, it=iter(manos): next(it))
+        with patch.object(cascara_tetris, 'SesionCalibracion', SesionFalsa), \
+             patch.object(self.mock_pygame.event, 'get', return_value=[]), \
+             patch.object(self.renderer, 'pantalla_calibracion') as pantalla:
+            perfil = cascara_tetris.calibrar_gestos(self.renderer, mano, MagicMock())
+
+        self.assertEqual(perfil, {'muestras': list(manos)})
+        # Sin cuadro de previsualización se dibujan las manos detectadas
+        self.assertEqual(pantalla.call_args[0][3:], (None, manos[1]))
+        self.assertEqual([c.args for c in mano.establecer_estado_juego.call_args_list],
+                         [('calibrando',), ('menu',)])
+
+class TestAcumuladorTicks(unittest.TestCase):
+    def test_ticks_fijos(self):
+        """Ticks depend only on elapsed monotonic time, not on call rate."""
+        ahora = [0.0]
+        acumulador = AcumuladorTicks(ticks_por_segundo=60, max_ticks=8, reloj=lambda: ahora[0])
+        
+        ahora[0] = 0.5 / 60  # medio tick
+        self.assertEqual(acumulador.ticks_pendientes(), 0)
+        ahora[0] = 3.5 / 60
+        self.assertEqual(acumulador.ticks_pendientes(), 3)
+        ahora[0] = 4.0 / 60
+        self.assertEqual(acumulador.ticks_pendientes(), 1)
+
+    def test_atasco_limita_ticks(self):
+        """A long stall is clamped instead of producing a burst of ticks."""
+        ahora = [0.0]
+        acumulador = AcumuladorTicks(ticks_por_segundo=60, max_ticks=8, reloj=lambda: ahora[0])
+        
+        ahora[0] = 2.0
+        self.assertEqual(acumulador.ticks_pendientes(), 8)
+        ahora[0] = 2.0 + 1.0 / 60
+        self.assertEqual(acumulador.ticks_pendientes(), 1)
+
+    def test_reanudar_sin_rafaga(self):
+        """After a pause, reiniciar drops the paused time entirely."""
+        ahora = [0.0]
+        acumulador = AcumuladorTicks(ticks_por_segundo=60, max_ticks=8, reloj=lambda: ahora[0])
+        ahora[0] = 0.5 / 60
+        acumulador.ticks_pendientes()
+        ahora[0] = 30.0
+        acumulador.reiniciar()
+        ahora[0] = 30.0 + 1.0 / 60
+        self.assertEqual(acumulador.ticks_pendientes(), 1)
+
+class TestSimulacionTetris(unittest.TestCase):
+    def setUp(self):
+        self.motor = MagicMock()
+        self.motor.game_over = False
+        self.motor.nivel = 1
+        self.motor.ticks = 0
+        self.motor.tick.return_value = []
+        self.sim = SimulacionTetris(self.motor)
+
+    def test_entradas_van_al_motor(self):
+        """Point inputs go to the engine's queue; the engine applies them on its next tick."""
+        self.sim.encolar('rotar', 1)
+        self.sim.encolar('caida_dura')
+        self.motor.encolar.assert_any_call('rotar', 1)
+        self.motor.encolar.assert_any_call('caida_dura', 0)
+        self.motor.tick.assert_not_called()
+        
+        self.sim.paso()
+        self.motor.tick.assert_called_once()
+
+    def test_entradas_se_graban(self):
+        """Every input is recorded with the number of engine ticks already run."""
+        registro = MagicMock()
+        self.motor.ticks = 5
+        sim = SimulacionTetris(self.motor, registro=registro)
+        sim.encolar('caida_dura')
+        sim.pulsar_horizontal(1)
+        registro.registrar.assert_any_call(5, 'caida_dura', 0)
+        registro.registrar.assert_any_call(5, 'horizontal', 1)
+
+    def test_lado_mantenido(self):
+        """With both sides held the last one pressed wins; releasing falls back to the other."""
+        self.sim.pulsar_horizontal(1)
+        self.sim.pulsar_horizontal(-1)
+        self.sim.soltar_horizontal(-1)
+        self.sim.soltar_horizontal(1)
+        llamadas = [c.args[0] for c in self.motor.establecer_horizontal.call_args_list]
+        self.assertEqual(llamadas, [1, -1, 1, 0])
+
+    def test_soltar_todo(self):
+        """Held inputs are released on pause; their KEYUP may arrive while paused."""
+        self.sim.pulsar_horizontal(-1)
+        self.sim.caida_suave_teclado = True
+        self.sim.paso()
+        self.sim.soltar_todo()
+        self.sim.paso()
+        self.assertEqual(self.motor.establecer_horizontal.call_args.args[0], 0)
+        self.assertEqual(self.motor.establecer_caida_suave.call_args.args[0], 0)
+
+    def test_caida_suave_combina_fuentes(self):
+        self.sim.caida_suave_mano = True
+        self.sim.paso()
+        self.sim.caida_suave_teclado = True
+        self.sim.paso()
+        self.sim.caida_suave_mano = False
+        self.sim.caida_suave_teclado = False
+        self.sim.paso()
+        llamadas = [c.args[0] for c in self.motor.establecer_caida_suave.call_args_list]
+        self.assertEqual(llamadas, [1, 0])
+
+    def test_sonidos_por_eventos_del_motor(self):
+        """Lock, line and level sounds come from the engine's notifications, emitted during the tick."""
+        audio = MagicMock()
+        sim = SimulacionTetris(self.motor, audio=audio)
+        sim.al_fijar = MagicMock()
+        notificar = self.motor.suscribir.call_args.args[0]
+        
+        def tick():
+            notificar('pieza_fijada', 'I')
+            notificar('lineas_limpiadas', (16, 17, 18, 19))
+            notificar('subida_nivel', 2)
+            return ['mover', 'fijar']
+        self.motor.tick.side_effect = tick
+        self.motor.ultimas_lineas = 4
+        sim.paso()
+        sonidos = [c.args[0] for c in audio.reproducir.call_args_list]
+        self.assertEqual(sonidos, ['piece_landed.wav', '4_lines.wav', 'level_up.wav', 'move.wav'])
+        sim.al_fijar.assert_called_once_with(4)
+
+class TestAnimacionBarrido(unittest.TestCase):
+    def test_avanza_por_filas_sin_bloquear(self):
+        """Rows are covered bottom-up according to elapsed time."""
+        ahora = [0.0]
+        barrido = AnimacionBarrido(filas=20, duracion_s=2.0, reloj=lambda: ahora[0])
+        
+        self.assertEqual(barrido.avanzar(), [])
+        ahora[0] = 0.3  # 15% -> 3 filas
+        self.assertEqual(barrido.avanzar(), [19, 18, 17])
+        ahora[0] = 0.4
+        self.assertEqual(barrido.avanzar(), [16])
+        self.assertFalse(barrido.terminado)
+        
+        ahora[0] = 5.0
+        self.assertEqual(len(barrido.avanzar()), 16)
+        self.assertTrue(barrido.terminado)
+
+    def test_saltar(self):
+        barrido = AnimacionBarrido(filas=20, duracion_s=2.0, reloj=lambda: 0.0)
+        barrido.saltar()
+        self.assertEqual(len(barrido.avanzar()), 20)
+        self.assertTrue(barrido.terminado)
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -1,5 +1,6 @@
 import unittest
 from unittest.mock import MagicMock, patch
+import random
 import sys
 import time
 
@@ -9,7 +10,9 @@ sys.modules['mediapipe'] = MagicMock()
 sys.modules['mediapipe.solutions'] = MagicMock()
 
 # Now we can import the module
-from src.controlador_manos import ControladorMano
+from src.controlador_manos import ControladorMano, CargaManosAsincrona
+import src.controlador_manos as controlador_manos
+from src.calibracion import MIN_MUESTRAS, POSES, SesionCalibracion
 
 class TestControladorMano(unittest.TestCase):
     def setUp(self):
@@ -117,5 +120,216 @@ class TestControladorMano(unittest.TestCase):
         self.assertFalse(rotar)
         self.assertFalse(caida_dura)
 
+    def test_cambio_de_estado_descarta_intenciones(self):
+        """Gestures pending when the game state changes never reach the next game."""
+        self.controller.establecer_estado_juego('jugando')
+        self.controller.dir_mov = -1
+        self.controller.borde_caida_dura = True
+        self.controller.establecer_estado_juego('menu')
+        # En el menú se sigue infiriendo a baja tasa: un gesto hecho ahí tampoco cuenta
+        self.controller.borde_rotar_hor = True
+        self.controller.caida_suave = True
+        self.controller.establecer_estado_juego('jugando')
+        self.assertEqual(self.controller.consultar(), (0, False, False, False))
+
+    def test_modos_previsualizacion(self):
+        """Only the 'anotada' mode draws on the frame; 'landmarks' publishes the array."""
+        punto = MagicMock(x=0.25, y=0.5)
+        resultados = MagicMock()
+        resultados.multi_hand_landmarks = [MagicMock(landmark=[punto] * 21)]
+        cuadro = MagicMock()
+        dibujar = self.mock_mp.solutions.drawing_utils.draw_landmarks
+        dibujar.reset_mock()
+
+        self.assertEqual(controlador_manos.preparar_previsualizacion('ninguna', cuadro, resultados), (None, None))
+        self.assertEqual(controlador_manos.preparar_previsualizacion('cruda', cuadro, resultados), (cuadro, None))
+        publicado, landmarks = controlador_manos.preparar_previsualizacion('landmarks', cuadro, resultados)
+        self.assertIs(publicado, cuadro)
+        self.assertEqual(landmarks, (((0.25, 0.5),) * 21,))
+        self.assertFalse(dibujar.called)
+
+        controlador_manos.preparar_previsualizacion('anotada', cuadro, resultados)
+        self.assertTrue(dibujar.called)
+
+    def test_aplicar_perfil(self):
+        """A calibration profile overrides thresholds; None restores the constructor values."""
+        self.controller.aplicar_perfil({'dist_min_dedo': 0.09, 'rotar_debounce_s': 0.15, 'margen': 0.4})
+        self.assertEqual(self.controller.dist_min_dedo, 0.09)
+        self.assertEqual(self.controller.rotar_debounce_s, 0.15)
+        self.assertEqual(self.controller.umbral_dir_pulgar, 0.10)
+        self.controller.aplicar_perfil(None)
+        self.assertEqual(self.controller.dist_min_dedo, 0.18)
+        self.assertEqual(self.controller.rotar_debounce_s, 0.20)
+
+def resultados_de_mano(largo_dedo, pulgar_vy, rng):
+    """Resultado de Hands.process() con una mano: dedos de largo_dedo y el pulgar desplazado pulgar_vy."""
+    puntos = [[0.5, 0.8] for _ in range(21)]
+    for i, (punta, mcp) in enumerate(((8, 5), (12, 9), (16, 13), (20, 17))):
+        x = 0.4 + 0.05 * i
+        puntos[mcp] = [x, 0.6]
+        puntos[punta] = [x, 0.6 - largo_dedo * rng.uniform(0.9, 1.1)]
+    puntos[2] = [0.3, 0.6]
+    puntos[4] = [0.3, 0.6 + pulgar_vy * rng.uniform(0.9, 1.1)]
+    landmark = [MagicMock(x=x, y=y) for x, y in puntos]
+    return MagicMock(multi_hand_landmarks=[MagicMock(landmark=landmark)], multi_handedness=None)
+
+
+class TestCalibracionSinPrevisualizacion(unittest.TestCase):
+    def test_calibra_con_previsualizacion_ninguna(self):
+        """Calibration samples come from every inference, even when the preview publishes nothing."""
+        controlador = ControladorMano(mostrar_camara=False, previsualizacion='ninguna')
+        self.addCleanup(controlador.detener)
+        ahora = [0.0]
+        sesion = SesionCalibracion(preparacion_s=1.0, segundos_por_pose=2.0, reloj=lambda: ahora[0])
+        rng = random.Random(4)
+        poses = {'abierta': (0.12, 0.0), 'puno': (0.04, 0.0),
+                 'pulgar_arriba': (0.04, -0.08), 'pulgar_abajo': (0.04, 0.08)}
+        for i, (pose, _) in enumerate(POSES):
+            for n in range(MIN_MUESTRAS + 5):
+                ahora[0] = i * 3.0 + 1.05 + n * 0.09
+                controlador.procesar_resultados(resultados_de_mano(*poses[pose], rng), ahora[0])
+                sesion.agregar(controlador.landmarks_detectados)
+        ahora[0] = 3.0 * len(POSES)
+
+        self.assertIsNone(controlador.ultimos_landmarks)
+        self.assertTrue(sesion.terminada)
+        perfil = sesion.resultado()
+        self.assertIsNotNone(perfil)
+        self.assertLess(perfil['dist_min_dedo'], 0.12)
+
+    def test_sin_manos(self):
+        controlador = ControladorMano(mostrar_camara=False, previsualizacion='ninguna')
+        self.addCleanup(controlador.detener)
+        controlador.procesar_resultados(MagicMock(multi_hand_landmarks=None), 1.0)
+        self.assertEqual(controlador.landmarks_detectados, ())
+
+
+class CamaraFalsa:
+    """Acepta solo los modos (fourcc, ancho, alto) dados; si no, queda en su modo nativo."""
+
+    def __init__(self, cv2, modos, nativo=('YUYV', 640, 480)):
+        self.cv2 = cv2
+        self.modos = modos
+        self.pedido = {}
+        self.modo = nativo
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, valor):
+        self.pedido[prop] = valor
+        cv2 = self.cv2
+        if prop in (cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT):
+            pedido = (controlador_manos._texto_fourcc(self.pedido.get(cv2.CAP_PROP_FOURCC, 0)),
+                      self.pedido.get(cv2.CAP_PROP_FRAME_WIDTH), self.pedido.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            if pedido in self.modos:
+                self.modo = pedido
+
+    def get(self, prop):
+        cv2 = self.cv2
+        if prop == cv2.CAP_PROP_FOURCC:
+            return cv2.VideoWriter_fourcc(*self.modo[0])
+        return {cv2.CAP_PROP_FRAME_WIDTH: self.modo[1], cv2.CAP_PROP_FRAME_HEIGHT: self.modo[2],
+                cv2.CAP_PROP_FPS: 60.0}.get(prop, 0)
+
+    def read(self):
+        return True, MagicMock(shape=(self.modo[2], self.modo[1], 3))
+
+
+class TestNegociacionCamara(unittest.TestCase):
+    def setUp(self):
+        self.cv2 = MagicMock(CAP_PROP_FRAME_WIDTH=3, CAP_PROP_FRAME_HEIGHT=4, CAP_PROP_FPS=5,
+                             CAP_PROP_FOURCC=6, CAP_PROP_BUFFERSIZE=38)
+        self.cv2.VideoWriter_fourcc.side_effect = lambda *c: sum(ord(x) << 8 * i for i, x in enumerate(c))
+
+    def abrir(self, modos, **kwargs):
+        camara = CamaraFalsa(self.cv2, modos, **kwargs)
+        self.cv2.VideoCapture.return_value = camara
+        with patch.object(controlador_manos, 'cv2', self.cv2):
+            cap, modo = controlador_manos.abrir_camara(0, 640, 480)
+        self.assertEqual(camara.pedido[self.cv2.CAP_PROP_BUFFERSIZE], 1)
+        return modo
+
+    def test_prefiere_mjpg(self):
+        modo = self.abrir({('MJPG', 640, 480), ('YUYV', 320, 240)})
+        self.assertEqual((modo['fourcc'], modo['ancho'], modo['alto'], modo['confirmado']),
+                         ('MJPG', 640, 480, True))
+
+    def test_menor_resolucion_sin_mjpg(self):
+        modo = self.abrir({('YUYV', 320, 240)})
+        self.assertEqual((modo['fourcc'], modo['ancho'], modo['alto']), ('YUYV', 320, 240))
+
+    def test_sin_modo_confirmado(self):
+        modo = self.abrir(set(), nativo=('NV12', 640, 480))
+        self.assertFalse(modo['confirmado'])
+        self.assertEqual((modo['fourcc'], modo['ancho'], modo['alto']), ('NV12', 640, 480))
+
+    def test_sin_modo_confirmado_restaura_fourcc(self):
+        # Acepta el tamaño pedido pero no en MJPG: el FOURCC del intento fallido no debe quedar puesto
+        camara = CamaraFalsa(self.cv2, {('YUYV', 640, 480)}, nativo=('YUYV', 640, 480))
+        self.cv2.VideoCapture.return_value = camara
+        with patch.object(controlador_manos, 'cv2', self.cv2):
+            _, modo = controlador_manos.abrir_camara(0, 640, 480, modos=(('MJPG', 1.0, 30),))
+        self.assertFalse(modo['confirmado'])
+        self.assertEqual(camara.pedido[self.cv2.CAP_PROP_FOURCC], self.cv2.VideoWriter_fourcc(*'YUYV'))
+        self.assertEqual(modo['fourcc'], 'YUYV')
+
+    def test_medidor_fps(self):
+        medidor = controlador_manos.MedidorFps("prueba", duracion_s=1.0)
+        resultados = [medidor.cuadro(i / 30) for i in range(31)]
+        self.assertTrue(all(r is None for r in resultados[:-1]))
+        self.assertTrue(abs(resultados[-1] - 30.0) < 1e-9)
+        self.assertIsNone(medidor.cuadro(2.0))
+
+
+class TestPlanificadorInferencia(unittest.TestCase):
+    def test_presencia_hasta_ver_manos_en_juego(self):
+        plan = controlador_manos.PlanificadorInferencia(
+            'menu', intervalo_presencia_s=0.25, espera_sin_manos_s=1.0)
+        self.assertEqual(plan.espera(10.0), 0.0)  # La primera inferencia no espera
+        plan.registrar(10.0, True)
+        # En el menú, aunque haya manos, solo presencia
+        self.assertTrue(abs(plan.espera(10.1) - 0.15) < 1e-9)
+        plan.establecer_estado('jugando')
+        self.assertEqual(plan.espera(10.1), 0.0)
+        plan.registrar(10.1, False)
+        # Un segundo sin manos: vuelve a presencia
+        self.assertEqual(plan.espera(10.9), 0.0)
+        plan.registrar(10.95, False)
+        self.assertTrue(plan.espera(11.1) > 0)
+        plan.establecer_estado('calibrando')
+        self.assertEqual(plan.espera(11.1), 0.0)
+        # En pausa nunca toca inferir
+        plan.establecer_estado('pausa')
+        self.assertTrue(plan.espera(100.0) > 0)
+
+    def test_estado_desconocido(self):
+        plan = controlador_manos.PlanificadorInferencia()
+        with self.assertRaises(ValueError):
+            plan.establecer_estado('jugandoo')
+        self.assertEqual(plan.estado_juego, 'jugando')
+
+
+class TestCargaManosAsincrona(unittest.TestCase):
+    def test_carga_en_segundo_plano(self):
+        """The controller is created on a background thread and exposed when ready."""
+        controlador = MagicMock()
+        with patch.object(controlador_manos, 'crear_controlador_manos_o_nada',
+                          return_value=controlador) as mock_crear:
+            carga = CargaManosAsincrona(mostrar_camara=False).iniciar()
+            self.assertIs(carga.esperar(timeout=5), controlador)
+        
+        mock_crear.assert_called_once_with(mostrar_camara=False)
+        self.assertTrue(carga.terminado)
+        self.assertEqual(carga.estado, 'listo')
+        self.assertEqual(carga.progreso, 1.0)
+
+    def test_carga_sin_camara(self):
+        with patch.object(controlador_manos, 'crear_controlador_manos_o_nada', return_value=None):
+            carga = CargaManosAsincrona().iniciar()
+            carga.esperar(timeout=5)
+        self.assertEqual(carga.estado, 'no_disponible')
+        self.assertIsNone(carga.controlador)
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,5 @@
 import pytest
-from src.core_tetris import Pieza, Motor, TETROMINOS
+from src.core_tetris import Pieza, Motor, TETROMINOS, ReglasJuego, REGLAS_GUIDELINE
 
 # =============================================================================
 # TESTS PARA LA CLASE PIEZA
@@ -83,6 +83,20 @@ def test_motor_inicializacion(motor):
     assert not motor.game_over
     assert motor.pieza_actual is not None
     assert motor.siguiente_pieza is not None
+    assert isinstance(motor.siguiente_pieza, Pieza)
+    assert motor.siguiente_pieza.tipo == motor.vista_previa()[0]
+
+def test_filas_ocupadas_por_version(motor):
+    assert motor.filas_ocupadas() == ()
+    motor.tablero[10][5] = "I"
+    # Sin cambio de versión se usa el resultado en caché
+    assert motor.filas_ocupadas() == ()
+    motor.version_tablero += 1
+    assert motor.filas_ocupadas() == (10,)
+    assert motor.obtener_estado()['filas_ocupadas'] == (10,)
+    motor.caida_dura()
+    assert 10 in motor.filas_ocupadas()
+    assert len(motor.filas_ocupadas()) > 1
 
 def test_motor_generar_bolsa(motor):
     bolsa = motor._generar_bolsa()
@@ -180,6 +194,35 @@ def test_motor_rotar_wall_kick(motor):
     assert motor.pieza_actual.rot == 2
     assert motor.pieza_actual.x < 7 # Se movió a la izquierda
 
+def test_motor_rotar_kicks_srs_en_orden(motor):
+    # T en 0 -> R: (0,0) y (-1,0) chocan; el tercer kick SRS sube la pieza
+    # pero también choca, y el cuarto la baja dos filas (kick de T-spin)
+    motor.pieza_actual = Pieza("T")
+    motor.pieza_actual.x = 4
+    motor.pieza_actual.y = 5
+    motor.tablero[6][6] = "G"
+    motor.tablero[6][4] = "G"
+    assert motor.rotar()
+    assert motor.pieza_actual.rot == 1
+    assert (motor.pieza_actual.x, motor.pieza_actual.y) == (4, 7)
+
+def test_motor_rotar_i_y_o(motor):
+    # La I usa su propia tabla: L -> 0 pegada a la pared izquierda
+    motor.pieza_actual = Pieza("I")
+    motor.pieza_actual.x = -1
+    motor.pieza_actual.y = 5
+    motor.pieza_actual.rot = 3
+    assert motor.rotar()
+    assert motor.pieza_actual.rot == 0
+    assert motor.pieza_actual.x == 0
+    assert not motor.colisiona(motor.pieza_actual)
+    
+    # La O nunca se desplaza al rotar
+    motor.pieza_actual = Pieza("O")
+    x, y = motor.pieza_actual.x, motor.pieza_actual.y
+    assert motor.rotar()
+    assert (motor.pieza_actual.x, motor.pieza_actual.y) == (x, y)
+
 def test_motor_caida_suave(motor):
     motor.pieza_actual.y = 0
     assert motor.caida_suave()
@@ -237,6 +280,44 @@ def test_motor_puntuacion_nivel(motor):
     assert motor.lineas_totales == 10
     assert motor.nivel == 2
 
+def test_motor_puntos_caida_dura_y_suave(motor):
+    motor.pieza_actual = Pieza("O")
+    motor.caida_suave()
+    assert motor.puntaje == 1
+    
+    filas = motor.caida_dura()
+    assert filas > 0
+    assert motor.puntaje == 1 + 2 * filas
+
+def test_motor_gravedad_no_suma_puntos(motor):
+    motor.aplicar_gravedad()
+    assert motor.puntaje == 0
+
+def test_reglas_guideline_combo_y_b2b():
+    motor = Motor(reglas=REGLAS_GUIDELINE)
+    motor.nivel = 2
+    motor.lineas_totales = 10
+    motor._actualizar_puntaje(4)
+    assert motor.puntaje == 800 * 2
+    
+    # Segundo Tetris seguido: back-to-back (x1.5) + combo 1 (50 x nivel)
+    motor._actualizar_puntaje(4)
+    assert motor.puntaje == 1600 + 2400 + 100
+    
+    # Una pieza sin líneas corta el combo
+    motor._actualizar_puntaje(0)
+    assert motor.combo == -1
+
+def test_reglas_gravedad_precalculada():
+    reglas = ReglasJuego("prueba", lambda nivel: 1.0 / nivel, nivel_max=5)
+    motor = Motor(reglas=reglas)
+    motor.nivel = 4
+    assert abs(motor.gravedad_actual() - 0.25) < 1e-9
+    assert reglas.ticks_gravedad(4) == 15
+    # Por encima del nivel máximo se mantiene la última entrada
+    motor.nivel = 50
+    assert abs(motor.gravedad_actual() - 0.2) < 1e-9
+
 def test_motor_game_over(motor):
     # Llenar el tablero hasta arriba
     for y in range(20):
@@ -268,3 +349,279 @@ def test_motor_obtener_estado(motor):
     assert "pieza_actual" in estado
     assert "puntaje" in estado
     assert estado["puntaje"] == motor.puntaje
+
+def test_motor_ultimas_lineas(motor):
+    for x in range(10):
+        motor.tablero[19][x] = "I"
+    motor.tablero[19][0] = None
+    motor.pieza_actual = Pieza("I")
+    motor.pieza_actual.rot = 1
+    motor.pieza_actual.x = -2  # Columna 0 en vertical
+    motor.pieza_actual.y = 10
+    motor.caida_dura()
+    assert motor.ultimas_lineas == 1
+
+def test_motor_recibir_basura(motor):
+    motor.tablero[19][3] = "T"
+    motor.recibir_basura(2, hueco=4)
+    
+    # El tablero sube 2 filas y aparecen 2 filas de basura con hueco en la columna 4
+    assert motor.tablero[17][3] == "T"
+    for y in (18, 19):
+        assert motor.tablero[y][4] is None
+        assert all(motor.tablero[y][x] == "G" for x in range(10) if x != 4)
+    assert not motor.game_over
+
+def test_motor_recibir_basura_topout(motor):
+    motor.tablero[0][0] = "I"
+    motor.recibir_basura(1, hueco=0)
+    assert motor.game_over
+
+# =============================================================================
+# TESTS DEL MODELO POR TICKS
+# =============================================================================
+
+def _motor_sin_gravedad(**kwargs):
+    """Motor con gravedad muy lenta para aislar DAS, lock delay y buffer."""
+    return Motor(reglas=ReglasJuego("lenta", lambda nivel: 1000.0), **kwargs)
+
+def test_das_arr():
+    motor = _motor_sin_gravedad(das_ticks=10, arr_ticks=2)
+    motor.pieza_actual = Pieza("O")
+    x0 = motor.pieza_actual.x
+    
+    motor.establecer_horizontal(-1)
+    motor.tick()  # Paso inmediato
+    assert motor.pieza_actual.x == x0 - 1
+    for _ in range(9):
+        motor.tick()
+    assert motor.pieza_actual.x == x0 - 1  # Aún dentro del DAS
+    motor.tick()  # Fin del DAS: repite
+    assert motor.pieza_actual.x == x0 - 2
+    motor.tick()
+    motor.tick()
+    assert motor.pieza_actual.x == x0 - 3
+
+def test_toque_corto_entre_ticks_mueve_un_paso():
+    motor = _motor_sin_gravedad()
+    x0 = motor.pieza_actual.x
+    motor.establecer_horizontal(1)
+    motor.establecer_horizontal(0)
+    motor.tick()
+    assert motor.pieza_actual.x == x0 + 1
+
+def test_lock_delay():
+    motor = _motor_sin_gravedad()
+    motor.pieza_actual = Pieza("O")
+    motor.pieza_actual.y = 18  # Apoyada en el fondo
+    primera = motor.pieza_actual
+    
+    for _ in range(motor.reglas.retraso_bloqueo_ticks - 1):
+        motor.tick()
+    assert motor.pieza_actual is primera
+    assert motor.tick() == ['fijar']
+    assert motor.pieza_actual is not primera
+
+def test_lock_delay_reinicios_limitados():
+    reglas = ReglasJuego("lenta", lambda nivel: 1000.0, retraso_bloqueo_ticks=5, max_reinicios_bloqueo=2)
+    motor = Motor(reglas=reglas, das_ticks=100)
+    motor.pieza_actual = Pieza("O")
+    motor.pieza_actual.y = 18
+    primera = motor.pieza_actual
+    
+    ticks = 0
+    while motor.pieza_actual is primera:
+        if ticks % 4 == 3:
+            motor.encolar('mover', 1 if ticks % 8 == 3 else -1)
+        motor.tick()
+        ticks += 1
+    # Reinicios en los ticks 4 y 8; el del tick 12 ya no cuenta y la pieza se fija
+    assert ticks == 12
+
+def test_rotacion_en_buffer():
+    motor = _motor_sin_gravedad()
+    motor.pieza_actual = Pieza("I")
+    # Bloques a ambos lados impiden rotar a vertical
+    for y in range(0, 3):
+        for x in range(10):
+            motor.tablero[y][x] = "G"
+    motor.pieza_actual.y = -1
+    motor.encolar('rotar', 1)
+    motor.tick()
+    assert motor.pieza_actual.rot == 0
+    
+    # Se libera el espacio dentro de la ventana del buffer: la rotación entra
+    for y in range(0, 3):
+        motor.tablero[y] = [None] * 10
+    motor.tick()
+    assert motor.pieza_actual.rot == 1
+
+# =============================================================================
+# TESTS DE HOLD Y COLA DE VISTA PREVIA
+# =============================================================================
+
+def test_hold_una_vez_por_pieza():
+    motor = Motor(semilla=1)
+    primera = motor.pieza_actual.tipo
+    siguiente = motor.siguiente_pieza.tipo
+    assert motor.guardar_pieza()
+    assert motor.pieza_guardada == primera
+    assert motor.pieza_actual.tipo == siguiente
+    # Segundo hold antes de fijar: rechazado
+    assert not motor.guardar_pieza()
+    assert motor.pieza_actual.tipo == siguiente
+    
+    motor.caida_dura()
+    assert not motor.hold_usado
+    actual = motor.pieza_actual.tipo
+    assert motor.guardar_pieza()
+    # Intercambio: vuelve la guardada en su posición inicial
+    assert motor.pieza_actual.tipo == primera
+    assert motor.pieza_actual.rot == 0
+    assert motor.pieza_guardada == actual
+
+def test_hold_en_buffer():
+    motor = _motor_sin_gravedad(semilla=2)
+    primera = motor.pieza_actual.tipo
+    motor.encolar('hold')
+    assert 'hold' in motor.tick()
+    assert motor.pieza_guardada == primera
+
+def test_vista_previa_bolsa_de_siete():
+    motor = Motor(semilla=5, tamano_vista_previa=5)
+    assert len(motor.vista_previa()) == 5
+    assert motor.vista_previa()[0] == motor.siguiente_pieza.tipo
+    # Cada bloque de 7 piezas consecutivas (desde la primera) es una permutación
+    tipos = [motor.pieza_actual.tipo]
+    for _ in range(20):
+        motor.caida_dura()
+        motor.tablero = [[None] * motor.columnas for _ in range(motor.filas)]
+        tipos.append(motor.pieza_actual.tipo)
+    assert sorted(tipos[:7]) == sorted(TETROMINOS)
+    assert sorted(tipos[7:14]) == sorted(TETROMINOS)
+
+def test_vista_previa_anticipa_las_piezas():
+    motor = Motor(semilla=9)
+    previa = motor.vista_previa(3)
+    for tipo in previa:
+        motor.caida_dura()
+        motor.tablero = [[None] * motor.columnas for _ in range(motor.filas)]
+        assert motor.pieza_actual.tipo == tipo
+
+# =============================================================================
+# TESTS DE TABLEROS GRANDES
+# =============================================================================
+
+def test_tablero_ancho_centra_y_clona():
+    motor = Motor(40, 80, semilla=4)
+    assert motor.pieza_actual.x == (40 - 4) // 2
+    copia = motor.pieza_actual.clonar()
+    assert copia.columnas == 40
+    assert copia.celdas() == motor.pieza_actual.celdas()
+
+def test_tablero_ancho_limpia_solo_filas_de_la_pieza():
+    motor = Motor(40, 80, semilla=4)
+    motor.pieza_actual = Pieza("I", 40)
+    # Fila inferior completa salvo el hueco de la I
+    for x in range(40):
+        if not 10 <= x < 14:
+            motor.tablero[79][x] = "G"
+    motor.tablero[78][0] = "G"
+    motor.pieza_actual.x = 10
+    motor.caida_dura()
+    assert motor.ultimas_lineas == 1
+    assert len(motor.tablero) == 80
+    assert motor.tablero[79][0] == "G"
+    assert motor.tablero[79][1] is None
+
+def test_recibir_basura_no_agranda_el_tablero(motor):
+    motor.recibir_basura(30, 0)
+    assert len(motor.tablero) == motor.filas
+    assert motor.game_over is False
+
+# =============================================================================
+# TESTS DE PIEZA FANTASMA
+# =============================================================================
+
+def test_fila_fantasma_coincide_con_caida_dura(motor):
+    motor.pieza_actual = Pieza("T")
+    motor.tablero[19][4] = "G"
+    fila = motor.fila_fantasma()
+    y_inicial = motor.pieza_actual.y
+    assert motor.caida_dura() == fila - y_inicial
+
+def test_fila_fantasma_en_cache(motor, monkeypatch):
+    motor.pieza_actual = Pieza("T")
+    fila = motor.fila_fantasma()
+    llamadas = []
+    original = motor.colisiona
+    monkeypatch.setattr(motor, 'colisiona', lambda *a, **k: llamadas.append(1) or original(*a, **k))
+    
+    # Caer por gravedad no invalida la fila
+    motor.pieza_actual.y += 3
+    assert motor.fila_fantasma() == fila
+    assert not llamadas
+    
+    # Un cambio de tablero sí
+    motor.tablero[19][4] = "G"
+    motor.version_tablero += 1
+    assert motor.fila_fantasma() == fila - 1
+    assert llamadas
+
+def test_fila_fantasma_bajo_un_saliente(motor):
+    # Saliente sobre las columnas 0-3 en la fila 10
+    for x in range(4):
+        motor.tablero[10][x] = "G"
+    motor.pieza_actual = Pieza("O")
+    motor.pieza_actual.x = -1
+    motor.pieza_actual.y = 0
+    assert motor.fila_fantasma() == 8
+    # La pieza se movió y volvió a la misma columna ya por debajo del saliente
+    motor.pieza_actual.y = 12
+    assert motor.fila_fantasma() == 18
+
+# =============================================================================
+# TESTS DE VERSIONES Y NOTIFICACIONES
+# =============================================================================
+
+def test_versiones_suben_con_cada_cambio(motor):
+    tablero, pieza, stats = motor.version_tablero, motor.version_pieza, motor.version_estadisticas
+    motor.pieza_actual.y = 5
+    assert motor.mover(1, 0)
+    assert motor.version_pieza > pieza
+    assert motor.version_tablero == tablero
+    
+    pieza = motor.version_pieza
+    motor.caida_dura()
+    assert motor.version_tablero > tablero
+    assert motor.version_pieza > pieza
+    assert motor.version_estadisticas > stats
+    
+    # Sin entradas ni gravedad efectiva, nada cambia
+    versiones = (motor.version_tablero, motor.version_pieza, motor.version_estadisticas)
+    motor.fila_fantasma()
+    motor.obtener_estado()
+    assert (motor.version_tablero, motor.version_pieza, motor.version_estadisticas) == versiones
+
+def test_notificaciones_al_limpiar(motor):
+    eventos = []
+    motor.suscribir(lambda evento, datos: eventos.append((evento, datos)))
+    motor.lineas_totales = 8
+    for y in (18, 19):
+        for x in range(10):
+            if x not in (4, 5):
+                motor.tablero[y][x] = "G"
+    motor.pieza_actual = Pieza("O")
+    motor.pieza_actual.x = 3
+    motor.caida_dura()
+    assert eventos == [('pieza_fijada', 'O'), ('lineas_limpiadas', (18, 19)), ('subida_nivel', 2)]
+
+def test_notificacion_game_over_una_vez(motor):
+    eventos = []
+    motor.suscribir(lambda evento, datos: eventos.append(evento))
+    for x in range(10):
+        motor.tablero[0][x] = "G"
+    motor.recibir_basura(2, 0)
+    motor.recibir_basura(2, 0)
+    assert motor.game_over
+    assert eventos == ['game_over']
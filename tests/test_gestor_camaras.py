@@ -0,0 +1,107 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import time
+
+# Mock external dependencies before importing the module under test
+sys.modules.setdefault('cv2', MagicMock())
+sys.modules.setdefault('mediapipe', MagicMock())
+
+# Usar el módulo real aunque otro test lo haya sustituido por un mock
+import src.controlador_manos as controlador_manos
+sys.modules['controlador_manos'] = controlador_manos
+
+from src.gestor_camaras import GestorCamaras, crear_gestor_camaras_o_nada
+
+
+class TestGestorCamaras(unittest.TestCase):
+    def setUp(self):
+        controlador_manos.cargar_dependencias()
+        self.mock_cv2 = controlador_manos.cv2
+        self.mock_mp = controlador_manos.mp
+        
+        def leer():
+            time.sleep(0.001)
+            return True, MagicMock()
+        self.mock_cap = MagicMock()
+        self.mock_cap.read.side_effect = leer
+        self.mock_cv2.VideoCapture.return_value = self.mock_cap
+        self.mock_mp.solutions.hands.Hands.return_value.process.return_value.multi_hand_landmarks = None
+
+    def test_turnos_equitativos(self):
+        """Workers serve cameras round-robin and take only the latest frame."""
+        gestor = GestorCamaras(indices=(0, 1, 2), max_trabajadores=1, fps_max_por_camara=0)
+        for flujo in gestor.flujos:
+            flujo._cuadro = MagicMock()
+        
+        atendidos = []
+        for _ in range(3):
+            flujo, _cuadro = gestor._tomar_trabajo(time.monotonic())
+            atendidos.append(flujo.indice_cam)
+        
+        self.assertEqual(atendidos, [0, 1, 2])
+        # Todas ocupadas: no hay más trabajo hasta que se liberen
+        self.assertIsNone(gestor._tomar_trabajo(time.monotonic()))
+
+    def test_tope_por_camara(self):
+        gestor = GestorCamaras(indices=(0,), fps_max_por_camara=10)
+        flujo = gestor.flujos[0]
+        flujo._cuadro = MagicMock()
+        flujo._ultima_inferencia = 100.0
+        self.assertIsNone(gestor._tomar_trabajo(100.05))
+        self.assertIsNotNone(gestor._tomar_trabajo(100.2))
+
+    def test_pool_acotado_con_descartes(self):
+        """With one worker for three cameras every camera gets inferences and stale frames are dropped."""
+        def inferencia_lenta(_cuadro):
+            time.sleep(0.005)  # Más lenta que la captura: obliga a descartar
+            return MagicMock(multi_hand_landmarks=None)
+        self.mock_mp.solutions.hands.Hands.return_value.process.side_effect = inferencia_lenta
+        
+        gestor = GestorCamaras(indices=(0, 1, 2), max_trabajadores=1, fps_max_por_camara=0)
+        self.assertEqual(len(gestor._trabajadores), 0)
+        gestor.iniciar()
+        try:
+            time.sleep(0.3)
+        finally:
+            gestor.detener()
+            self.mock_mp.solutions.hands.Hands.return_value.process.side_effect = None
+        
+        self.assertEqual(len(gestor._trabajadores), 1)
+        estadisticas = gestor.estadisticas()
+        for indice in (0, 1, 2):
+            self.assertGreater(estadisticas[indice]['inferencias'], 0)
+        self.assertGreater(sum(e['descartados'] for e in estadisticas.values()), 0)
+        
+        # Cada cámara conserva su propio flujo de intenciones
+        gestor.flujos[1].borde_rotar_hor = True
+        self.assertFalse(gestor.flujos[0].consultar()[2])
+        self.assertTrue(gestor.flujos[1].consultar()[2])
+
+    def test_cambio_de_estado_descarta_intenciones(self):
+        gestor = GestorCamaras(indices=(0, 1))
+        for flujo in gestor.flujos:
+            flujo.borde_caida_dura = True
+        gestor.establecer_estado_juego('menu')
+        gestor.establecer_estado_juego('jugando')
+        for flujo in gestor.flujos:
+            self.assertEqual(flujo.estado_juego, 'jugando')
+            self.assertEqual(flujo.consultar(), (0, False, False, False))
+        with self.assertRaises(ValueError):
+            gestor.establecer_estado_juego('otro')
+        gestor.detener()
+
+    def test_libera_camaras_si_una_no_abre(self):
+        """If camera N fails to open, cameras 0..N-1 are released before giving up."""
+        camaras = [MagicMock(), MagicMock(), MagicMock()]
+        camaras[2].isOpened.return_value = False
+        self.mock_cv2.VideoCapture.side_effect = camaras
+        try:
+            self.assertIsNone(crear_gestor_camaras_o_nada(indices=(0, 1, 2)))
+        finally:
+            self.mock_cv2.VideoCapture.side_effect = None
+        for camara in camaras:
+            camara.release.assert_called()
+
+if __name__ == '__main__':
+    unittest.main()
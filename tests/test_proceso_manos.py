@@ -0,0 +1,132 @@
+import unittest
+from unittest.mock import MagicMock
+import multiprocessing
+import sys
+
+# Mock external dependencies before importing the module under test
+sys.modules.setdefault('cv2', MagicMock())
+sys.modules.setdefault('mediapipe', MagicMock())
+
+# Usar los módulos reales aunque otro test los haya sustituido por mocks
+import src.controlador_manos as controlador_manos
+sys.modules['controlador_manos'] = controlador_manos
+import numpy as np
+from src.proceso_manos import BufferCuadros, ControladorManoProceso
+
+
+class TestBufferCuadros(unittest.TestCase):
+    def setUp(self):
+        self.buffer = BufferCuadros(4, 3)
+
+    def tearDown(self):
+        self.buffer.cerrar()
+
+    def test_vacio_hasta_el_primer_cuadro(self):
+        self.assertIsNone(self.buffer.leer())
+
+    def test_otro_mapeo_lee_el_ultimo_cuadro(self):
+        """A second attachment (as in the child process) sees the latest frame."""
+        lector = BufferCuadros(4, 3, nombre=self.buffer.nombre)
+        try:
+            for valor in (1, 2, 3):
+                self.buffer.escribir(np.full((3, 4, 3), valor, dtype=np.uint8))
+            cuadro = lector.leer()
+            self.assertEqual(cuadro.shape, (3, 4, 3))
+            self.assertTrue((cuadro == 3).all())
+            self.assertEqual(lector.secuencia, 3)
+            self.assertIsNone(lector.leer_landmarks())
+        finally:
+            lector.cerrar()
+
+    def test_landmarks_por_memoria_compartida(self):
+        mano = tuple((i / 32, 0.25) for i in range(21))
+        self.buffer.escribir(np.zeros((3, 4, 3), dtype=np.uint8), (mano,))
+        self.assertEqual(self.buffer.leer_landmarks(), (mano,))
+        # Cuadro sin manos: tupla vacía, no None
+        self.buffer.escribir(np.zeros((3, 4, 3), dtype=np.uint8), ())
+        self.assertEqual(self.buffer.leer_landmarks(), ())
+
+
+class TestControladorManoProceso(unittest.TestCase):
+    def setUp(self):
+        self.ctrl = ControladorManoProceso(ancho=4, alto=3)
+        # Sin lanzar el hijo: el test hace de proceso de detección
+        self.ctrl._conexion, self.hijo = multiprocessing.Pipe()
+
+    def tearDown(self):
+        self.ctrl.detener()
+
+    def test_consultar_acumula_intenciones(self):
+        self.hijo.send(('intencion', 1, False, True, False))
+        self.hijo.send(('intencion', 0, True, False, False))
+        self.assertEqual(self.ctrl.consultar(), (1, True, True, False))
+        # Los bordes se consumen; la caída suave se mantiene hasta que cambie
+        self.assertEqual(self.ctrl.consultar(), (0, True, False, False))
+
+    def test_telemetria_de_gestos_y_fps(self):
+        from unittest.mock import MagicMock
+        self.ctrl.telemetria = MagicMock()
+        self.hijo.send(('fps', 29.5))
+        self.hijo.send(('intencion', -1, False, True, False))
+        self.ctrl.consultar()
+        self.assertEqual(self.ctrl.fps_camara, 29.5)
+        self.assertEqual([c.kwargs for c in self.ctrl.telemetria.emitir.call_args_list],
+                         [{'fps': 29.5}, {'gesto': 'izquierda'}, {'gesto': 'rotar'}])
+
+    def test_estado_juego_solo_al_cambiar(self):
+        self.ctrl.establecer_estado_juego('menu')
+        self.ctrl.establecer_estado_juego('menu')
+        self.ctrl.establecer_estado_juego('jugando')
+        recibidos = []
+        while self.hijo.poll():
+            recibidos.append(self.hijo.recv())
+        self.assertEqual(recibidos, [('estado_juego', 'menu'), ('estado_juego', 'jugando')])
+
+    def test_menu_descarta_intenciones_viejas(self):
+        """Intents and FPS sent while in the menu are drained, and no stale edges reach the next game."""
+        self.hijo.send(('intencion', 1, False, True, False))
+        self.ctrl.establecer_estado_juego('menu')  # Llegó durante el juego, sin consultar
+        self.hijo.send(('fps', 12.0))
+        self.hijo.send(('intencion', -1, True, True, True))
+        self.ctrl.establecer_estado_juego('menu')
+        self.assertFalse(self.ctrl._conexion.poll())
+        self.assertEqual(self.ctrl.fps_camara, 12.0)
+        self.hijo.send(('intencion', 0, False, False, True))
+        self.ctrl.establecer_estado_juego('jugando')
+        self.assertEqual(self.ctrl.consultar(), (0, False, False, False))
+
+    def test_landmarks_al_calibrar(self):
+        """While calibrating the child sends every inference's hands over the pipe; intents are ignored."""
+        self.ctrl.establecer_estado_juego('calibrando')
+        self.assertIsNone(self.ctrl.landmarks_detectados)
+        mano = ((0.5, 0.5),) * 21
+        self.hijo.send(('landmarks', (mano,)))
+        self.hijo.send(('intencion', 1, False, True, False))
+        self.assertEqual(self.ctrl.landmarks_detectados, (mano,))
+        self.assertEqual((self.ctrl.dir_mov, self.ctrl.borde_rotar_hor), (0, False))
+
+    def test_ultimo_frame_desde_memoria_compartida(self):
+        self.assertIsNone(self.ctrl.ultimo_frame)
+        self.ctrl._crear_buffer(4, 3)
+        self.assertIsNone(self.ctrl.ultimo_frame)
+        self.ctrl._buffer.escribir(np.full((3, 4, 3), 7, dtype=np.uint8))
+        self.assertTrue((self.ctrl.ultimo_frame == 7).all())
+
+    def test_buffer_del_tamano_negociado(self):
+        # La cámara negoció 2x2 aunque se pidió 4x3: el hijo no reescala
+        self.ctrl._proceso.start = MagicMock()
+        self.hijo.send(('camara', {'fourcc': 'MJPG', 'ancho': 2, 'alto': 2, 'fps': 30}))
+        self.ctrl.iniciar(timeout=1)
+        self.assertEqual(self.ctrl.modo_camara['ancho'], 2)
+        self.assertEqual(self.ctrl._buffer.forma, (2, 2, 3))
+        self.assertEqual(self.hijo.recv(), ('buffer', self.ctrl._buffer.nombre, 2, 2))
+
+    def test_error_al_abrir_la_camara(self):
+        self.ctrl._proceso.start = MagicMock()
+        self.hijo.send(('error', "No se pudo abrir la cámara 0"))
+        with self.assertRaises(RuntimeError):
+            self.ctrl.iniciar(timeout=1)
+        self.assertIsNone(self.ctrl._buffer)
+
+if __name__ == '__main__':
+    unittest.main()
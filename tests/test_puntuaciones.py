@@ -0,0 +1,59 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from src.puntuaciones import TablaPuntuaciones
+
+
+class TestTablaPuntuaciones(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "puntuaciones.db")
+        self.tabla = TablaPuntuaciones(self.ruta).iniciar()
+
+    def tearDown(self):
+        self.tabla.cerrar()
+        self.directorio.cleanup()
+
+    def test_top_y_mejor_personal(self):
+        for nombre, puntaje in (("ana", 300), ("beto", 900), ("ana", 1200), ("cris", 50)):
+            hecho = self.tabla.registrar(nombre, puntaje, 4, 1)
+        self.assertTrue(hecho.wait(5))
+        self.assertEqual([fila[:2] for fila in self.tabla.mejores(3)],
+                         [("ana", 1200), ("beto", 900), ("ana", 300)])
+        self.assertEqual(self.tabla.mejor_de("ana"), 1200)
+        self.assertIsNone(self.tabla.mejor_de("nadie"))
+
+    def test_escribe_en_su_propio_hilo(self):
+        """registrar only queues: the INSERT runs on the table's writer thread."""
+        hilos = []
+        original = self.tabla._cola.get
+
+        def espiar(*args, **kwargs):
+            hilos.append(threading.get_ident())
+            return original(*args, **kwargs)
+        self.tabla._cola.get = espiar
+        self.tabla.registrar("ana", 10, 0, 1)
+        self.tabla.registrar("ana", 20, 0, 1).wait(5)
+        self.assertTrue(hilos)
+        self.assertNotIn(threading.get_ident(), hilos)
+
+    def test_consultas_usan_indices(self):
+        self.tabla.registrar("ana", 10, 0, 1).wait(5)
+        conexion = sqlite3.connect(self.ruta)
+        try:
+            for consulta, parametros in (
+                ("SELECT nombre, puntaje FROM partidas ORDER BY puntaje DESC LIMIT 5", ()),
+                ("SELECT puntaje FROM partidas WHERE nombre = ? ORDER BY puntaje DESC LIMIT 1", ("ana",)),
+            ):
+                plan = " ".join(str(fila) for fila in
+                                conexion.execute("EXPLAIN QUERY PLAN " + consulta, parametros))
+                self.assertIn("USING", plan)
+                self.assertNotIn("TEMP B-TREE", plan)
+        finally:
+            conexion.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+# Usar el motor real aunque otro módulo de tests lo haya sustituido por un mock
+import src.core_tetris as core_tetris
+sys.modules['core_tetris'] = core_tetris
+
+from src.repeticion import RegistroPartida
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def ejecutar(*argumentos):
+    # En otro proceso: test_cascara_tetris reemplaza pygame por un mock al importarse
+    return subprocess.run([sys.executable, os.path.join('src', 'rendimiento_render.py'), *argumentos],
+                          cwd=RAIZ, capture_output=True, text=True, timeout=120)
+
+
+class TestRendimientoRender(unittest.TestCase):
+    def test_escenarios_sinteticos(self):
+        salida = ejecutar('--frames', '3', '--tablero', '8x16')
+        self.assertEqual(salida.returncode, 0, salida.stderr)
+        self.assertIn('Driver dummy', salida.stdout)
+        self.assertIn('tablero 8x16', salida.stdout)
+        for escenario in ('vacio', 'medio', 'casi_tope', 'sin_camara'):
+            self.assertIn(escenario, salida.stdout)
+
+    def test_repeticion_fija_el_tablero(self):
+        motor = core_tetris.Motor(8, 16, semilla=5)
+        registro = RegistroPartida(5, 8, 16)
+        for _ in range(120):
+            motor.tick()
+        registro.registrar(motor.ticks, 'caida_dura')
+        registro.finalizar(motor)
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, 'partida.ttr')
+            registro.guardar(ruta)
+            # El --tablero se ignora: manda la repetición
+            salida = ejecutar('--frames', '3', '--tablero', '12x24', '--repeticion', ruta)
+        self.assertEqual(salida.returncode, 0, salida.stderr)
+        self.assertIn('tablero 8x16', salida.stdout)
+        for escenario in ('repeticion_1', 'repeticion_3', 'sin_camara'):
+            self.assertIn(escenario, salida.stdout)
+
+if __name__ == '__main__':
+    unittest.main()
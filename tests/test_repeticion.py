@@ -0,0 +1,79 @@
+import random
+import sys
+
+import pytest
+
+# Usar el motor real aunque otro módulo de tests lo haya sustituido por un mock
+import src.core_tetris as core_tetris
+sys.modules['core_tetris'] = core_tetris
+
+from src.repeticion import RegistroPartida, reproducir, verificar, aplicar_entrada, CODIGOS
+
+
+def jugar_partida(semilla, n_ticks=3000, semilla_entradas=0):
+    """Juega una partida con entradas aleatorias y la graba."""
+    motor = core_tetris.Motor(semilla=semilla)
+    registro = RegistroPartida(semilla)
+    rng = random.Random(semilla_entradas)
+    acciones = [a for a in CODIGOS if a[0] != 'fin']
+    for _ in range(n_ticks):
+        if motor.game_over:
+            break
+        if rng.random() < 0.3:
+            accion, valor = rng.choice(acciones)
+            registro.registrar(motor.ticks, accion, valor)
+            aplicar_entrada(motor, accion, valor)
+        motor.tick()
+    registro.finalizar(motor)
+    return motor, registro
+
+
+def test_misma_semilla_misma_secuencia():
+    a = core_tetris.Motor(semilla=42)
+    b = core_tetris.Motor(semilla=42)
+    assert a.pieza_actual.tipo == b.pieza_actual.tipo
+    assert a.vista_previa() == b.vista_previa()
+
+
+def test_aplicar_gravedad_fija_pieza():
+    motor = core_tetris.Motor(semilla=1)
+    motor.pieza_actual.y = 17
+    while not motor.aplicar_gravedad():
+        pass
+    assert any(celda is not None for celda in motor.tablero[19])
+
+
+def test_reproduccion_identica():
+    motor, registro = jugar_partida(semilla=7)
+    reproducido = reproducir(registro)
+    assert reproducido.tablero == motor.tablero
+    assert reproducido.puntaje == motor.puntaje
+    assert reproducido.ticks == motor.ticks
+    assert verificar(registro)
+
+
+def test_serializacion_binaria(tmp_path):
+    motor, registro = jugar_partida(semilla=123)
+    ruta = tmp_path / "partida.ttr"
+    registro.guardar(ruta)
+
+    cargado = RegistroPartida.cargar(ruta)
+    assert cargado.semilla == 123
+    assert cargado.n_eventos == registro.n_eventos
+    assert cargado.ultimo_tick == registro.ultimo_tick
+    assert list(cargado.eventos()) == list(registro.eventos())
+    assert verificar(cargado)
+    # 3 bytes por evento más cabecera y cierre
+    assert len(registro.a_bytes()) < 3 * registro.n_eventos + 64
+
+
+def test_delta_de_tick_grande():
+    registro = RegistroPartida(semilla=0)
+    registro.registrar(10, 'rotar', 1)
+    registro.registrar(200000, 'caida_dura')
+    assert list(registro.eventos()) == [(10, 'rotar', 1), (200000, 'caida_dura', 0)]
+
+
+def test_archivo_invalido():
+    with pytest.raises(ValueError):
+        RegistroPartida.desde_bytes(b"XXXX" + bytes(40))
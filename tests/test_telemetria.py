@@ -0,0 +1,92 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from src.telemetria import MuestreoFrames, Telemetria
+
+
+def leer_eventos(ruta):
+    with open(ruta, encoding='utf-8') as f:
+        return [json.loads(linea) for linea in f]
+
+
+class TestTelemetria(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def test_emitir_no_bloquea_con_la_cola_llena(self):
+        # Sin hilo escritor: nadie vacía la cola
+        telemetria = Telemetria(self.directorio.name, capacidad=3)
+        inicio = time.perf_counter()
+        for i in range(10):
+            telemetria.emitir('gesto', n=i)
+        self.assertLess(time.perf_counter() - inicio, 0.5)
+        self.assertEqual(telemetria.descartados, 7)
+
+    def test_descartados_desde_varios_hilos(self):
+        # El juego y la cámara emiten a la vez: no se pierde ni se duplica ningún descarte
+        telemetria = Telemetria(self.directorio.name, capacidad=10)
+        hilos = [threading.Thread(target=lambda: [telemetria.emitir('gesto') for _ in range(2000)])
+                 for _ in range(4)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(telemetria.descartados, 4 * 2000 - 10)
+        telemetria.iniciar()
+        telemetria.cerrar()
+        eventos = leer_eventos(telemetria.ruta)
+        self.assertEqual(sum(e['cantidad'] for e in eventos if e['tipo'] == 'descartados'),
+                         telemetria.descartados)
+
+    def test_lote_en_jsonl_y_descartados(self):
+        telemetria = Telemetria(self.directorio.name, capacidad=3, intervalo_s=0.05)
+        telemetria.emitir('gesto', gesto='rotar')
+        telemetria.emitir('gesto', gesto='izquierda')
+        telemetria.al_evento_motor('lineas_limpiadas', (18, 19))
+        telemetria.emitir('gesto', gesto='perdido')
+        telemetria.iniciar()
+        telemetria.cerrar()
+        eventos = leer_eventos(telemetria.ruta)
+        self.assertEqual([e['tipo'] for e in eventos],
+                         ['gesto', 'gesto', 'lineas_limpiadas', 'descartados'])
+        self.assertEqual(eventos[0]['gesto'], 'rotar')
+        self.assertEqual(eventos[2]['filas'], [18, 19])
+        self.assertEqual(eventos[3]['cantidad'], 1)
+        self.assertIn('t', eventos[0])
+
+    def test_rotacion_por_tamano(self):
+        telemetria = Telemetria(self.directorio.name, max_bytes=200, max_archivos=3)
+        for i in range(10):
+            telemetria._escribir([{'tipo': 'frames', 'n': i, 'relleno': 'x' * 60}])
+        nombres = sorted(os.listdir(self.directorio.name))
+        self.assertEqual(nombres, ['telemetria.1.jsonl', 'telemetria.2.jsonl', 'telemetria.jsonl'])
+        for nombre in nombres:
+            self.assertLessEqual(os.path.getsize(os.path.join(self.directorio.name, nombre)), 200)
+        # El archivo actual tiene los eventos más nuevos
+        self.assertEqual(leer_eventos(telemetria.ruta)[-1]['n'], 9)
+
+
+class TestMuestreoFrames(unittest.TestCase):
+    def test_un_resumen_por_intervalo(self):
+        tiempos = iter([0.0, 0.01, 0.03, 0.04, 1.0, 1.01])
+        telemetria = MagicMock()
+        muestreo = MuestreoFrames(telemetria, intervalo_s=1.0, reloj=lambda: next(tiempos))
+        for _ in range(4):
+            muestreo.frame()
+        telemetria.emitir.assert_called_once()
+        _, datos = telemetria.emitir.call_args
+        self.assertEqual(datos['n'], 4)
+        self.assertEqual(datos['max_ms'], 960.0)
+        muestreo.frame()
+        self.assertEqual(telemetria.emitir.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()